@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de balayage des paramètres de pilotage, reprenable après arrêt.
+"""
+from concurrent.futures import as_completed
+import json
+import os
+import time
+import numpy as np
+
+# Les paramètres d'une configuration : la conjoncture et les cibles
+_PARAMETRES = [
+    "croissance",
+    "chomage",
+    "Scible",
+    "Pcible",
+    "Acible",
+    "Tcible",
+    "Dcible",
+    "RNVcible",
+    "REVcible",
+]
+
+_VARIABLES = [
+    "T",
+    "P",
+    "A",
+    "S",
+    "RNV",
+    "REV",
+    "Depenses",
+    "PIB",
+    "PensionBrut",
+]
+
+
+class BalayagePilotage:
+    def __init__(
+        self,
+        simulateur,
+        repertoire,
+        parametres,
+        methode="pilotageCOR",
+        taille_bloc=1024,
+        variables=None,
+    ):
+        """
+        Crée ou reprend un balayage des paramètres de pilotage.
+
+        Un balayage évalue un grand nombre de configurations, par
+        exemple une grille de cibles de pilotage ou un échantillon de
+        Monte-Carlo de conjonctures.
+        Les configurations sont découpées en blocs consécutifs de
+        taille fixe : le découpage ne dépend que du nombre de
+        configurations et de la taille des blocs.
+        Chaque bloc est calculé par un seul appel vectorisé à
+        SimulateurRetraites.pilotageConjonctures.
+
+        Le résultat de chaque bloc est écrit dans le répertoire, sous la
+        forme d'un fichier NumPy par bloc dont chaque variable est une
+        colonne, puis le bloc est ajouté au manifeste du balayage
+        (fichier "manifeste.json").
+        Les deux écritures sont atomiques : après un arrêt, par exemple
+        une préemption, le balayage reprend au dernier bloc enregistré,
+        sans recalculer les blocs terminés.
+        Le manifeste contient l'empreinte de la spécification du
+        balayage (méthode, paramètres, taille des blocs, variables,
+        hypothèses et paramètres du simulateur) : un répertoire ne peut
+        être repris que par le même balayage.
+
+        Parameters
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        repertoire : str
+            Le répertoire des résultats, créé s'il n'existe pas.
+        parametres : dict
+            parametres[nom] est la valeur du paramètre nom, pour nom
+            dans "croissance", "chomage" et les cibles de la méthode
+            ("Scible", "Pcible", "Acible", "Tcible", "Dcible",
+            "RNVcible", "REVcible").
+            Chaque valeur est un flottant, commun à toutes les
+            configurations, ou un tableau dont la première dimension
+            est le nombre de configurations (voir
+            pilotageConjonctures).
+            La croissance et le chômage sont obligatoires.
+        methode : str or list of str
+            La méthode de pilotage (voir pilotageConjonctures).
+        taille_bloc : int
+            Le nombre de configurations d'un bloc (par défaut, 1024).
+        variables : list of str
+            Les variables enregistrées (par défaut, toutes les sorties
+            de pilotageConjonctures).
+
+        Attributes
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        repertoire : str
+            Le répertoire des résultats.
+        methode : str or list of str
+            La méthode de pilotage.
+        taille_bloc : int
+            Le nombre de configurations d'un bloc.
+        variables : list of str
+            Les variables enregistrées.
+        nombre_configurations : int
+            Le nombre de configurations.
+        nombre_blocs : int
+            Le nombre de blocs.
+        specification : str
+            L'empreinte de la spécification du balayage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> A, RNV = np.meshgrid(
+        ...     np.linspace(60.0, 68.0, 81), np.linspace(0.7, 1.1, 41)
+        ... )
+        >>> balayage = BalayagePilotage(
+        ...     simulateur,
+        ...     "balayage",
+        ...     {
+        ...         "croissance": 1.3,
+        ...         "chomage": 7.0,
+        ...         "Acible": A.ravel(),
+        ...         "RNVcible": RNV.ravel(),
+        ...         "Scible": 0.0,
+        ...     },
+        ...     "pilotageParAgeEtNiveauDeVie",
+        ...     taille_bloc=256,
+        ... )
+        >>> balayage.execute(rapport=print)
+        >>> P = balayage.getResultats()["P"]
+        """
+        if taille_bloc < 1:
+            raise ValueError(
+                "La taille des blocs doit être positive : %s" % (taille_bloc)
+            )
+        for nom in parametres:
+            if nom not in _PARAMETRES:
+                raise ValueError(
+                    "Mauvaise valeur pour le paramètre : %s" % (nom)
+                )
+        for nom in ["croissance", "chomage"]:
+            if nom not in parametres:
+                raise ValueError("Le paramètre %s est obligatoire" % (nom))
+        if variables is None:
+            variables = _VARIABLES
+        for nom in variables:
+            if nom not in _VARIABLES:
+                raise ValueError("Mauvaise valeur pour la variable : %s" % nom)
+        self.simulateur = simulateur
+        self.repertoire = repertoire
+        self.methode = methode
+        self.taille_bloc = taille_bloc
+        self.variables = list(variables)
+        self._parametres = dict()
+        tailles = []
+        for nom, valeur in parametres.items():
+            if valeur is None:
+                continue
+            if np.ndim(valeur) > 0:
+                valeur = np.asarray(valeur, dtype=float)
+                tailles.append(valeur.shape[0])
+            self._parametres[nom] = valeur
+        if len(set(tailles)) > 1:
+            raise ValueError(
+                "Les paramètres n'ont pas le même nombre de "
+                "configurations : %s" % (tailles)
+            )
+        if len(tailles) == 0:
+            self.nombre_configurations = 1
+        else:
+            self.nombre_configurations = tailles[0]
+        self.nombre_blocs = -(-self.nombre_configurations // taille_bloc)
+        self.specification = simulateur.calculeCleCache(
+            "BalayagePilotage",
+            dict(
+                self._parametres,
+                methode=methode,
+                nombre_configurations=self.nombre_configurations,
+                taille_bloc=taille_bloc,
+                variables=self.variables,
+            ),
+        )
+        os.makedirs(repertoire, exist_ok=True)
+        self._blocs_termines = set()
+        chemin = self._cheminManifeste()
+        if os.path.exists(chemin):
+            with open(chemin) as fichier:
+                manifeste = json.load(fichier)
+            if manifeste["specification"] != self.specification:
+                raise ValueError(
+                    "Le répertoire contient un autre balayage : %s"
+                    % (repertoire)
+                )
+            self._blocs_termines = set(manifeste["blocs"])
+        else:
+            self._ecritManifeste()
+        # Débit mesuré depuis la création de l'objet
+        self._debut = time.time()
+        self._configurations_calculees = 0
+        return None
+
+    def _cheminManifeste(self):
+        """
+        Retourne le chemin du manifeste.
+
+        Returns
+        -------
+        chemin : str
+            Le chemin du fichier.
+        """
+        chemin = os.path.join(self.repertoire, "manifeste.json")
+        return chemin
+
+    def _cheminBloc(self, k):
+        """
+        Retourne le chemin du fichier des résultats d'un bloc.
+
+        Parameters
+        ----------
+        k : int
+            L'indice du bloc.
+
+        Returns
+        -------
+        chemin : str
+            Le chemin du fichier.
+        """
+        chemin = os.path.join(self.repertoire, "bloc_%06d.npz" % (k))
+        return chemin
+
+    def _ecritManifeste(self):
+        """
+        Écrit le manifeste de façon atomique.
+        """
+        manifeste = {
+            "specification": self.specification,
+            "methode": self.methode,
+            "nombre_configurations": self.nombre_configurations,
+            "taille_bloc": self.taille_bloc,
+            "variables": self.variables,
+            "blocs": sorted(self._blocs_termines),
+        }
+        chemin = self._cheminManifeste()
+        temporaire = chemin + ".tmp"
+        with open(temporaire, "w") as fichier:
+            json.dump(manifeste, fichier)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, chemin)
+        return None
+
+    def getParametresBloc(self, k):
+        """
+        Retourne les paramètres des configurations d'un bloc.
+
+        Parameters
+        ----------
+        k : int
+            L'indice du bloc, entre 0 et nombre_blocs - 1.
+
+        Returns
+        -------
+        parametres : dict
+            Les paramètres du bloc : les tableaux sont restreints aux
+            configurations du bloc.
+        """
+        if k < 0 or k >= self.nombre_blocs:
+            raise ValueError("Mauvaise valeur pour le bloc : %s" % (k))
+        debut = k * self.taille_bloc
+        fin = min(debut + self.taille_bloc, self.nombre_configurations)
+        parametres = dict()
+        for nom, valeur in self._parametres.items():
+            if isinstance(valeur, np.ndarray):
+                valeur = valeur[debut:fin]
+            parametres[nom] = valeur
+        return parametres
+
+    def _tailleBloc(self, k):
+        """
+        Retourne le nombre de configurations d'un bloc.
+
+        Parameters
+        ----------
+        k : int
+            L'indice du bloc.
+
+        Returns
+        -------
+        taille : int
+            Le nombre de configurations : taille_bloc, sauf pour le
+            dernier bloc.
+        """
+        taille = min(
+            self.taille_bloc, self.nombre_configurations - k * self.taille_bloc
+        )
+        return taille
+
+    def getBlocsRestants(self):
+        """
+        Retourne les blocs qui ne sont pas encore enregistrés.
+
+        Returns
+        -------
+        blocs : list of int
+            Les indices des blocs, dans l'ordre croissant.
+        """
+        blocs = [
+            k
+            for k in range(self.nombre_blocs)
+            if k not in self._blocs_termines
+        ]
+        return blocs
+
+    def estTermine(self):
+        """
+        Teste si tous les blocs sont enregistrés.
+
+        Returns
+        -------
+        termine : bool
+            True si le balayage est terminé.
+        """
+        termine = len(self._blocs_termines) == self.nombre_blocs
+        return termine
+
+    def enregistreBloc(self, k, resultats):
+        """
+        Enregistre les résultats d'un bloc.
+
+        Le fichier du bloc est écrit, puis le bloc est ajouté au
+        manifeste.
+        Un bloc déjà enregistré est ignoré : un bloc peut donc être
+        calculé plusieurs fois, par exemple par deux processus.
+
+        Parameters
+        ----------
+        k : int
+            L'indice du bloc.
+        resultats : dict
+            resultats[nom] est le tableau de la variable nom, de taille
+            (nombre de configurations du bloc, len(annees)).
+        """
+        if k < 0 or k >= self.nombre_blocs:
+            raise ValueError("Mauvaise valeur pour le bloc : %s" % (k))
+        if k in self._blocs_termines:
+            return None
+        taille = self._tailleBloc(k)
+        forme = (taille, len(self.simulateur.annees))
+        colonnes = dict()
+        for nom in self.variables:
+            colonne = np.asarray(resultats[nom], dtype=float)
+            if colonne.shape != forme:
+                raise ValueError(
+                    "Mauvaise taille pour la variable %s du bloc %d : %s"
+                    % (nom, k, colonne.shape)
+                )
+            colonnes[nom] = colonne
+        chemin = self._cheminBloc(k)
+        temporaire = chemin + ".tmp"
+        with open(temporaire, "wb") as fichier:
+            np.savez(fichier, **colonnes)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, chemin)
+        self._blocs_termines.add(k)
+        self._ecritManifeste()
+        self._configurations_calculees += taille
+        return None
+
+    def execute(self, nombre_blocs=None, executeur=None, rapport=None):
+        """
+        Calcule et enregistre les blocs restants.
+
+        Parameters
+        ----------
+        nombre_blocs : int
+            Le nombre maximal de blocs calculés par cet appel
+            (par défaut, tous les blocs restants).
+        executeur : concurrent.futures.Executor
+            L'exécuteur qui calcule les blocs, par exemple un
+            ProcessPoolExecutor (par défaut, les blocs sont calculés
+            par ce processus).
+            Les résultats sont enregistrés par ce processus, dans
+            l'ordre de fin des calculs.
+        rapport : function
+            Une fonction appelée après l'enregistrement de chaque bloc,
+            avec la progression en argument (voir getProgression)
+            (par défaut, aucune).
+        """
+        blocs = self.getBlocsRestants()
+        if nombre_blocs is not None:
+            blocs = blocs[:nombre_blocs]
+        if executeur is None:
+            for k in blocs:
+                resultats = _calculeBloc(
+                    self.simulateur,
+                    self.methode,
+                    self.getParametresBloc(k),
+                    self.variables,
+                )
+                self.enregistreBloc(k, resultats)
+                if rapport is not None:
+                    rapport(self.getProgression())
+            return None
+        taches = dict()
+        for k in blocs:
+            tache = executeur.submit(
+                _calculeBloc,
+                self.simulateur,
+                self.methode,
+                self.getParametresBloc(k),
+                self.variables,
+            )
+            taches[tache] = k
+        for tache in as_completed(taches):
+            self.enregistreBloc(taches[tache], tache.result())
+            if rapport is not None:
+                rapport(self.getProgression())
+        return None
+
+    def getProgression(self):
+        """
+        Retourne la progression du balayage.
+
+        Returns
+        -------
+        progression : dict
+            Les clés sont "blocs_termines", "nombre_blocs",
+            "configurations_terminees", "nombre_configurations",
+            "debit" (configurations par seconde, mesuré depuis la
+            création de cet objet) et "duree_restante" (estimation en
+            secondes).
+            Le débit et la durée restante sont None si aucun bloc n'a
+            été calculé.
+        """
+        restants = self.getBlocsRestants()
+        configurations_restantes = sum(self._tailleBloc(k) for k in restants)
+        duree = time.time() - self._debut
+        if self._configurations_calculees > 0 and duree > 0.0:
+            debit = self._configurations_calculees / duree
+            duree_restante = configurations_restantes / debit
+        else:
+            debit = None
+            duree_restante = None
+        progression = {
+            "blocs_termines": self.nombre_blocs - len(restants),
+            "nombre_blocs": self.nombre_blocs,
+            "configurations_terminees": (
+                self.nombre_configurations - configurations_restantes
+            ),
+            "nombre_configurations": self.nombre_configurations,
+            "debit": debit,
+            "duree_restante": duree_restante,
+        }
+        return progression
+
+    def getResultats(self):
+        """
+        Retourne les résultats du balayage.
+
+        Returns
+        -------
+        resultats : dict
+            resultats[nom] est le tableau de la variable nom, de taille
+            (nombre_configurations, len(annees)).
+        """
+        if not self.estTermine():
+            raise ValueError(
+                "Le balayage n'est pas terminé : %d blocs restants"
+                % (len(self.getBlocsRestants()))
+            )
+        colonnes = {nom: [] for nom in self.variables}
+        for k in range(self.nombre_blocs):
+            with np.load(self._cheminBloc(k)) as bloc:
+                for nom in self.variables:
+                    colonnes[nom].append(bloc[nom])
+        resultats = dict()
+        for nom in self.variables:
+            resultats[nom] = np.concatenate(colonnes[nom])
+        return resultats
+
+
+def _calculeBloc(simulateur, methode, parametres, variables):
+    """
+    Calcule les résultats d'un bloc de configurations.
+
+    Parameters
+    ----------
+    simulateur : SimulateurRetraites
+        Le simulateur.
+    methode : str or list of str
+        La méthode de pilotage.
+    parametres : dict
+        Les paramètres du bloc (voir BalayagePilotage.getParametresBloc).
+    variables : list of str
+        Les variables retournées.
+
+    Returns
+    -------
+    resultats : dict
+        resultats[nom] est le tableau de la variable nom.
+    """
+    arguments = dict()
+    for nom, valeur in parametres.items():
+        if nom not in ["croissance", "chomage"] and np.ndim(valeur) == 1:
+            # Une cible constante par configuration
+            valeur = valeur[:, np.newaxis]
+        arguments[nom] = valeur
+    sorties = simulateur.pilotageConjonctures(methode=methode, **arguments)
+    resultats = {nom: sorties[nom] for nom in variables}
+    return resultats
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de cache persistant des résultats du simulateur de retraites.
+"""
+from contextlib import closing
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# Nombre et âge maximal en secondes des dates d'accès en attente
+_LOT_ACCES = 64
+_DELAI_ACCES = 10.0
+
+
+class CachePersistant:
+    def __init__(self, chemin, taille_max=1024**3, delai=60.0, journal="WAL"):
+        """
+        Crée ou ouvre un cache sur disque des résultats du simulateur.
+
+        Le cache est une base SQLite : il peut être partagé par
+        plusieurs threads et plusieurs processus, par exemple les
+        processus d'un balayage des paramètres de pilotage.
+        Chaque écriture est une transaction : un résultat est écrit
+        entièrement ou pas du tout.
+        Les lectures ne prennent pas le verrou d'écriture de la base :
+        elles sont concurrentes entre elles et, avec le journal WAL,
+        concurrentes des écritures.
+        Les dates d'accès, qui déterminent les résultats les moins
+        récemment utilisés, sont conservées en mémoire puis écrites
+        par lots : lors de l'écriture suivante d'un résultat par le
+        même objet, ou quand le lot est plein ou ancien.
+
+        Par défaut, la base utilise le journal WAL de SQLite, qui permet
+        des lectures concurrentes des écritures, mais qui utilise une
+        mémoire partagée : tous les processus doivent être sur la même
+        machine.
+        Pour partager le cache entre les nœuds d'une grappe de calcul
+        par un système de fichiers réseau, il faut utiliser le journal
+        "DELETE" : les transactions reposent alors sur les verrous de
+        fichiers, que le système de fichiers doit implémenter
+        correctement (ce n'est pas le cas de certaines configurations
+        NFS ou SMB).
+        Tous les processus qui partagent un fichier doivent utiliser le
+        même journal.
+
+        Les résultats sont sérialisés avec le module pickle.
+        La lecture d'un résultat peut exécuter du code arbitraire : le
+        fichier ne doit être accessible en écriture qu'à des
+        utilisateurs de confiance.
+
+        Les clés sont calculées par la méthode
+        SimulateurRetraites.calculeCleCache : elles contiennent
+        l'empreinte des hypothèses et les cibles normalisées, si bien
+        qu'un résultat calculé par un processus est réutilisé par tous
+        les autres.
+
+        Quand la taille totale des résultats dépasse la taille maximale,
+        les résultats les moins récemment utilisés sont supprimés.
+
+        Parameters
+        ----------
+        chemin : str
+            Le fichier de la base SQLite.
+        taille_max : int
+            La taille maximale des résultats en octets
+            (par défaut, 1 Go).
+        delai : float
+            Le délai maximal d'attente du verrou de la base en secondes
+            (par défaut, 60).
+        journal : str
+            Le mode de journal de SQLite : "WAL" pour des processus sur
+            la même machine, ou "DELETE" pour un système de fichiers
+            réseau (par défaut, "WAL").
+
+        Attributes
+        ----------
+        chemin : str
+            Le fichier de la base SQLite.
+        taille_max : int
+            La taille maximale des résultats en octets.
+        delai : float
+            Le délai maximal d'attente du verrou de la base en secondes.
+        journal : str
+            Le mode de journal de SQLite.
+        nombre_succes : int
+            Le nombre de résultats lus dans le cache par ce processus.
+        nombre_echecs : int
+            Le nombre de résultats absents du cache pour ce processus.
+
+        Examples
+        --------
+        >>> cache = CachePersistant("/tmp/retraites.sqlite")
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.activeCache(cache_persistant=cache)
+        >>> analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        >>> cache.getStatistiques()
+
+        Sur un système de fichiers partagé par les nœuds d'une grappe :
+
+        >>> cache = CachePersistant("/partage/retraites.sqlite",
+        ...                         journal="DELETE")
+        """
+        if taille_max < 1:
+            raise ValueError(
+                "La taille maximale doit être positive : %s" % (taille_max)
+            )
+        if journal not in ["WAL", "DELETE"]:
+            raise ValueError(
+                "Mauvaise valeur pour le journal : %s" % (journal)
+            )
+        self.chemin = os.path.abspath(chemin)
+        self.taille_max = taille_max
+        self.delai = delai
+        self.journal = journal
+        self.nombre_succes = 0
+        self.nombre_echecs = 0
+        self._verrou = threading.Lock()
+        self._acces = dict()
+        self._date_acces = None
+        with self._connecte() as connexion:
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultats ("
+                "cle TEXT PRIMARY KEY, valeur BLOB NOT NULL, "
+                "taille INTEGER NOT NULL, acces REAL NOT NULL)"
+            )
+            connexion.execute(
+                "CREATE INDEX IF NOT EXISTS resultats_acces "
+                "ON resultats (acces)"
+            )
+            # Taille totale des résultats, mise à jour à chaque écriture
+            connexion.execute(
+                "CREATE TABLE IF NOT EXISTS taille_totale ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "taille INTEGER NOT NULL)"
+            )
+            connexion.execute(
+                "INSERT OR IGNORE INTO taille_totale "
+                "SELECT 0, COALESCE(SUM(taille), 0) FROM resultats"
+            )
+        return None
+
+    def _connecte(self, ecriture=True):
+        """
+        Ouvre une connexion à la base.
+
+        Une connexion est ouverte à chaque opération : le cache peut
+        ainsi être utilisé après un fork et dans plusieurs threads.
+
+        Parameters
+        ----------
+        ecriture : bool
+            Si True, la transaction prend immédiatement le verrou
+            d'écriture de la base ; sinon, c'est une transaction de
+            lecture (par défaut, True).
+
+        Returns
+        -------
+        connexion : sqlite3.Connection
+            La connexion, qui est fermée en sortie du bloc with,
+            après la validation ou l'annulation de la transaction.
+        """
+        connexion = sqlite3.connect(
+            self.chemin, timeout=self.delai, isolation_level=None
+        )
+        connexion.execute("PRAGMA journal_mode=%s" % (self.journal))
+        return _Transaction(connexion, ecriture)
+
+    def lit(self, cle):
+        """
+        Retourne un résultat du cache.
+
+        Parameters
+        ----------
+        cle : str
+            La clé du résultat.
+
+        Returns
+        -------
+        resultat : object
+            Le résultat, ou None s'il n'est pas dans le cache.
+        """
+        with self._connecte(ecriture=False) as connexion:
+            ligne = connexion.execute(
+                "SELECT valeur FROM resultats WHERE cle = ?", (cle,)
+            ).fetchone()
+        maintenant = time.time()
+        with self._verrou:
+            if ligne is None:
+                self.nombre_echecs += 1
+            else:
+                self.nombre_succes += 1
+                self._acces[cle] = maintenant
+                if self._date_acces is None:
+                    self._date_acces = maintenant
+            plein = len(self._acces) >= _LOT_ACCES or (
+                self._date_acces is not None
+                and maintenant - self._date_acces >= _DELAI_ACCES
+            )
+        if plein:
+            with self._connecte() as connexion:
+                self._enregistreAcces(connexion)
+        if ligne is None:
+            return None
+        resultat = pickle.loads(ligne[0])
+        return resultat
+
+    def ecrit(self, cle, resultat):
+        """
+        Ecrit un résultat dans le cache.
+
+        Si nécessaire, supprime les résultats les moins récemment
+        utilisés pour respecter la taille maximale.
+
+        Parameters
+        ----------
+        cle : str
+            La clé du résultat.
+        resultat : object
+            Le résultat, qui doit pouvoir être sérialisé par pickle.
+        """
+        valeur = pickle.dumps(resultat, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(valeur) > self.taille_max:
+            return None
+        with self._connecte() as connexion:
+            self._enregistreAcces(connexion)
+            ligne = connexion.execute(
+                "SELECT taille FROM resultats WHERE cle = ?", (cle,)
+            ).fetchone()
+            connexion.execute(
+                "INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?)",
+                (cle, sqlite3.Binary(valeur), len(valeur), time.time()),
+            )
+            if ligne is None:
+                taille = self._ajouteTaille(connexion, len(valeur))
+            else:
+                taille = self._ajouteTaille(connexion, len(valeur) - ligne[0])
+            if taille > self.taille_max:
+                self._supprime(connexion, taille - self.taille_max)
+        return None
+
+    def _enregistreAcces(self, connexion):
+        """
+        Ecrit les dates d'accès en attente.
+
+        Parameters
+        ----------
+        connexion : sqlite3.Connection
+            La connexion, dans une transaction d'écriture.
+        """
+        with self._verrou:
+            acces = self._acces
+            self._acces = dict()
+            self._date_acces = None
+        connexion.executemany(
+            "UPDATE resultats SET acces = MAX(acces, ?) WHERE cle = ?",
+            [(date, cle) for cle, date in acces.items()],
+        )
+        return None
+
+    def _ajouteTaille(self, connexion, variation):
+        """
+        Met à jour la taille totale des résultats.
+
+        Parameters
+        ----------
+        connexion : sqlite3.Connection
+            La connexion, dans une transaction.
+        variation : int
+            La variation de la taille totale en octets.
+
+        Returns
+        -------
+        taille : int
+            La nouvelle taille totale en octets.
+        """
+        connexion.execute(
+            "UPDATE taille_totale SET taille = taille + ?", (variation,)
+        )
+        (taille,) = connexion.execute(
+            "SELECT taille FROM taille_totale"
+        ).fetchone()
+        return taille
+
+    def _supprime(self, connexion, excedent):
+        """
+        Supprime les résultats les moins récemment utilisés.
+
+        Parameters
+        ----------
+        connexion : sqlite3.Connection
+            La connexion, dans une transaction.
+        excedent : int
+            Le nombre minimal d'octets à libérer.
+        """
+        cles = []
+        libere = 0
+        lignes = connexion.execute(
+            "SELECT cle, taille FROM resultats ORDER BY acces"
+        )
+        for cle, taille in lignes:
+            if libere >= excedent:
+                break
+            cles.append((cle,))
+            libere += taille
+        connexion.executemany("DELETE FROM resultats WHERE cle = ?", cles)
+        self._ajouteTaille(connexion, -libere)
+        return None
+
+    def vide(self):
+        """
+        Supprime tous les résultats du cache.
+        """
+        with self._verrou:
+            self._acces = dict()
+            self._date_acces = None
+        with self._connecte() as connexion:
+            connexion.execute("DELETE FROM resultats")
+            connexion.execute("UPDATE taille_totale SET taille = 0")
+        return None
+
+    def getStatistiques(self):
+        """
+        Retourne les statistiques du cache.
+
+        Returns
+        -------
+        statistiques : dict
+            Les clés sont "nombre" (le nombre de résultats), "taille"
+            (la taille des résultats en octets), "succes" et "echecs"
+            (le nombre de lectures réussies et manquées par ce
+            processus).
+        """
+        with self._connecte(ecriture=False) as connexion:
+            (nombre,) = connexion.execute(
+                "SELECT COUNT(*) FROM resultats"
+            ).fetchone()
+            (taille,) = connexion.execute(
+                "SELECT taille FROM taille_totale"
+            ).fetchone()
+        with self._verrou:
+            statistiques = {
+                "nombre": nombre,
+                "taille": taille,
+                "succes": self.nombre_succes,
+                "echecs": self.nombre_echecs,
+            }
+        return statistiques
+
+    def __getstate__(self):
+        # Le verrou et les dates d'accès en attente ne sont pas
+        # transmis aux autres processus
+        etat = self.__dict__.copy()
+        del etat["_verrou"]
+        etat["_acces"] = dict()
+        etat["_date_acces"] = None
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        self._verrou = threading.Lock()
+        return None
+
+
+class _Transaction:
+    """
+    Contexte d'une transaction SQLite, qui ferme la connexion en sortie.
+    """
+
+    def __init__(self, connexion, ecriture=True):
+        self.connexion = connexion
+        self.ecriture = ecriture
+
+    def __enter__(self):
+        if self.ecriture:
+            self.connexion.execute("BEGIN IMMEDIATE")
+        else:
+            self.connexion.execute("BEGIN DEFERRED")
+        return self.connexion
+
+    def __exit__(self, type_exception, exception, trace):
+        with closing(self.connexion):
+            if type_exception is None:
+                self.connexion.execute("COMMIT")
+            else:
+                self.connexion.execute("ROLLBACK")
+        return False
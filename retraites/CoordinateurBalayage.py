@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de distribution d'un balayage de pilotage à des processus de calcul.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+import io
+import json
+import threading
+import time
+import zipfile
+import numpy as np
+
+
+class CoordinateurBalayage:
+    def __init__(self, balayage, adresse="127.0.0.1", port=0, delai=600.0):
+        """
+        Crée un coordinateur qui distribue les blocs d'un balayage.
+
+        Le coordinateur est un service HTTP qui utilise uniquement la
+        bibliothèque standard.
+        Les processus de calcul (voir TravailleurBalayage), sur la même
+        machine ou sur d'autres nœuds, demandent un bloc, le calculent
+        et renvoient son résultat, qui est enregistré dans le
+        répertoire du balayage (voir BalayagePilotage.enregistreBloc).
+        Le service répond aux requêtes suivantes :
+
+        * GET /bloc : la description d'un bloc à calculer, en JSON ;
+        * POST /bloc/k?specification=... : le résultat du bloc k, au
+          format NumPy .npz ;
+        * GET /progression : la progression du balayage.
+
+        Les blocs sont distribués à la demande : un processus rapide
+        calcule plus de blocs qu'un processus lent.
+        Un bloc distribué est réservé pendant le délai donné : si son
+        résultat n'est pas reçu à temps, par exemple parce que le
+        processus a été arrêté, le bloc est distribué de nouveau.
+        Quand tous les blocs restants sont réservés, un processus
+        inoccupé reçoit le bloc réservé depuis le plus longtemps : les
+        derniers blocs ne sont pas ralentis par un processus lent.
+        Le premier résultat reçu est enregistré, les suivants sont
+        ignorés.
+
+        Parameters
+        ----------
+        balayage : BalayagePilotage
+            Le balayage, qui peut être partiellement calculé.
+        adresse : str
+            L'adresse d'écoute (par défaut, "127.0.0.1").
+        port : int
+            Le port d'écoute (par défaut, 0 : le système choisit un
+            port libre).
+        delai : float
+            La durée de réservation d'un bloc en secondes
+            (par défaut, 600).
+
+        Attributes
+        ----------
+        balayage : BalayagePilotage
+            Le balayage.
+        adresse : str
+            L'adresse d'écoute.
+        port : int
+            Le port d'écoute.
+        delai : float
+            La durée de réservation d'un bloc en secondes.
+        nombre_distributions : int
+            Le nombre de blocs distribués.
+        nombre_relances : int
+            Le nombre de blocs distribués de nouveau après expiration
+            de leur réservation.
+        nombre_vols : int
+            Le nombre de blocs réservés distribués à un autre processus.
+
+        Examples
+        --------
+        >>> balayage = BalayagePilotage(simulateur, "balayage", parametres)
+        >>> coordinateur = CoordinateurBalayage(balayage, "0.0.0.0", 8100)
+        >>> coordinateur.demarre()
+        >>> # Sur chaque nœud :
+        >>> # TravailleurBalayage("http://coordinateur:8100").execute()
+        >>> coordinateur.attend()
+        >>> coordinateur.arrete()
+        """
+        self.balayage = balayage
+        self.adresse = adresse
+        self.port = port
+        self.delai = delai
+        self.nombre_distributions = 0
+        self.nombre_relances = 0
+        self.nombre_vols = 0
+        # Réservations : bail[k] est la date de distribution du bloc k,
+        # selon une horloge monotone
+        self._baux = dict()
+        self._condition = threading.Condition()
+        self._serveur = None
+        self._thread = None
+        return None
+
+    def getURL(self):
+        """
+        Retourne l'URL du service.
+
+        Returns
+        -------
+        url : str
+            L'URL, par exemple "http://127.0.0.1:8100".
+        """
+        url = "http://%s:%d" % (self.adresse, self.port)
+        return url
+
+    def distribue(self):
+        """
+        Choisit le prochain bloc à calculer et le réserve.
+
+        Returns
+        -------
+        description : dict
+            La description du bloc : les clés sont "bloc" (None si le
+            balayage est terminé), "methode", "variables",
+            "specification", "empreinte" (l'empreinte des hypothèses du
+            simulateur) et "parametres" (les paramètres du bloc, où les
+            tableaux sont des listes).
+        """
+        balayage = self.balayage
+        description = {
+            "bloc": None,
+            "methode": balayage.methode,
+            "variables": balayage.variables,
+            "specification": balayage.specification,
+            "empreinte": balayage.simulateur.getEmpreinteDonnees(),
+            "parametres": None,
+        }
+        with self._condition:
+            restants = balayage.getBlocsRestants()
+            if len(restants) == 0:
+                return description
+            maintenant = time.monotonic()
+            libres = [
+                k
+                for k in restants
+                if k not in self._baux
+                or maintenant - self._baux[k] >= self.delai
+            ]
+            if len(libres) > 0:
+                k = libres[0]
+                if k in self._baux:
+                    self.nombre_relances += 1
+            else:
+                # Tous les blocs restants sont réservés : vole le plus
+                # ancien
+                k = min(restants, key=self._baux.get)
+                self.nombre_vols += 1
+            self._baux[k] = maintenant
+            self.nombre_distributions += 1
+        parametres = dict()
+        for nom, valeur in balayage.getParametresBloc(k).items():
+            if isinstance(valeur, np.ndarray):
+                valeur = valeur.tolist()
+            parametres[nom] = valeur
+        description["bloc"] = k
+        description["parametres"] = parametres
+        return description
+
+    def recoit(self, k, specification, contenu):
+        """
+        Enregistre le résultat d'un bloc.
+
+        Parameters
+        ----------
+        k : int
+            L'indice du bloc.
+        specification : str
+            L'empreinte de la spécification du balayage calculé.
+        contenu : bytes
+            Le résultat du bloc au format NumPy .npz : une variable
+            par tableau.
+            Un contenu illisible, ou dont un tableau n'a pas la taille
+            attendue, lève une ValueError.
+        """
+        if specification != self.balayage.specification:
+            raise ValueError(
+                "Le résultat provient d'un autre balayage : %s"
+                % (specification)
+            )
+        try:
+            bloc = np.load(io.BytesIO(contenu), allow_pickle=False)
+            if not isinstance(bloc, np.lib.npyio.NpzFile):
+                raise ValueError("le contenu n'est pas au format .npz")
+            with bloc:
+                resultats = {nom: bloc[nom] for nom in bloc.files}
+        except (EOFError, ValueError, zipfile.BadZipFile) as erreur:
+            raise ValueError(
+                "Le résultat du bloc %d n'est pas lisible : %s" % (k, erreur)
+            )
+        with self._condition:
+            self.balayage.enregistreBloc(k, resultats)
+            self._baux.pop(k, None)
+            self._condition.notify_all()
+        return None
+
+    def attend(self, delai=None):
+        """
+        Attend la fin du balayage.
+
+        Parameters
+        ----------
+        delai : float
+            La durée maximale d'attente en secondes (par défaut,
+            pas de limite).
+
+        Returns
+        -------
+        termine : bool
+            True si le balayage est terminé.
+        """
+        with self._condition:
+            termine = self._condition.wait_for(self.balayage.estTermine, delai)
+        return termine
+
+    def demarre(self):
+        """
+        Démarre le service dans un thread.
+
+        Si le port est 0, l'attribut port contient ensuite le port
+        choisi par le système.
+        """
+        if self._serveur is not None:
+            raise ValueError("Le service est déjà démarré")
+        self._serveur = ThreadingHTTPServer(
+            (self.adresse, self.port), _GestionnaireRequetes
+        )
+        self._serveur.daemon_threads = True
+        self._serveur.coordinateur = self
+        self.port = self._serveur.server_address[1]
+        self._thread = threading.Thread(
+            target=self._serveur.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return None
+
+    def arrete(self):
+        """
+        Arrête le service.
+        """
+        if self._serveur is not None:
+            self._serveur.shutdown()
+            self._serveur.server_close()
+            self._thread.join()
+            self._serveur = None
+            self._thread = None
+        return None
+
+
+class _GestionnaireRequetes(BaseHTTPRequestHandler):
+    """
+    Gestionnaire des requêtes HTTP du coordinateur de balayage.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        coordinateur = self.server.coordinateur
+        if url.path == "/bloc":
+            self._repond(200, coordinateur.distribue())
+        elif url.path == "/progression":
+            with coordinateur._condition:
+                progression = coordinateur.balayage.getProgression()
+            self._repond(200, progression)
+        else:
+            self._repond(404, {"erreur": "Chemin inconnu : %s" % (url.path)})
+        return None
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        valeur = self.headers.get("Content-Length", "0")
+        try:
+            longueur = int(valeur)
+            if longueur < 0:
+                raise ValueError
+        except ValueError:
+            # Le contenu ne peut pas être lu : la connexion est fermée
+            self.close_connection = True
+            self._repond(
+                400,
+                {
+                    "erreur": "Mauvaise valeur pour l'en-tête "
+                    "Content-Length : %s" % (valeur)
+                },
+            )
+            return None
+        contenu = self.rfile.read(longueur)
+        morceaux = url.path.split("/")
+        if len(morceaux) != 3 or morceaux[1] != "bloc":
+            self._repond(404, {"erreur": "Chemin inconnu : %s" % (url.path)})
+            return None
+        requete = dict(parse_qsl(url.query))
+        try:
+            k = int(morceaux[2])
+            self.server.coordinateur.recoit(
+                k, requete.get("specification"), contenu
+            )
+        except (
+            KeyError,
+            OSError,
+            TypeError,
+            ValueError,
+            zipfile.BadZipFile,
+        ) as erreur:
+            self._repond(400, {"erreur": str(erreur)})
+            return None
+        self._repond(200, {"statut": "ok"})
+        return None
+
+    def _repond(self, code, contenu):
+        reponse = json.dumps(contenu).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reponse)))
+        self.end_headers()
+        self.wfile.write(reponse)
+        return None
+
+    def log_message(self, format, *args):
+        # Pas de journal sur la sortie d'erreur à chaque requête
+        return None
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de partage des hypothèses du simulateur en mémoire partagée.
+"""
+from multiprocessing import shared_memory
+from retraites.DonneesTableaux import DonneesTableaux
+import numpy as np
+
+# Blocs ouverts par ce processus : un bloc reste ouvert jusqu'à la fin
+# du processus, car la fermeture d'un bloc invalide les vues NumPy
+_blocs = dict()
+
+
+def _ouvreBloc(nom):
+    """
+    Ouvre un bloc de mémoire partagée, une seule fois par processus.
+
+    Parameters
+    ----------
+    nom : str
+        Le nom du bloc.
+
+    Returns
+    -------
+    bloc : shared_memory.SharedMemory
+        Le bloc.
+    """
+    if nom not in _blocs:
+        _blocs[nom] = shared_memory.SharedMemory(name=nom)
+    return _blocs[nom]
+
+
+class DonneesPartagees(DonneesTableaux):
+    def __init__(self, simulateur):
+        """
+        Publie les hypothèses d'un simulateur dans un bloc de mémoire
+        partagée.
+
+        Chaque variable du fichier d'hypothèses est copiée une seule
+        fois, sous la forme d'un tableau dense, dans un bloc
+        multiprocessing.shared_memory (voir DonneesTableaux).
+        L'objet peut être transmis aux processus de calcul, par exemple
+        en argument d'une fonction exécutée par un ProcessPoolExecutor :
+        seuls le nom du bloc et la disposition des tableaux sont
+        sérialisés.
+        Dans chaque processus, SimulateurRetraites(donnees_partagees=...)
+        crée alors un simulateur dont les trajectoires du COR sont des
+        vues en lecture seule sur le bloc, sans lecture du fichier JSON
+        ni copie des données.
+
+        Le processus qui publie le bloc en est le propriétaire : il doit
+        le libérer par la méthode libere (ou en utilisant l'objet dans
+        un bloc with) quand les calculs sont terminés.
+        Chaque processus ouvre le bloc une seule fois et le garde
+        ouvert jusqu'à sa fin : les vues restent donc valides.
+
+        Parameters
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur dont les hypothèses sont publiées.
+
+        Attributes
+        ----------
+        nom : str
+            Le nom du bloc de mémoire partagée.
+        scenarios : list of int
+            Les scénarios des tableaux.
+        annees : dict
+            annees[nom] est la liste des années du tableau de la
+            variable nom.
+        empreinte : str
+            L'empreinte des hypothèses (voir
+            SimulateurRetraites.getEmpreinteDonnees).
+
+        Examples
+        --------
+        >>> def calcule(arguments):
+        ...     donnees, Acible = arguments
+        ...     simulateur = SimulateurRetraites(donnees_partagees=donnees)
+        ...     analyse = simulateur.pilotageParSoldePensionAge(Acible=Acible)
+        ...     return analyse.P[3][2050]
+        >>> simulateur = SimulateurRetraites()
+        >>> with DonneesPartagees(simulateur) as donnees:
+        ...     with ProcessPoolExecutor() as executeur:
+        ...         arguments = [(donnees, age) for age in [62.0, 63.0]]
+        ...         P = list(executeur.map(calcule, arguments))
+        """
+        if isinstance(simulateur._donnees_partagees, DonneesPartagees):
+            raise ValueError(
+                "Le simulateur utilise déjà des données partagées"
+            )
+        self._proprietaire = False
+        DonneesTableaux.__init__(self, simulateur)
+        self._proprietaire = True
+        return None
+
+    def _alloue(self, taille):
+        """
+        Alloue le tableau de toutes les valeurs dans un nouveau bloc.
+
+        Parameters
+        ----------
+        taille : int
+            Le nombre de valeurs.
+
+        Returns
+        -------
+        valeurs : ndarray
+            Le tableau de dimension 1, dans le bloc.
+        """
+        bloc = shared_memory.SharedMemory(create=True, size=max(1, 8 * taille))
+        self.nom = bloc.name
+        _blocs[self.nom] = bloc
+        valeurs = np.ndarray((taille,), dtype=float, buffer=bloc.buf)
+        return valeurs
+
+    def libere(self):
+        """
+        Supprime le bloc, s'il appartient à ce processus.
+
+        Les processus qui ont ouvert le bloc peuvent continuer à
+        l'utiliser : la mémoire est rendue au système quand le dernier
+        d'entre eux se termine.
+        """
+        if self._proprietaire:
+            _blocs[self.nom].unlink()
+            self._proprietaire = False
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exception, exception, trace):
+        self.libere()
+        return False
+
+    def __getstate__(self):
+        # Seuls le nom du bloc et la disposition sont transmis
+        etat = self.__dict__.copy()
+        del etat["_tableaux"]
+        del etat["_valeurs"]
+        etat["_proprietaire"] = False
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        bloc = _ouvreBloc(self.nom)
+        taille = sum(
+            forme[0] * forme[1] for debut, forme in self._disposition.values()
+        )
+        self._valeurs = np.ndarray((taille,), dtype=float, buffer=bloc.buf)
+        self._valeurs.flags.writeable = False
+        self._tableaux = self._creeVues()
+        return None
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe des hypothèses du simulateur sous forme de tableaux denses.
+"""
+import numpy as np
+
+
+class DonneesTableaux:
+    def __init__(self, simulateur):
+        """
+        Copie les hypothèses d'un simulateur dans des tableaux denses.
+
+        Toutes les variables du fichier d'hypothèses sont rangées dans
+        un unique tableau de flottants, dont chaque variable est une
+        vue de taille (len(scenarios), len(annees[nom])).
+        L'objet est donc sérialisé par pickle sous la forme d'un seul
+        tampon : avec le protocole 5, ce tampon peut être transmis hors
+        bande, sans copie.
+
+        SimulateurRetraites(donnees_partagees=...) crée un simulateur
+        à partir de ces tableaux, sans lire le fichier JSON.
+        C'est ainsi qu'un simulateur est sérialisé (voir
+        SimulateurRetraites.__getstate__).
+
+        Parameters
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur dont les hypothèses sont copiées.
+
+        Attributes
+        ----------
+        scenarios : list of int
+            Les scénarios des tableaux.
+        annees : dict
+            annees[nom] est la liste des années du tableau de la
+            variable nom.
+        empreinte : str
+            L'empreinte des hypothèses (voir
+            SimulateurRetraites.getEmpreinteDonnees).
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> donnees = DonneesTableaux(simulateur)
+        >>> NC = donnees.getTableau("NC")
+        """
+        self.scenarios = list(simulateur.scenarios)
+        self.empreinte = simulateur.getEmpreinteDonnees()
+        data = simulateur.data
+        if data is None:
+            # Le simulateur a lui-même été créé à partir de tableaux
+            source = simulateur._donnees_partagees
+            self.annees = dict(source.annees)
+            valeurs = source.getTableau
+        else:
+            self.annees = dict()
+            for nom in sorted(data):
+                annees = data[nom][str(self.scenarios[0])]
+                self.annees[nom] = sorted(int(a) for a in annees)
+
+            def valeurs(nom):
+                return [
+                    [data[nom][str(s)][str(a)] for a in self.annees[nom]]
+                    for s in self.scenarios
+                ]
+
+        self._disposition = self._calculeDisposition()
+        taille = sum(
+            forme[0] * forme[1] for debut, forme in self._disposition.values()
+        )
+        self._valeurs = self._alloue(taille)
+        for nom, (debut, forme) in self._disposition.items():
+            fin = debut + forme[0] * forme[1]
+            self._valeurs[debut:fin].reshape(forme)[:] = valeurs(nom)
+        self._valeurs.flags.writeable = False
+        self._tableaux = self._creeVues()
+        return None
+
+    def _alloue(self, taille):
+        """
+        Alloue le tableau de toutes les valeurs.
+
+        Parameters
+        ----------
+        taille : int
+            Le nombre de valeurs.
+
+        Returns
+        -------
+        valeurs : ndarray
+            Le tableau de dimension 1.
+        """
+        valeurs = np.empty(taille)
+        return valeurs
+
+    def _calculeDisposition(self):
+        """
+        Calcule la position des tableaux dans le tableau des valeurs.
+
+        Returns
+        -------
+        disposition : dict
+            disposition[nom] est le couple (indice de début, forme) du
+            tableau de la variable nom.
+        """
+        disposition = dict()
+        debut = 0
+        for nom in sorted(self.annees):
+            forme = (len(self.scenarios), len(self.annees[nom]))
+            disposition[nom] = (debut, forme)
+            debut += forme[0] * forme[1]
+        return disposition
+
+    def _creeVues(self):
+        """
+        Crée les vues en lecture seule sur les tableaux des variables.
+
+        Returns
+        -------
+        tableaux : dict
+            tableaux[nom] est la vue du tableau de la variable nom.
+        """
+        tableaux = dict()
+        for nom, (debut, forme) in self._disposition.items():
+            fin = debut + forme[0] * forme[1]
+            tableau = self._valeurs[debut:fin].reshape(forme)
+            tableau.flags.writeable = False
+            tableaux[nom] = tableau
+        return tableaux
+
+    def getTableau(self, nom):
+        """
+        Retourne le tableau d'une variable, sans copie.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la variable dans le fichier d'hypothèses.
+
+        Returns
+        -------
+        tableau : ndarray
+            La vue en lecture seule, de taille
+            (len(scenarios), len(annees[nom])).
+        """
+        if nom not in self._tableaux:
+            raise ValueError("Mauvaise valeur pour le nom : %s" % (nom))
+        return self._tableaux[nom]
+
+    def __getstate__(self):
+        # Les vues sont recréées à partir du tableau des valeurs
+        etat = self.__dict__.copy()
+        del etat["_tableaux"]
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        self._tableaux = self._creeVues()
+        return None
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de résumé en flux d'un grand ensemble de trajectoires.
+"""
+import numpy as np
+import pylab as pl
+import warnings
+
+
+class EnsembleTrajectoires:
+    def __init__(self, annees, bornes, nombre_classes=500):
+        """
+        Crée un résumé d'un ensemble de trajectoires d'une variable.
+
+        Les trajectoires, par exemple issues d'un balayage des
+        paramètres de pilotage ou d'une simulation de Monte-Carlo,
+        sont ajoutées par blocs.
+        Pour chaque année, le résumé est un histogramme à classes fixes :
+        la mémoire utilisée ne dépend pas du nombre de trajectoires.
+        Les quantiles sont calculés par interpolation linéaire dans
+        les histogrammes : leur précision est la largeur d'une classe.
+
+        Les valeurs en dehors des bornes sont comptées dans la première
+        ou la dernière classe, avec un avertissement : les quantiles
+        situés dans ces classes ne sont alors pas fiables (voir
+        l'attribut nombre_hors_bornes).
+        Les bornes doivent donc contenir toutes les valeurs attendues.
+
+        Parameters
+        ----------
+        annees : list of int
+            Les années des trajectoires.
+        bornes : list of float
+            Une liste de taille 2, les bornes inférieure et supérieure
+            des histogrammes.
+        nombre_classes : int
+            Le nombre de classes des histogrammes (par défaut, 500).
+
+        Attributes
+        ----------
+        annees : list of int
+            Les années des trajectoires.
+        bornes : list of float
+            Les bornes des histogrammes.
+        nombre_classes : int
+            Le nombre de classes des histogrammes.
+        limites : ndarray
+            Les limites des classes, de taille nombre_classes + 1.
+        effectifs : ndarray
+            Les effectifs des classes, de taille
+            (len(annees), nombre_classes).
+        taille : int
+            Le nombre de trajectoires ajoutées.
+        nombre_hors_bornes : int
+            Le nombre de valeurs en dehors des bornes.
+        somme : ndarray
+            La somme des valeurs de chaque année.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> ensemble = EnsembleTrajectoires(simulateur.annees, [-3.0, 3.0])
+        >>> for i in range(10):
+        ...     resultat, _ = simulateur.pilotageStochastique(
+        ...         croissance[i], chomage[i]
+        ...     )
+        ...     ensemble.ajoute(100.0 * resultat["S"])
+        >>> quantiles = ensemble.getQuantiles([0.05, 0.5, 0.95])
+        >>> ensemble.dessineEventail()
+        """
+        if bornes[0] >= bornes[1]:
+            raise ValueError(
+                "Les bornes doivent être croissantes : %s" % (bornes)
+            )
+        if nombre_classes < 1:
+            raise ValueError(
+                "Le nombre de classes doit être positif : %s"
+                % (nombre_classes)
+            )
+        self.annees = list(annees)
+        self.bornes = [float(bornes[0]), float(bornes[1])]
+        self.nombre_classes = nombre_classes
+        self.limites = np.linspace(bornes[0], bornes[1], nombre_classes + 1)
+        self.effectifs = np.zeros((len(self.annees), nombre_classes), int)
+        self.taille = 0
+        self.nombre_hors_bornes = 0
+        self.somme = np.zeros(len(self.annees))
+        return None
+
+    def ajoute(self, Y):
+        """
+        Ajoute un bloc de trajectoires.
+
+        Parameters
+        ----------
+        Y : ndarray
+            Un tableau de taille (n, len(annees)) : chaque ligne est une
+            trajectoire.
+            Si des valeurs sont en dehors des bornes, un
+            RuntimeWarning est émis.
+        """
+        Y = np.atleast_2d(np.asarray(Y, dtype=float))
+        if Y.ndim != 2 or Y.shape[1] != len(self.annees):
+            raise ValueError("Mauvaise taille pour le bloc : %s" % (Y.shape,))
+        if np.any(np.isnan(Y)):
+            raise ValueError("Le bloc contient des valeurs manquantes")
+        largeur = (self.bornes[1] - self.bornes[0]) / self.nombre_classes
+        classes = np.floor((Y - self.bornes[0]) / largeur).astype(int)
+        hors_bornes = int(np.sum((Y < self.bornes[0]) | (Y > self.bornes[1])))
+        if hors_bornes > 0:
+            warnings.warn(
+                "%d valeurs en dehors des bornes %s : les quantiles des "
+                "classes extrêmes ne sont pas fiables"
+                % (hors_bornes, self.bornes),
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        self.nombre_hors_bornes += hors_bornes
+        classes = np.clip(classes, 0, self.nombre_classes - 1)
+        # Une seule passe sur le bloc : indice global (année, classe)
+        indices = classes + self.nombre_classes * np.arange(len(self.annees))
+        effectifs = np.bincount(indices.ravel(), minlength=self.effectifs.size)
+        self.effectifs += effectifs.reshape(self.effectifs.shape)
+        self.taille += Y.shape[0]
+        self.somme += np.sum(Y, axis=0)
+        return None
+
+    def getMoyenne(self):
+        """
+        Retourne la moyenne des trajectoires.
+
+        Returns
+        -------
+        moyenne : ndarray
+            La moyenne de chaque année, de taille len(annees).
+        """
+        if self.taille == 0:
+            raise ValueError("L'ensemble est vide")
+        moyenne = self.somme / self.taille
+        return moyenne
+
+    def getQuantiles(self, niveaux):
+        """
+        Retourne les quantiles des trajectoires pour chaque année.
+
+        Parameters
+        ----------
+        niveaux : list of float
+            Les niveaux des quantiles, dans l'intervalle [0, 1].
+
+        Returns
+        -------
+        quantiles : ndarray
+            Un tableau de taille (len(niveaux), len(annees)).
+            Si des valeurs sont en dehors des bornes, les quantiles
+            situés dans la première ou la dernière classe ne sont pas
+            fiables.
+        """
+        if self.taille == 0:
+            raise ValueError("L'ensemble est vide")
+        niveaux = np.asarray(niveaux, dtype=float)
+        if np.any(niveaux < 0.0) or np.any(niveaux > 1.0):
+            raise ValueError("Les niveaux doivent être dans [0, 1]")
+        cumul = np.cumsum(self.effectifs, axis=1)
+        cibles = niveaux[:, np.newaxis] * self.taille
+        # Classe contenant chaque quantile, pour chaque année
+        classes = np.sum(
+            cumul[np.newaxis, :, :] < cibles[:, :, np.newaxis], axis=2
+        )
+        classes = np.minimum(classes, self.nombre_classes - 1)
+        annees = np.arange(len(self.annees))[np.newaxis, :]
+        effectifs = self.effectifs[annees, classes]
+        avant = cumul[annees, classes] - effectifs
+        fraction = np.where(
+            effectifs > 0, (cibles - avant) / np.maximum(effectifs, 1), 0.0
+        )
+        largeur = (self.bornes[1] - self.bornes[0]) / self.nombre_classes
+        quantiles = (
+            self.limites[classes] + np.clip(fraction, 0.0, 1.0) * largeur
+        )
+        return quantiles
+
+    def dessineEventail(
+        self,
+        ax=None,
+        niveaux=None,
+        dessine_mediane=True,
+        couleur="tab:blue",
+        label=None,
+    ):
+        """
+        Dessine les quantiles des trajectoires en éventail.
+
+        Chaque niveau q donne une bande entre les quantiles q et 1 - q.
+
+        Parameters
+        ----------
+        ax : matplotlib.axes.Axes
+            Les axes dans lesquels dessiner (par défaut, les axes
+            courants de pylab).
+        niveaux : list of float
+            Les niveaux inférieurs des bandes, dans l'intervalle [0, 0.5[
+            (par défaut, les bandes 5%-95% et 25%-75%).
+        dessine_mediane : bool
+            Si True, dessine la médiane.
+        couleur : str
+            La couleur de l'éventail.
+        label : str
+            L'étiquette de la médiane dans la légende.
+
+        Returns
+        -------
+        ax : matplotlib.axes.Axes
+            Les axes du graphique.
+        """
+        if ax is None:
+            ax = pl.gca()
+        if niveaux is None:
+            niveaux = [0.05, 0.25]
+        niveaux = sorted(niveaux)
+        bandes = self.getQuantiles(niveaux + [1.0 - q for q in niveaux])
+        for i, q in enumerate(niveaux):
+            ax.fill_between(
+                self.annees,
+                bandes[i],
+                bandes[len(niveaux) + i],
+                color=couleur,
+                alpha=0.2 + 0.2 * i / max(1, len(niveaux) - 1),
+                linewidth=0.0,
+            )
+        if dessine_mediane:
+            mediane = self.getQuantiles([0.5])[0]
+            ax.plot(self.annees, mediane, color=couleur, label=label)
+        return ax
+
+    def dessineDensite(self, ax=None, cmap="Blues"):
+        """
+        Dessine la densité des trajectoires pour chaque année.
+
+        Les histogrammes de chaque année sont normalisés puis dessinés
+        comme une image : c'est un histogramme à deux dimensions
+        (année, valeur).
+
+        Parameters
+        ----------
+        ax : matplotlib.axes.Axes
+            Les axes dans lesquels dessiner (par défaut, les axes
+            courants de pylab).
+        cmap : str
+            La carte de couleurs.
+
+        Returns
+        -------
+        ax : matplotlib.axes.Axes
+            Les axes du graphique.
+        """
+        if ax is None:
+            ax = pl.gca()
+        if self.taille == 0:
+            raise ValueError("L'ensemble est vide")
+        largeur = (self.bornes[1] - self.bornes[0]) / self.nombre_classes
+        densite = self.effectifs / (self.taille * largeur)
+        annees = np.array(self.annees)
+        limites_annees = np.concatenate([annees - 0.5, [annees[-1] + 0.5]])
+        ax.pcolormesh(limites_annees, self.limites, densite.T, cmap=cmap)
+        return ax
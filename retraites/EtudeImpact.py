@@ -4,7 +4,6 @@
 Classe pour simuler l'étude d'impact de Janvier 2020.
 """
 from scipy import interpolate
-from copy import deepcopy
 
 
 class EtudeImpact:
@@ -94,9 +93,10 @@ class EtudeImpact:
         self.depenses_valeurs = [0.136, 0.135, 0.133, 0.129, 0.1275, 0.126]
 
         self.analyse = self.simulateur.pilotageCOR()
-        self.Ds = deepcopy(self.analyse.Depenses)
-        self.Ss = deepcopy(self.analyse.S)
-        self.As = deepcopy(self.analyse.A)
+        # Trajectoires du COR, copiées à l'écriture
+        self.Ds = self.simulateur.genereTrajectoire("Depenses")
+        self.Ss = self.simulateur.genereTrajectoire("S")
+        self.As = self.simulateur.genereTrajectoire("A")
 
         # Paramètres pour le calcul des âges
         # Paramètres de l'interpolation linéaire
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe d'exploration multi-objectif des leviers de pilotage.
+"""
+import numpy as np
+
+# Les variables d'un point exploré
+_VARIABLES = ["A", "T", "P", "S", "RNV", "REV", "Depenses"]
+
+
+class ExplorationPareto:
+    def __init__(
+        self,
+        simulateur,
+        bornes,
+        objectifs=None,
+        leviers=None,
+        Scible=0.0,
+        scenarios=None,
+        annees=None,
+    ):
+        """
+        Crée une exploration du front de Pareto des leviers de pilotage.
+
+        Pour chaque scénario et chaque année, le solde financier est
+        imposé : deux leviers, par exemple l'âge de départ et le taux
+        de cotisations, sont alors libres et déterminent toutes les
+        autres variables.
+        Les leviers sont échantillonnés dans leurs bornes, puis chaque
+        échantillon est évalué en une seule fois par les noyaux
+        vectorisés de pilotage (voir SimulateurRetraites._construitNoyau
+        et SimulateurRetraites._noyau_S_RNV_REV).
+        Les points qui respectent les bornes des autres variables
+        (par exemple un niveau de vie minimal) sont comparés selon les
+        objectifs : un point est dominé si un autre point est au moins
+        aussi bon pour tous les objectifs et meilleur pour au moins
+        un objectif.
+        Le front de Pareto est l'ensemble des points non dominés.
+
+        Parameters
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        bornes : dict
+            bornes[nom] est la liste [inf, sup] des bornes de la
+            variable nom, parmi "A", "T", "P", "RNV", "REV" et
+            "Depenses".
+            Les bornes des deux leviers sont obligatoires : ce sont
+            celles de l'échantillonnage.
+            Les bornes des autres variables sont des contraintes.
+            Une borne None n'est pas imposée.
+        objectifs : dict
+            objectifs[nom] est "min" si la variable nom doit être
+            minimisée et "max" si elle doit être maximisée
+            (par défaut, {"A": "min", "RNV": "max"}).
+            Avec deux objectifs, le front est calculé par un tri des
+            points ; avec plus de deux objectifs, son coût est
+            proportionnel au nombre de points multiplié par la taille
+            du front.
+        leviers : list of str
+            Les deux leviers échantillonnés, parmi "A", "T", "P",
+            "RNV", "REV" et "Depenses" (par défaut, ["A", "T"]).
+        Scible : float or dict
+            Le solde financier imposé (par défaut, 0.0, l'équilibre).
+            Voir SimulateurRetraites.genereTrajectoire.
+        scenarios : list of int
+            Les scénarios explorés (par défaut, tous les scénarios).
+        annees : list of int
+            Les années explorées (par défaut, les années standard
+            futures).
+
+        Attributes
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        bornes : dict
+            Les bornes des variables.
+        objectifs : dict
+            Les objectifs.
+        leviers : list of str
+            Les deux leviers.
+        scenarios : list of int
+            Les scénarios explorés.
+        annees : list of int
+            Les années explorées.
+        nombre_evaluations : int
+            Le nombre de points évalués.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> exploration = ExplorationPareto(
+        ...     simulateur,
+        ...     {"A": [60.0, 67.0], "T": [0.28, 0.31], "P": [0.3, None]},
+        ...     {"A": "min", "RNV": "max"},
+        ... )
+        >>> front = exploration.explore(1000000, graine=0)
+        >>> A = front[3][2050]["A"]
+        """
+        if objectifs is None:
+            objectifs = {"A": "min", "RNV": "max"}
+        if leviers is None:
+            leviers = ["A", "T"]
+        if scenarios is None:
+            scenarios = list(simulateur.scenarios)
+        if annees is None:
+            annees = [
+                a
+                for a in simulateur.annees_standard
+                if a >= simulateur.annee_courante
+            ]
+        variables = ["A", "T", "P", "RNV", "REV", "Depenses"]
+        if len(leviers) != 2 or len(set(leviers)) != 2:
+            raise ValueError(
+                "Il faut deux leviers différents : %s" % (leviers,)
+            )
+        for nom in list(leviers) + list(bornes):
+            if nom not in variables:
+                raise ValueError("Mauvaise valeur pour le nom : %s" % (nom))
+        for nom in leviers:
+            if nom not in bornes or None in bornes[nom]:
+                raise ValueError(
+                    "Les bornes du levier %s sont obligatoires" % (nom)
+                )
+        if len(objectifs) == 0:
+            raise ValueError("Il faut au moins un objectif")
+        for nom, sens in objectifs.items():
+            if nom not in _VARIABLES:
+                raise ValueError(
+                    "Mauvaise valeur pour l'objectif : %s" % (nom)
+                )
+            if sens not in ["min", "max"]:
+                raise ValueError(
+                    "Mauvaise valeur pour le sens de l'objectif %s : %s"
+                    % (nom, sens)
+                )
+        for s in scenarios:
+            if s not in simulateur.scenarios:
+                raise ValueError("Mauvaise valeur pour le scénario : %s" % (s))
+        for a in annees:
+            if a not in simulateur.annees:
+                raise ValueError("Mauvaise valeur pour l'année : %s" % (a))
+        self.simulateur = simulateur
+        self.bornes = dict(bornes)
+        self.objectifs = dict(objectifs)
+        self.leviers = list(leviers)
+        self.scenarios = list(scenarios)
+        self.annees = list(annees)
+        self.nombre_evaluations = 0
+        self._Ss = simulateur.genereTrajectoire("S", Scible)
+        self._noyau = simulateur._construitNoyau(["S"] + self.leviers)
+        return None
+
+    def evalue(self, s, a, X, Y):
+        """
+        Evalue des points de l'espace des leviers.
+
+        Parameters
+        ----------
+        s : int
+            Le scénario.
+        a : int
+            L'année.
+        X : ndarray
+            Les valeurs du premier levier, de taille n.
+        Y : ndarray
+            Les valeurs du second levier, de taille n.
+
+        Returns
+        -------
+        points : dict
+            points[nom] est le tableau de taille n de la variable nom,
+            pour nom dans "A", "T", "P", "S", "RNV", "REV" et
+            "Depenses".
+            Les variables d'un point dont l'âge n'est pas défini, ou
+            dont la génération est hors des données d'espérance de vie
+            du simulateur, valent nan.
+        """
+        simulateur = self.simulateur
+        c = simulateur._getConjonctureRestreinte(
+            simulateur.scenarios.index(s), [simulateur.annees.index(a)]
+        )
+        X = np.asarray(X, dtype=float)[:, np.newaxis]
+        Y = np.asarray(Y, dtype=float)[:, np.newaxis]
+        Ss = np.full_like(X, self._Ss[s][a])
+        T, P, A = self._noyau(c, Ss, X, Y)
+        T, P, A = [np.broadcast_to(v, X.shape) for v in [T, P, A]]
+        # Les âges non définis, ou dont la génération est hors des
+        # données d'espérance de vie, ne sont pas évalués
+        indices = np.round(c["annees"] + 0.5 - A) - simulateur.annees_EV[0]
+        valides = (indices >= 0) & (indices < len(simulateur.annees_EV))
+        As = np.where(valides, A, c["A"])
+        S, RNV, REV, Depenses = simulateur._noyau_S_RNV_REV(c, T, P, As)
+        tableaux = {
+            "A": A,
+            "T": T,
+            "P": P,
+            "S": S,
+            "RNV": RNV,
+            "REV": REV,
+            "Depenses": Depenses,
+        }
+        points = {
+            nom: np.where(valides, tableaux[nom], np.nan)[:, 0]
+            for nom in _VARIABLES
+        }
+        self.nombre_evaluations += X.shape[0]
+        return points
+
+    def _respecteBornes(self, points):
+        """
+        Teste si des points respectent les bornes.
+
+        Parameters
+        ----------
+        points : dict
+            Les points (voir evalue).
+
+        Returns
+        -------
+        admissibles : ndarray
+            Le tableau de booléens, True si toutes les variables du
+            point sont finies et respectent leurs bornes.
+        """
+        admissibles = np.all(
+            [np.isfinite(points[nom]) for nom in _VARIABLES], axis=0
+        )
+        for nom, (inf, sup) in self.bornes.items():
+            if inf is not None:
+                admissibles &= points[nom] >= inf
+            if sup is not None:
+                admissibles &= points[nom] <= sup
+        return admissibles
+
+    def calculeFront(self, points):
+        """
+        Retourne les points non dominés parmi des points admissibles.
+
+        Parameters
+        ----------
+        points : dict
+            Les points (voir evalue).
+
+        Returns
+        -------
+        front : dict
+            Les points non dominés qui respectent les bornes, triés
+            selon le premier objectif.
+        """
+        admissibles = self._respecteBornes(points)
+        points = {nom: v[admissibles] for nom, v in points.items()}
+        F = np.column_stack(
+            [
+                points[nom] if sens == "min" else -points[nom]
+                for nom, sens in self.objectifs.items()
+            ]
+        )
+        indices = np.flatnonzero(_nonDomines(F))
+        indices = indices[np.argsort(F[indices, 0], kind="stable")]
+        front = {nom: v[indices] for nom, v in points.items()}
+        return front
+
+    def explore(
+        self, nombre_points=100000, nombre_raffinements=0, graine=None
+    ):
+        """
+        Calcule le front de Pareto de chaque scénario et chaque année.
+
+        Les leviers sont d'abord tirés uniformément dans leurs bornes.
+        Chaque raffinement tire ensuite nombre_points nouveaux points
+        autour des points du front, dans un voisinage dont la largeur
+        est divisée par deux à chaque raffinement, puis recalcule le
+        front.
+
+        Parameters
+        ----------
+        nombre_points : int
+            Le nombre de points tirés pour chaque scénario, chaque
+            année et chaque étape (par défaut, 100000).
+        nombre_raffinements : int
+            Le nombre de raffinements (par défaut, 0).
+        graine : int
+            La graine du générateur aléatoire (par défaut, aléatoire).
+
+        Returns
+        -------
+        front : dict
+            front[s][a] est le front de Pareto du scénario s à l'année
+            a : front[s][a][nom] est le tableau des valeurs de la
+            variable nom aux points non dominés, triés selon le premier
+            objectif.
+        """
+        generateur = np.random.default_rng(graine)
+        inf = np.array([self.bornes[nom][0] for nom in self.leviers])
+        sup = np.array([self.bornes[nom][1] for nom in self.leviers])
+        front = dict()
+        for s in self.scenarios:
+            front[s] = dict()
+            for a in self.annees:
+                tirage = generateur.uniform(inf, sup, (nombre_points, 2))
+                courant = self.calculeFront(
+                    self.evalue(s, a, tirage[:, 0], tirage[:, 1])
+                )
+                largeur = sup - inf
+                for r in range(nombre_raffinements):
+                    if len(courant["A"]) == 0:
+                        break
+                    largeur = largeur / 2.0
+                    centres = np.column_stack(
+                        [courant[nom] for nom in self.leviers]
+                    )
+                    choix = generateur.integers(0, len(centres), nombre_points)
+                    tirage = centres[choix] + largeur * generateur.uniform(
+                        -0.5, 0.5, (nombre_points, 2)
+                    )
+                    tirage = np.clip(tirage, inf, sup)
+                    nouveaux = self.evalue(s, a, tirage[:, 0], tirage[:, 1])
+                    points = {
+                        nom: np.concatenate([courant[nom], nouveaux[nom]])
+                        for nom in _VARIABLES
+                    }
+                    courant = self.calculeFront(points)
+                front[s][a] = courant
+        return front
+
+
+def _nonDomines(F, taille_bloc=256):
+    """
+    Calcule les points non dominés d'un ensemble de points.
+
+    Tous les objectifs sont à minimiser.
+    Pour deux objectifs, un parcours des points triés selon le premier
+    objectif suffit.
+    Pour plus de deux objectifs, les points sont triés dans l'ordre
+    lexicographique : un point ne peut être dominé que par un point qui
+    le précède.
+    Chaque bloc de points triés est comparé aux points non dominés des
+    blocs précédents : le coût est proportionnel au nombre de points
+    multiplié par la taille du front.
+
+    Parameters
+    ----------
+    F : ndarray
+        Les valeurs des objectifs, de taille (n, nombre d'objectifs).
+    taille_bloc : int
+        Le nombre de points d'un bloc (par défaut, 256).
+
+    Returns
+    -------
+    non_domines : ndarray
+        Le tableau de booléens de taille n, True si le point n'est
+        pas dominé.
+    """
+    n, k = F.shape
+    non_domines = np.zeros(n, dtype=bool)
+    if n == 0:
+        return non_domines
+    if k == 1:
+        non_domines = F[:, 0] == np.min(F[:, 0])
+        return non_domines
+    if k == 2:
+        # Le tri selon le premier objectif suffit
+        ordre = np.argsort(F[:, 0])
+        f0, f1 = F[ordre, 0], F[ordre, 1]
+        nouveau = np.concatenate([[True], f0[1:] != f0[:-1]])
+        groupe = np.cumsum(nouveau) - 1
+        debuts = np.flatnonzero(nouveau)
+        minimum = np.minimum.accumulate(f1)
+        # Minimum de f1 parmi les points dont f0 est strictement plus petit
+        precedent = np.concatenate([[np.inf], minimum[debuts[1:] - 1]])
+        # Minimum de f1 parmi les points de même f0
+        minimum_groupe = np.minimum.reduceat(f1, debuts)
+        domines = (precedent[groupe] <= f1) | (minimum_groupe[groupe] < f1)
+        non_domines[ordre] = ~domines
+        return non_domines
+    ordre = np.lexsort(F.T[::-1])
+    G = F[ordre]
+    front = np.empty((0, k))
+    gardes = []
+    for debut in range(0, n, taille_bloc):
+        fin = min(debut + taille_bloc, n)
+        bloc = G[debut:fin]
+        # Dominés par le front des blocs précédents
+        inferieurs = np.all(front[:, np.newaxis] <= bloc, axis=-1)
+        stricts = np.any(front[:, np.newaxis] < bloc, axis=-1)
+        domines = np.any(inferieurs & stricts, axis=0)
+        # Dominés par un point du bloc
+        inferieurs = np.all(bloc[:, np.newaxis] <= bloc, axis=-1)
+        stricts = np.any(bloc[:, np.newaxis] < bloc, axis=-1)
+        domines |= np.any(inferieurs & stricts, axis=0)
+        front = np.concatenate([front, bloc[~domines]])
+        gardes.append(debut + np.flatnonzero(~domines))
+    non_domines[ordre[np.concatenate(gardes)]] = True
+    return non_domines
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import openturns as ot
-import scipy as sp
 
 
 class FonctionPension(ot.OpenTURNSPythonFunction):
@@ -31,6 +31,9 @@ class FonctionPension(ot.OpenTURNSPythonFunction):
         Le modèle calcule NC, dP, B, G, A, NR en fonction du taux
         de chômage TauC par interpolation dans les données
         du COR.
+        La table d'interpolation est calculée une seule fois par le
+        simulateur (voir SimulateurRetraites.getTableChomage) et
+        partagée par toutes les fonctions, quelle que soit l'année.
 
         Parameters
         ----------
@@ -50,20 +53,12 @@ class FonctionPension(ot.OpenTURNSPythonFunction):
             L'année de calcul.
         verbose : bool
             Si vrai, affiche les calculs intermédiaires.
-        interpolateur_NC : function
-            L'interpolateur du nombre de cotisants.
-        interpolateur_dP : function
-            L'interpolateur des autres dépenses de retraite.
-        interpolateur_B : function
-            L'interpolateur de la part des revenus d'activités bruts
-            dans le PIB.
-        interpolateur_NR : function
-            L'interpolateur du nombre de retraités.
-        interpolateur_G : function
-            L'interpolateur de l'effectif moyen d'une génération
-            arrivant aux âges de la retraite.
-        interpolateur_A : function
-            L'interpolateur de l'âge effectif moyen de départ en retraite.
+        table : TableInterpolation
+            La table d'interpolation de NC, dP, B, NR, G et A en
+            fonction du taux de chômage, partagée par toutes les
+            fonctions créées à partir du même simulateur.
+        indice_annee : int
+            L'indice de l'année dans la table d'interpolation.
 
         Examples
         --------
@@ -85,58 +80,9 @@ class FonctionPension(ot.OpenTURNSPythonFunction):
         # Configuration de la fonction
         self.setInputDescription(["S", "D", "As", "F", "TauC"])
         self.setOutputDescription(["P"])
-        # Calcul des interpolateurs
-        scenario_central = self.simulateur.scenario_central
-        scenario_optimiste = self.simulateur.scenario_optimiste
-        scenario_pessimiste = self.simulateur.scenario_pessimiste
-        # Table des taux de chômages
-        table_TauC = [
-            self.simulateur.scenarios_chomage[scenario_optimiste],
-            self.simulateur.scenarios_chomage[scenario_central],
-            self.simulateur.scenarios_chomage[scenario_pessimiste],
-        ]
-        # Table de NC
-        table_NC = [
-            self.simulateur.NC[scenario_optimiste][self.annee],
-            self.simulateur.NC[scenario_central][self.annee],
-            self.simulateur.NC[scenario_pessimiste][self.annee],
-        ]
-        self.interpolateur_NC = sp.interpolate.interp1d(table_TauC, table_NC)
-        # Table de dP
-        table_dP = [
-            self.simulateur.dP[scenario_optimiste][self.annee],
-            self.simulateur.dP[scenario_central][self.annee],
-            self.simulateur.dP[scenario_pessimiste][self.annee],
-        ]
-        self.interpolateur_dP = sp.interpolate.interp1d(table_TauC, table_dP)
-        # Table de B
-        table_B = [
-            self.simulateur.B[scenario_optimiste][self.annee],
-            self.simulateur.B[scenario_central][self.annee],
-            self.simulateur.B[scenario_pessimiste][self.annee],
-        ]
-        self.interpolateur_B = sp.interpolate.interp1d(table_TauC, table_B)
-        # Table de NR
-        table_NR = [
-            self.simulateur.NR[scenario_optimiste][self.annee],
-            self.simulateur.NR[scenario_central][self.annee],
-            self.simulateur.NR[scenario_pessimiste][self.annee],
-        ]
-        self.interpolateur_NR = sp.interpolate.interp1d(table_TauC, table_NR)
-        # Table de G
-        table_G = [
-            self.simulateur.G[scenario_optimiste][self.annee],
-            self.simulateur.G[scenario_central][self.annee],
-            self.simulateur.G[scenario_pessimiste][self.annee],
-        ]
-        self.interpolateur_G = sp.interpolate.interp1d(table_TauC, table_G)
-        # Table de A
-        table_A = [
-            self.simulateur.A[scenario_optimiste][self.annee],
-            self.simulateur.A[scenario_central][self.annee],
-            self.simulateur.A[scenario_pessimiste][self.annee],
-        ]
-        self.interpolateur_A = sp.interpolate.interp1d(table_TauC, table_A)
+        # Table d'interpolation partagée par le simulateur
+        self.table = self.simulateur.getTableChomage()
+        self.indice_annee = self.simulateur.annees.index(self.annee)
         return
 
     def _exec(self, X):
@@ -186,17 +132,9 @@ class FonctionPension(ot.OpenTURNSPythonFunction):
         S, D, As, F, TauC = X
         # Paramètres
         # Influence du taux de chômage
-        G = self.interpolateur_G(TauC)
-        A = self.interpolateur_A(TauC)
-        NC = self.interpolateur_NC(TauC)
-        dP = self.interpolateur_dP(TauC)
-        B = self.interpolateur_B(TauC)
-        NR = self.interpolateur_NR(TauC)
+        NC, dP, B, NR, G, A = self.table.interpole(TauC, self.indice_annee)
         # Coeur du modèle
-        T = (S + D) / B
-        g = G * (As - A)
-        K = (NR - g) / (NC + F * g)
-        P = (T - S / B) / K - dP
+        T, g, K, P = self._calculePension(S, D, As, F, NC, dP, B, NR, G, A)
         # Affichage
         if self.verbose:
             print("G=", G)
@@ -212,3 +150,51 @@ class FonctionPension(ot.OpenTURNSPythonFunction):
         # Sortie
         Y = [P]
         return Y
+
+    def _exec_sample(self, X):
+        """
+        Calcule la pension pour un échantillon de points.
+
+        Le calcul est vectorisé : les interpolations et le coeur du
+        modèle sont évalués sur tout l'échantillon à la fois.
+
+        Parameters
+        ----------
+        X : ot.Sample
+            Un échantillon de taille n et de dimension 5,
+            dont les colonnes sont [S, D, As, F, TauC].
+
+        Returns
+        -------
+        Y : ndarray
+            Un tableau de taille (n, 1) contenant P.
+        """
+        S, D, As, F, TauC = np.array(X).T
+        NC, dP, B, NR, G, A = self.table.interpole(TauC, self.indice_annee)
+        T, g, K, P = self._calculePension(S, D, As, F, NC, dP, B, NR, G, A)
+        Y = P[:, np.newaxis]
+        return Y
+
+    def _calculePension(self, S, D, As, F, NC, dP, B, NR, G, A):
+        """
+        Coeur du modèle de pension.
+
+        Les arguments peuvent être des flottants ou des tableaux.
+
+        Returns
+        -------
+        T : float or ndarray
+            Le taux de cotisations.
+        g : float or ndarray
+            La variation du nombre de retraités due au report de l'âge.
+        K : float or ndarray
+            Le rapport entre le nombre de retraités et le nombre
+            de cotisants, corrigé du report de l'âge.
+        P : float or ndarray
+            Le niveau des pensions par rapport aux salaires.
+        """
+        T = (S + D) / B
+        g = G * (As - A)
+        K = (NR - g) / (NC + F * g)
+        P = (T - S / B) / K - dP
+        return T, g, K, P
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import openturns as ot
 from retraites.FonctionPension import FonctionPension
 
@@ -142,6 +143,9 @@ class ModelePensionProbabiliste:
             Le modèle.
         inputDistribution : ot.Distribution.
             La distribution des variables d'entrée.
+        methodesPlanExperiences : list of str
+            La liste des méthodes de génération des plans d'expériences
+            utilisables par la méthode genereEchantillonEntrees.
         ageMin : float
             La borne inférieure de la distribution de l'âge moyen
             effectif de départ en retraite pour l'année.
@@ -177,6 +181,8 @@ class ModelePensionProbabiliste:
         TauC = ot.Uniform(tauxChomageMin, tauxChomageMax)
         self.inputDistribution = ot.ComposedDistribution([As, F, TauC])
         self.inputDistribution.setDescription(["As", "F", "TauC"])
+        # Plans d'expériences disponibles
+        self.methodesPlanExperiences = ["MonteCarlo", "LHS", "Sobol", "Halton"]
         return
 
     def getFonction(self):
@@ -266,3 +272,196 @@ class ModelePensionProbabiliste:
                     ageMax_horizon,
                 )
         return
+
+    def genereEchantillonEntrees(self, taille, methode="MonteCarlo"):
+        """
+        Génère un plan d'expériences pour les variables d'entrée.
+
+        Les méthodes disponibles sont les suivantes.
+
+        * "MonteCarlo" : échantillon aléatoire simple,
+        * "LHS" : hypercube latin,
+        * "Sobol" : suite à faible discrépance de Sobol' randomisée,
+        * "Halton" : suite à faible discrépance de Halton randomisée.
+
+        Les suites à faible discrépance sont randomisées par un décalage
+        aléatoire modulo 1 (rotation de Cranley-Patterson) : deux appels
+        successifs produisent deux répliques indépendantes du plan.
+        La moyenne empirique reste donc sans biais et la dispersion
+        entre répliques permet d'estimer l'erreur d'estimation.
+
+        Parameters
+        ----------
+        taille : int
+            La taille du plan d'expériences.
+        methode : str
+            La méthode de génération du plan d'expériences
+            (par défaut, methode="MonteCarlo").
+
+        Returns
+        -------
+        echantillon : ot.Sample
+            Le plan d'expériences, de dimension 3 (As, F, TauC).
+
+        Examples
+        --------
+        >>> modele = ModelePensionProbabiliste(simulateur, 2050, 0.0, 0.14)
+        >>> echantillon = modele.genereEchantillonEntrees(1024, "Sobol")
+        """
+        if methode == "MonteCarlo":
+            echantillon = self.inputDistribution.getSample(taille)
+        elif methode == "LHS":
+            plan = ot.LHSExperiment(self.inputDistribution, taille)
+            echantillon = plan.generate()
+        elif methode == "Sobol" or methode == "Halton":
+            if methode == "Sobol":
+                sequence = ot.SobolSequence()
+            else:
+                sequence = ot.HaltonSequence()
+            plan = ot.LowDiscrepancyExperiment(
+                sequence, self.inputDistribution, taille, True
+            )
+            plan.setRandomize(True)
+            echantillon = plan.generate()
+        else:
+            raise TypeError("Mauvaise valeur pour la méthode : %s" % (methode))
+        echantillon.setDescription(self.inputDistribution.getDescription())
+        return echantillon
+
+    def genereEchantillonSorties(self, taille, methode="MonteCarlo"):
+        """
+        Génère un échantillon de P à partir d'un plan d'expériences.
+
+        Parameters
+        ----------
+        taille : int
+            La taille de l'échantillon.
+        methode : str
+            La méthode de génération du plan d'expériences
+            (par défaut, methode="MonteCarlo").
+            Voir la méthode genereEchantillonEntrees.
+
+        Returns
+        -------
+        echantillon : ot.Sample
+            L'échantillon de P, de dimension 1.
+
+        Examples
+        --------
+        >>> modele = ModelePensionProbabiliste(simulateur, 2050, 0.0, 0.14)
+        >>> echantillon = modele.genereEchantillonSorties(1024, "LHS")
+        """
+        entrees = self.genereEchantillonEntrees(taille, methode)
+        echantillon = self.fonction(entrees)
+        return echantillon
+
+    def calculeConvergence(
+        self,
+        taille,
+        methode="Sobol",
+        nombreRepetitions=10,
+        niveauxQuantiles=None,
+        nombreTailles=6,
+    ):
+        """
+        Calcule la convergence de la moyenne et des quantiles de P.
+
+        Pour chaque répétition, génère un plan d'expériences de taille
+        "taille" avec la méthode choisie et estime la moyenne et les
+        quantiles de P sur des sous-échantillons de tailles croissantes.
+        Les sous-échantillons sont les premiers points du plan, sauf
+        pour la méthode "LHS" pour laquelle un nouvel hypercube latin
+        est généré pour chaque taille (les premiers points d'un
+        hypercube latin ne forment pas un hypercube latin).
+
+        Les estimations sont moyennées sur les répétitions et l'écart-type
+        de cette moyenne est estimé à partir de la dispersion entre
+        répétitions.
+        Pour les suites à faible discrépance, cet écart-type est celui
+        de l'estimateur quasi-Monte-Carlo randomisé.
+
+        Parameters
+        ----------
+        taille : int
+            La taille maximale de l'échantillon.
+        methode : str
+            La méthode de génération du plan d'expériences
+            (par défaut, methode="Sobol").
+            Voir la méthode genereEchantillonEntrees.
+        nombreRepetitions : int
+            Le nombre de répétitions indépendantes, supérieur ou égal à 2
+            (par défaut, nombreRepetitions=10).
+        niveauxQuantiles : list of float
+            Les niveaux des quantiles à estimer
+            (par défaut, niveauxQuantiles=[0.05, 0.5, 0.95]).
+        nombreTailles : int
+            Le nombre de tailles de sous-échantillons. Les tailles sont
+            taille / 2**k pour k = nombreTailles - 1, ..., 0
+            (par défaut, nombreTailles=6).
+
+        Returns
+        -------
+        resultat : dict
+            Le dictionnaire contient les clés suivantes.
+
+            * "taille" : la liste des tailles de sous-échantillons,
+            * "moyenne" : un tableau de taille nombreTailles,
+              l'estimation de la moyenne de P pour chaque taille,
+            * "ecartTypeMoyenne" : un tableau de taille nombreTailles,
+              l'écart-type de l'estimation de la moyenne,
+            * "quantiles" : un tableau de taille
+              (nombreTailles, len(niveauxQuantiles)), l'estimation des
+              quantiles de P pour chaque taille,
+            * "ecartTypeQuantiles" : un tableau de taille
+              (nombreTailles, len(niveauxQuantiles)), l'écart-type de
+              l'estimation des quantiles.
+
+        Examples
+        --------
+        >>> modele = ModelePensionProbabiliste(simulateur, 2050, 0.0, 0.14)
+        >>> resultat = modele.calculeConvergence(1024, "Sobol")
+        >>> resultat["moyenne"][-1]
+        >>> resultat["ecartTypeMoyenne"][-1]
+        """
+        if nombreRepetitions < 2:
+            raise ValueError(
+                "Le nombre de répétitions doit être supérieur ou égal à 2 : "
+                "%d" % (nombreRepetitions)
+            )
+        if niveauxQuantiles is None:
+            niveauxQuantiles = [0.05, 0.5, 0.95]
+        tailles = [
+            max(1, taille // 2 ** k) for k in reversed(range(nombreTailles))
+        ]
+        nombreQuantiles = len(niveauxQuantiles)
+        moyennes = np.zeros((nombreRepetitions, nombreTailles))
+        quantiles = np.zeros(
+            (nombreRepetitions, nombreTailles, nombreQuantiles)
+        )
+        for r in range(nombreRepetitions):
+            if methode != "LHS":
+                # Un seul plan par répétition, dont on prend les préfixes
+                sortie = np.array(
+                    self.genereEchantillonSorties(taille, methode)
+                )
+            for i in range(nombreTailles):
+                if methode == "LHS":
+                    sortie_i = np.array(
+                        self.genereEchantillonSorties(tailles[i], methode)
+                    )
+                else:
+                    sortie_i = sortie[: tailles[i]]
+                moyennes[r, i] = np.mean(sortie_i)
+                quantiles[r, i, :] = np.quantile(sortie_i, niveauxQuantiles)
+        racine = np.sqrt(nombreRepetitions)
+        resultat = dict()
+        resultat["taille"] = tailles
+        resultat["moyenne"] = np.mean(moyennes, axis=0)
+        resultat["ecartTypeMoyenne"] = (
+            np.std(moyennes, axis=0, ddof=1) / racine
+        )
+        resultat["quantiles"] = np.mean(quantiles, axis=0)
+        resultat["ecartTypeQuantiles"] = (
+            np.std(quantiles, axis=0, ddof=1) / racine
+        )
+        return resultat
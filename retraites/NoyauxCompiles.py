@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Noyaux compilés du simulateur de retraites, si numba est installé.
+
+Chaque noyau est une boucle fusionnée sur les conjonctures et les années :
+les variables intermédiaires sont des scalaires, si bien qu'aucun tableau
+temporaire n'est alloué. Les opérations sont celles des noyaux vectorisés
+de SimulateurRetraites, dans le même ordre : les résultats sont
+identiques.
+
+Si numba n'est pas installé, les boucles ne sont pas compilées : elles
+restent utilisables, mais lentes, et le simulateur utilise les noyaux
+vectorisés de NumPy.
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def estDisponible():
+    """
+    Teste si les noyaux sont compilés.
+
+    Returns
+    -------
+    disponible : bool
+        True si le module numba est installé.
+    """
+    disponible = numba is not None
+    return disponible
+
+
+def _compile(fonction):
+    """
+    Compile une boucle avec numba, s'il est installé.
+
+    Parameters
+    ----------
+    fonction : function
+        La boucle.
+
+    Returns
+    -------
+    fonction : function
+        La boucle compilée, ou la boucle elle-même.
+    """
+    if numba is None:
+        return fonction
+    return numba.njit(cache=True)(fonction)
+
+
+def _aplatit(tableaux, forme):
+    """
+    Diffuse des tableaux vers une forme commune, à deux dimensions.
+
+    Parameters
+    ----------
+    tableaux : list of ndarray
+        Les tableaux, diffusables vers forme.
+    forme : tuple
+        La forme commune, dont la dernière dimension est celle des
+        années.
+
+    Returns
+    -------
+    tableaux : list of ndarray
+        Les tableaux contigus, de taille (nombre de lignes, forme[-1]).
+    """
+    tableaux = [
+        np.ascontiguousarray(np.broadcast_to(t, forme), dtype=float).reshape(
+            -1, forme[-1]
+        )
+        for t in tableaux
+    ]
+    return tableaux
+
+
+@_compile
+def _boucleSorties(
+    B, T, TCS, TCR, CNV, dP, G, NR, NC, A, annees, EV, Ts, Ps, As, annee_EV0
+):
+    n, m = As.shape
+    S = np.empty((n, m))
+    RNV = np.empty((n, m))
+    REV = np.empty((n, m))
+    Depenses = np.empty((n, m))
+    for i in range(n):
+        for j in range(m):
+            GdA = G[i, j] * (As[i, j] - A[i, j])
+            K = (NR[i, j] - GdA) / (NC[i, j] + 0.5 * GdA)
+            U = 1.0 - (TCS[i, j] - T[i, j])
+            Depenses[i, j] = B[i, j] * K * (Ps[i, j] + dP[i, j])
+            S[i, j] = B[i, j] * (Ts[i, j] - K * (Ps[i, j] + dP[i, j]))
+            RNV[i, j] = (
+                Ps[i, j] * (1.0 - TCR[i, j]) / (U - Ts[i, j]) * CNV[i, j]
+            )
+            indice = int(np.rint(annees[i, j] + 0.5 - As[i, j])) - annee_EV0
+            if indice < 0 or indice >= EV.shape[1]:
+                raise ValueError(
+                    "Année de naissance hors des données d'espérance de vie"
+                )
+            age_mort = 60.0 + EV[i, indice]
+            REV[i, j] = (age_mort - As[i, j]) / age_mort
+    return S, RNV, REV, Depenses
+
+
+@_compile
+def _boucleFixantAsRNVS(B, T, TCS, TCR, CNV, dP, G, NR, NC, A, As, RNVs, Ss):
+    n, m = As.shape
+    Ts = np.empty((n, m))
+    Ps = np.empty((n, m))
+    for i in range(n):
+        for j in range(m):
+            GdA = G[i, j] * (As[i, j] - A[i, j])
+            K = (NR[i, j] - GdA) / (NC[i, j] + 0.5 * GdA)
+            Z = (1.0 - TCR[i, j]) * CNV[i, j] / RNVs[i, j]
+            U = 1.0 - (TCS[i, j] - T[i, j])
+            L = Ss[i, j] / B[i, j]
+            Ps[i, j] = (U - L - K * dP[i, j]) / (Z + K)
+            Ts[i, j] = U - Ps[i, j] * Z
+    return Ts, Ps
+
+
+_NOMS = ["B", "T", "TCS", "TCR", "CNV", "dP", "G", "NR", "NC", "A"]
+
+
+def noyauSorties(c, Ts, Ps, As, annee_EV0):
+    """
+    Noyau compilé du calcul des sorties du modèle.
+
+    Voir SimulateurRetraites._noyau_S_RNV_REV.
+
+    Parameters
+    ----------
+    c : dict
+        La conjoncture : c[nom] est le tableau de la variable nom,
+        c["EV"] celui de l'espérance de vie par génération et
+        c["annees"] celui des années.
+    Ts : ndarray
+        Le taux de cotisations
+    Ps : ndarray
+        Le niveau des pensions par rapport aux salaires
+    As : ndarray
+        L'âge moyen de départ à la retraite
+    annee_EV0 : int
+        L'année de naissance de la première génération de c["EV"].
+
+    Returns
+    -------
+    S, RNV, REV, Depenses : ndarray
+        Les sorties du modèle.
+    """
+    variables = [c[nom] for nom in _NOMS] + [c["annees"], Ts, Ps, As]
+    forme = np.broadcast_shapes(*[np.shape(v) for v in variables])
+    variables = _aplatit(variables, forme)
+    EV = c["EV"]
+    EV = np.ascontiguousarray(
+        np.broadcast_to(EV, forme[:-1] + EV.shape[-1:]), dtype=float
+    ).reshape(-1, EV.shape[-1])
+    sorties = _boucleSorties(*variables[:11], EV, *variables[11:], annee_EV0)
+    S, RNV, REV, Depenses = [v.reshape(forme) for v in sorties]
+    return S, RNV, REV, Depenses
+
+
+def noyauFixantAsRNVS(c, As, RNVs, Ss):
+    """
+    Noyau compilé du calcul à âge, niveau de vie et solde définis.
+
+    Voir SimulateurRetraites._noyau_fixant_As_RNV_S.
+
+    Parameters
+    ----------
+    c : dict
+        La conjoncture : c[nom] est le tableau de la variable nom.
+    As : ndarray
+        L'âge effectif moyen de départ à la retraite.
+    RNVs : ndarray
+        Le niveau de vie des retraités par rapport à l'ensemble
+        de la population
+    Ss : ndarray
+        Le solde financier en % de PIB.
+
+    Returns
+    -------
+    Ts, Ps, As : ndarray
+        Le taux de cotisations, le niveau des pensions et l'âge.
+    """
+    variables = [c[nom] for nom in _NOMS] + [As, RNVs, Ss]
+    forme = np.broadcast_shapes(*[np.shape(v) for v in variables])
+    Ts, Ps = _boucleFixantAsRNVS(*_aplatit(variables, forme))
+    Ts = Ts.reshape(forme)
+    Ps = Ps.reshape(forme)
+    return Ts, Ps, As
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fonctions de dessin partagées par le simulateur et les analyses.
+"""
+from matplotlib.collections import LineCollection
+import numpy as np
+import pylab as pl
+
+
+def tableauDessin(v, scenarios_indices, annees, annees_dessin):
+    """
+    Retourne les valeurs à dessiner sous la forme d'un tableau.
+
+    Parameters
+    ----------
+    v : dict or ndarray
+        Une trajectoire v[s][a], ou un tableau de taille (n, len(annees)).
+    scenarios_indices : list of int
+        Les scénarios à dessiner, si v est une trajectoire.
+    annees : list of int
+        Les années correspondant aux colonnes de v, si v est un
+        tableau : elles ne sont pas nécessairement consécutives.
+    annees_dessin : list of int
+        Les années à dessiner.
+
+    Returns
+    -------
+    Y : ndarray
+        Un tableau de taille (nombre de courbes, len(annees_dessin)).
+    """
+    if not isinstance(v, np.ndarray):
+        Y = np.array(
+            [[v[s][a] for a in annees_dessin] for s in scenarios_indices],
+            dtype=float,
+        )
+        return Y
+    Y = np.atleast_2d(v)
+    if Y.ndim != 2 or Y.shape[1] != len(annees):
+        raise ValueError("Mauvaise taille pour le tableau : %s" % (v.shape,))
+    colonnes = {a: j for j, a in enumerate(annees)}
+    if any(a not in colonnes for a in annees_dessin):
+        raise ValueError("Années à dessiner en dehors des années du tableau")
+    indices = np.array([colonnes[a] for a in annees_dessin], dtype=int)
+    if len(indices) > 0 and np.all(np.diff(indices) == 1):
+        # Colonnes consécutives : une vue sur le tableau
+        Y = Y[:, slice(indices[0], indices[-1] + 1)]
+    else:
+        Y = Y[:, indices]
+    return Y
+
+
+def dessineEnsemble(ax, annees_dessin, Y, nombre_max_courbes=None):
+    """
+    Dessine un ensemble de trajectoires par une collection de lignes.
+
+    La transparence des lignes diminue avec le nombre de courbes,
+    pour que la densité des trajectoires reste visible.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Les axes dans lesquels dessiner.
+    annees_dessin : list of int
+        Les abscisses.
+    Y : ndarray
+        Les ordonnées, de taille (nombre de courbes, len(annees_dessin)).
+    nombre_max_courbes : int
+        Le nombre maximal de courbes dessinées (par défaut, pas de
+        limite).
+
+    Returns
+    -------
+    collection : matplotlib.collections.LineCollection
+        La collection de lignes.
+    """
+    nombre_courbes = Y.shape[0]
+    if nombre_max_courbes is not None and nombre_courbes > nombre_max_courbes:
+        indices = np.linspace(0, nombre_courbes - 1, nombre_max_courbes)
+        Y = Y[np.unique(indices.astype(int))]
+        nombre_courbes = Y.shape[0]
+    segments = np.empty(Y.shape + (2,))
+    segments[:, :, 0] = annees_dessin
+    segments[:, :, 1] = Y
+    couleur = pl.rcParams["axes.prop_cycle"].by_key()["color"][0]
+    collection = LineCollection(
+        segments,
+        colors=couleur,
+        alpha=min(1.0, 10.0 / nombre_courbes),
+        linewidths=pl.rcParams["lines.linewidth"],
+    )
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
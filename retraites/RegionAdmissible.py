@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de calcul analytique des régions admissibles de pilotage.
+"""
+import math
+import numpy as np
+
+
+class RegionAdmissible:
+    def __init__(self, simulateur, bornes, Scible=0.0):
+        """
+        Crée le calcul des leviers admissibles à solde financier imposé.
+
+        Pour chaque scénario et chaque année, le solde imposé définit
+        une surface iso-solde de leviers (A, T, P) : l'âge et le taux de
+        cotisations déterminent le niveau des pensions (voir
+        SimulateurRetraites._noyau_fixant_Ss_As_Ts).
+        La région admissible est la partie de cette surface qui
+        respecte les bornes imposées, par exemple T <= 0.3,
+        RNV >= 0.9 et A <= 65.
+
+        La région est calculée exactement, sans échantillonnage.
+        Le rapport K entre retraités et cotisants est une fonction
+        décroissante de l'âge (voir SimulateurRetraites._calcule_K).
+        À K fixé, chaque borne est une borne du taux de cotisations de
+        la forme (a K + b) / (c K + d) :
+
+        * les bornes de T et des dépenses, qui valent B T - S,
+          sont constantes ;
+        * une borne p du niveau des pensions donne
+          T = L + K (p + dP), où L = S / B ;
+        * une borne r du niveau de vie donne
+          T = (K (r U + W dP) + W L) / (r K + W), où W = (1 - TCR) CNV
+          et U = 1 - (TCS - T_COR) (voir _construitNoyau).
+
+        Un âge est admissible si chaque borne inférieure est plus petite
+        que chaque borne supérieure : chaque couple de bornes est une
+        inégalité polynomiale de degré 2 au plus en K, résolue
+        explicitement.
+        Les âges admissibles sont donc une réunion d'intervalles, et
+        le taux de cotisations admissible à un âge donné est un
+        intervalle.
+
+        Parameters
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        bornes : dict
+            bornes[nom] est la liste [inf, sup] des bornes de la
+            variable nom, parmi "A", "T", "P", "RNV" et "Depenses".
+            Une borne None n'est pas imposée.
+            Les bornes de l'âge sont par défaut celles de la recherche
+            de l'âge du simulateur (attribut rechercheAgeBornes).
+            Les bornes du niveau de vie doivent être positives.
+        Scible : float or dict
+            Le solde financier imposé (par défaut, 0.0, l'équilibre).
+            Voir SimulateurRetraites.genereTrajectoire.
+
+        Attributes
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        bornes : dict
+            Les bornes des variables.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> region = RegionAdmissible(
+        ...     simulateur,
+        ...     {"T": [None, 0.3], "RNV": [0.9, None], "A": [None, 65.0]},
+        ... )
+        >>> intervalles = region.calculeIntervallesAge()
+        >>> intervalles[3][2050]
+        """
+        variables = ["A", "T", "P", "RNV", "Depenses"]
+        bornes = dict(bornes)
+        for nom in bornes:
+            if nom not in variables:
+                raise ValueError("Mauvaise valeur pour le nom : %s" % (nom))
+            if len(bornes[nom]) != 2:
+                raise ValueError(
+                    "Mauvaise valeur pour les bornes de %s : %s"
+                    % (nom, bornes[nom])
+                )
+        inf, sup = bornes.get("A", [None, None])
+        if inf is None:
+            inf = simulateur.rechercheAgeBornes[0]
+        if sup is None:
+            sup = simulateur.rechercheAgeBornes[1]
+        bornes["A"] = [inf, sup]
+        for r in bornes.get("RNV", []):
+            if r is not None and r <= 0.0:
+                raise ValueError(
+                    "Les bornes du niveau de vie doivent être positives : %s"
+                    % (r)
+                )
+        self.simulateur = simulateur
+        self.bornes = bornes
+        self._Ss = simulateur.genereTrajectoire("S", Scible)
+        return None
+
+    def _getConjoncture(self, s, a):
+        """
+        Retourne la conjoncture du COR d'un scénario et d'une année.
+
+        Parameters
+        ----------
+        s : int
+            Le scénario.
+        a : int
+            L'année.
+
+        Returns
+        -------
+        c : dict
+            c[nom] est la valeur de la variable nom.
+        """
+        simulateur = self.simulateur
+        i = simulateur.scenarios.index(s)
+        j = simulateur.annees.index(a)
+        conjoncture = simulateur._getConjonctureCOR()
+        noms = ["B", "T", "A", "TCS", "TCR", "CNV", "dP", "G", "NR", "NC"]
+        c = {nom: conjoncture[nom][i, j] for nom in noms}
+        return c
+
+    def _getBornesCotisations(self, s, a):
+        """
+        Retourne les bornes du taux de cotisations en fonction de K.
+
+        Parameters
+        ----------
+        s : int
+            Le scénario.
+        a : int
+            L'année.
+
+        Returns
+        -------
+        inferieures, superieures : list of tuple
+            Les bornes inférieures et supérieures : chaque borne est un
+            tuple (a, b, c, d), qui représente (a K + b) / (c K + d).
+        """
+        c = self._getConjoncture(s, a)
+        S = self._Ss[s][a]
+        L = S / c["B"]
+        U = 1.0 - (c["TCS"] - c["T"])
+        W = (1.0 - c["TCR"]) * c["CNV"]
+
+        def borne(nom, valeur):
+            if nom == "T":
+                return (0.0, valeur, 0.0, 1.0)
+            if nom == "Depenses":
+                return (0.0, (valeur + S) / c["B"], 0.0, 1.0)
+            if nom == "P":
+                return (valeur + c["dP"], L, 0.0, 1.0)
+            return (valeur * U + W * c["dP"], W * L, valeur, W)
+
+        # Le niveau de vie n'est défini que si T < U
+        inferieures = []
+        superieures = [(0.0, U, 0.0, 1.0)]
+        for nom in ["T", "Depenses", "P", "RNV"]:
+            inf, sup = self.bornes.get(nom, [None, None])
+            if inf is not None:
+                inferieures.append(borne(nom, inf))
+            if sup is not None:
+                superieures.append(borne(nom, sup))
+        return inferieures, superieures
+
+    def calculeIntervallesAge(self, scenarios=None, annees=None):
+        """
+        Calcule les âges admissibles de chaque scénario et chaque année.
+
+        Parameters
+        ----------
+        scenarios : list of int
+            Les scénarios (par défaut, tous les scénarios).
+        annees : list of int
+            Les années (par défaut, les années futures).
+
+        Returns
+        -------
+        intervalles : dict
+            intervalles[s][a] est la liste des intervalles [Amin, Amax]
+            des âges admissibles du scénario s à l'année a, dans l'ordre
+            croissant.
+            La liste est vide si aucun âge n'est admissible.
+        """
+        simulateur = self.simulateur
+        if scenarios is None:
+            scenarios = simulateur.scenarios
+        if annees is None:
+            annees = simulateur.annees_futures
+        Ainf, Asup = self.bornes["A"]
+        intervalles = dict()
+        for s in scenarios:
+            if s not in simulateur.scenarios:
+                raise ValueError("Mauvaise valeur pour le scénario : %s" % (s))
+            intervalles[s] = dict()
+            for a in annees:
+                if a not in simulateur.annees:
+                    raise ValueError("Mauvaise valeur pour l'année : %s" % (a))
+                c = self._getConjoncture(s, a)
+                # K est décroissant en fonction de l'âge
+                Kmin = simulateur._calcule_K(c, Asup)
+                Kmax = simulateur._calcule_K(c, Ainf)
+                admissibles = [(Kmin, Kmax)]
+                inferieures, superieures = self._getBornesCotisations(s, a)
+                for ai, bi, ci, di in inferieures:
+                    for aj, bj, cj, dj in superieures:
+                        # (ai K + bi)(cj K + dj) <= (aj K + bj)(ci K + di)
+                        solution = _resoutInegalite(
+                            ai * cj - aj * ci,
+                            ai * dj + bi * cj - aj * di - bj * ci,
+                            bi * dj - bj * di,
+                            Kmin,
+                            Kmax,
+                        )
+                        admissibles = _intersecte(admissibles, solution)
+                intervalles[s][a] = [
+                    [
+                        float(simulateur._calcule_A_depuis_K(c, K1)),
+                        float(simulateur._calcule_A_depuis_K(c, K0)),
+                    ]
+                    for K0, K1 in reversed(admissibles)
+                ]
+        return intervalles
+
+    def calculeIntervalleCotisations(self, s, a, A):
+        """
+        Calcule les taux de cotisations admissibles à des âges donnés.
+
+        Parameters
+        ----------
+        s : int
+            Le scénario.
+        a : int
+            L'année.
+        A : float or ndarray
+            Le ou les âges.
+
+        Returns
+        -------
+        Tmin, Tmax : ndarray
+            Les bornes du taux de cotisations admissible à chaque âge.
+            L'intervalle est vide si Tmin > Tmax, ou si l'âge est en
+            dehors de ses bornes.
+        """
+        c = self._getConjoncture(s, a)
+        A = np.asarray(A, dtype=float)
+        K = self.simulateur._calcule_K(c, A)
+        inferieures, superieures = self._getBornesCotisations(s, a)
+        Tmin = np.full(A.shape, -np.inf)
+        for ai, bi, ci, di in inferieures:
+            Tmin = np.maximum(Tmin, (ai * K + bi) / (ci * K + di))
+        Tmax = np.full(A.shape, np.inf)
+        for aj, bj, cj, dj in superieures:
+            Tmax = np.minimum(Tmax, (aj * K + bj) / (cj * K + dj))
+        Ainf, Asup = self.bornes["A"]
+        Tmax = np.where((A < Ainf) | (A > Asup), -np.inf, Tmax)
+        return Tmin, Tmax
+
+
+def _resoutInegalite(alpha, beta, gamma, inf, sup):
+    """
+    Résout alpha x^2 + beta x + gamma <= 0 dans un intervalle.
+
+    Parameters
+    ----------
+    alpha, beta, gamma : float
+        Les coefficients du polynôme.
+    inf, sup : float
+        Les bornes de l'intervalle.
+
+    Returns
+    -------
+    solution : list of tuple
+        Les intervalles (x0, x1) des solutions, dans l'ordre croissant.
+    """
+    if alpha == 0.0 and beta == 0.0:
+        racines = []
+    elif alpha == 0.0:
+        racines = [-gamma / beta]
+    else:
+        delta = beta * beta - 4.0 * alpha * gamma
+        if delta < 0.0:
+            racines = []
+        else:
+            # Formule stable numériquement
+            q = -0.5 * (beta + math.copysign(math.sqrt(delta), beta))
+            if q == 0.0:
+                racines = [0.0]
+            else:
+                racines = [q / alpha, gamma / q]
+    points = [inf] + sorted(r for r in racines if inf < r < sup) + [sup]
+    solution = []
+    for x0, x1 in zip(points[:-1], points[1:]):
+        x = 0.5 * (x0 + x1)
+        if alpha * x * x + beta * x + gamma <= 0.0:
+            if len(solution) > 0 and solution[-1][1] == x0:
+                solution[-1] = (solution[-1][0], x1)
+            else:
+                solution.append((x0, x1))
+    return solution
+
+
+def _intersecte(intervalles, autres):
+    """
+    Calcule l'intersection de deux réunions d'intervalles.
+
+    Parameters
+    ----------
+    intervalles, autres : list of tuple
+        Les intervalles (x0, x1), disjoints et dans l'ordre croissant.
+
+    Returns
+    -------
+    intersection : list of tuple
+        Les intervalles de l'intersection, dans l'ordre croissant.
+    """
+    intersection = []
+    i = 0
+    j = 0
+    while i < len(intervalles) and j < len(autres):
+        x0 = max(intervalles[i][0], autres[j][0])
+        x1 = min(intervalles[i][1], autres[j][1])
+        if x0 <= x1:
+            intersection.append((x0, x1))
+        if intervalles[i][1] < autres[j][1]:
+            i += 1
+        else:
+            j += 1
+    return intersection
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de rendu en série des graphiques de simulations.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import os
+
+
+class RenduSimulation:
+    def __init__(
+        self, analyse, taille_fonte_titre=8, figsize=(6, 8), titre=None
+    ):
+        """
+        Crée un rendu réutilisable des graphiques d'une simulation.
+
+        La figure reproduit les 6 graphiques de la méthode
+        SimulateurAnalyse.dessineSimulation.
+        Elle est créée une seule fois : les axes, les titres, les limites
+        et la mise en page sont calculés à la construction, puis chaque
+        nouvelle analyse ne fait que mettre à jour les ordonnées des
+        courbes.
+        C'est beaucoup plus rapide que de redessiner toute la figure
+        quand on exporte les graphiques de milliers d'analyses, par
+        exemple les résultats d'un balayage des paramètres de pilotage.
+
+        La figure utilise explicitement le moteur de rendu Agg et
+        n'utilise pas l'état global de pylab.
+
+        Parameters
+        ----------
+        analyse : SimulateurAnalyse
+            L'analyse modèle : elle définit les scénarios, les années,
+            les étiquettes, les limites des axes, le répertoire et les
+            formats des images.
+        taille_fonte_titre : int
+            La taille de la fonte des titres (par défaut, 8).
+        figsize : tuple of float
+            La taille de la figure en pouces (par défaut, (6, 8)).
+        titre : str
+            Le titre de la figure (par défaut, pas de titre).
+
+        Attributes
+        ----------
+        analyse : SimulateurAnalyse
+            L'analyse modèle.
+        taille_fonte_titre : int
+            La taille de la fonte des titres.
+        figsize : tuple of float
+            La taille de la figure en pouces.
+        titre : str
+            Le titre de la figure.
+        figure : matplotlib.figure.Figure
+            La figure réutilisée.
+        axes : list of matplotlib.axes.Axes
+            Les axes des graphiques, un par variable.
+        lignes : dict
+            lignes[nom][s] est la courbe de la variable nom dans
+            le scénario s.
+        noms : list of str
+            Les noms des variables dessinées.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> analyses = [
+        ...     simulateur.pilotageParSoldePensionAge(Acible=age)
+        ...     for age in [62.0, 63.0, 64.0]
+        ... ]
+        >>> rendu = RenduSimulation(analyses[0])
+        >>> for i, analyse in enumerate(analyses):
+        ...     rendu.dessine(analyse)
+        ...     rendu.sauveFigure("simulation-%d" % (i))
+        >>> rendu.exporte(analyses, ["a", "b", "c"], nombre_processus=2)
+        """
+        self.analyse = analyse
+        self.taille_fonte_titre = taille_fonte_titre
+        self.figsize = figsize
+        self.titre = titre
+        self.noms = analyse.liste_variables[0:6]
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        if titre is not None:
+            self.figure.suptitle(titre, fontsize=16)
+        self.axes = []
+        self.lignes = dict()
+        for i, nom in enumerate(self.noms):
+            ax = self.figure.add_subplot(3, 2, i + 1)
+            self.lignes[nom] = dict()
+            for s in analyse.scenarios:
+                if analyse.labels_is_long:
+                    label_variable = analyse.scenarios_labels[s]
+                else:
+                    label_variable = analyse.scenarios_labels_courts[s]
+                (ligne,) = ax.plot(
+                    analyse.annees,
+                    self._ordonnees(analyse, nom, s),
+                    label=label_variable,
+                )
+                self.lignes[nom][s] = ligne
+            indice_variable = analyse.liste_variables.index(nom)
+            ax.set_title(
+                analyse.liste_legendes[indice_variable],
+                fontsize=taille_fonte_titre,
+            )
+            if nom in analyse.yaxis_lim:
+                yaxis_lim = analyse.yaxis_lim[nom]
+                ax.set_ylim(bottom=yaxis_lim[0], top=yaxis_lim[1])
+            self.axes.append(ax)
+        self.figure.tight_layout(rect=[0, 0.03, 1, 0.95])
+        return None
+
+    def _ordonnees(self, analyse, nom, s):
+        """
+        Retourne les ordonnées d'une courbe.
+
+        Parameters
+        ----------
+        analyse : SimulateurAnalyse
+            L'analyse.
+        nom : str
+            Le nom de la variable.
+        s : int
+            Le scénario.
+
+        Returns
+        -------
+        y : ndarray
+            Les valeurs de la variable pour les années de l'analyse
+            modèle, en % si la variable est un pourcentage.
+        """
+        v = getattr(analyse, nom)[s]
+        y = np.array([v[a] for a in self.analyse.annees])
+        if nom in analyse.variables_pourcentage:
+            y *= 100.0
+        return y
+
+    def dessine(self, analyse):
+        """
+        Met à jour les courbes de la figure avec une analyse.
+
+        L'analyse doit avoir les mêmes scénarios et les mêmes années
+        que l'analyse modèle.
+
+        Parameters
+        ----------
+        analyse : SimulateurAnalyse
+            L'analyse à dessiner.
+
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            La figure mise à jour.
+        """
+        for nom in self.noms:
+            for s in self.lignes[nom]:
+                self.lignes[nom][s].set_ydata(self._ordonnees(analyse, nom, s))
+        return self.figure
+
+    def sauveFigure(self, filename):
+        """
+        Sauvegarde la figure dans le répertoire de l'analyse modèle.
+
+        Sauvegarde l'image dans les formats de l'analyse modèle.
+
+        Parameters
+        ----------
+        filename : str
+            Le nom de base des fichiers à sauver.
+        """
+        for ext in self.analyse.ext_image:
+            basefilename = filename + "." + ext
+            chemin = os.path.join(self.analyse.dir_image, basefilename)
+            if self.analyse.affiche_quand_ecrit:
+                print("Ecriture du fichier %s" % (chemin))
+            self.figure.savefig(chemin)
+        return None
+
+    def exporte(self, analyses, noms_fichiers, nombre_processus=None):
+        """
+        Exporte les graphiques de plusieurs analyses.
+
+        Les analyses sont réparties en blocs, un par processus.
+        Chaque processus crée une seule figure, qu'il réutilise pour
+        toutes les analyses de son bloc.
+
+        Parameters
+        ----------
+        analyses : list of SimulateurAnalyse
+            Les analyses à dessiner.
+        noms_fichiers : list of str
+            Les noms de base des fichiers, un par analyse.
+        nombre_processus : int
+            Le nombre de processus (par défaut, le nombre de processeurs).
+            Si égal à 1, les figures sont exportées par ce rendu,
+            sans créer de processus.
+        """
+        if len(analyses) != len(noms_fichiers):
+            raise ValueError(
+                "Le nombre de fichiers (%d) est différent du nombre "
+                "d'analyses (%d)" % (len(noms_fichiers), len(analyses))
+            )
+        if nombre_processus is None:
+            nombre_processus = os.cpu_count()
+        nombre_processus = max(1, min(nombre_processus, len(analyses)))
+        if nombre_processus == 1:
+            for analyse, filename in zip(analyses, noms_fichiers):
+                self.dessine(analyse)
+                self.sauveFigure(filename)
+            return None
+        blocs = []
+        for i in range(nombre_processus):
+            blocs.append(
+                [
+                    self.analyse,
+                    analyses[i::nombre_processus],
+                    noms_fichiers[i::nombre_processus],
+                    self.taille_fonte_titre,
+                    self.figsize,
+                    self.titre,
+                ]
+            )
+        with ProcessPoolExecutor(max_workers=nombre_processus) as executeur:
+            list(executeur.map(_exporteBloc, blocs))
+        return None
+
+
+def _exporteBloc(bloc):
+    """
+    Exporte les graphiques d'un bloc d'analyses dans un processus.
+
+    Parameters
+    ----------
+    bloc : list
+        La liste [analyse, analyses, noms_fichiers, taille_fonte_titre,
+        figsize, titre] décrivant le rendu et les analyses du bloc.
+    """
+    analyse, analyses, noms_fichiers, taille_fonte_titre, figsize, titre = bloc
+    rendu = RenduSimulation(analyse, taille_fonte_titre, figsize, titre)
+    rendu.exporte(analyses, noms_fichiers, nombre_processus=1)
+    return None
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de service HTTP/JSON des pilotages du simulateur de retraites.
+"""
+
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from retraites.SimulateurRetraites import SimulateurRetraites
+from urllib.parse import urlparse, parse_qsl
+import json
+import math
+import queue
+import threading
+
+
+class ServeurPilotage:
+    def __init__(
+        self,
+        adresse="127.0.0.1",
+        port=8000,
+        nombre_simulateurs=4,
+        taille_cache=4096,
+        json_filename=None,
+    ):
+        """
+        Crée un service HTTP/JSON qui évalue les pilotages.
+
+        Le service utilise uniquement la bibliothèque standard.
+        Il répond aux requêtes suivantes :
+
+        * GET /sante : l'état du service ;
+        * GET /methodes : les méthodes de pilotage et leurs cibles ;
+        * GET /pilotage?methode=pilotageParSoldePensionAge&Acible=63 ;
+        * POST /pilotage avec le même contenu en JSON, par exemple
+          {"methode": "pilotageParSoldePensionAge", "Acible": 63.0}.
+
+        Les cibles sont des flottants (la valeur pour les années
+        futures) ou null (la valeur du COR).
+        La réponse contient les années, les scénarios et, pour chacune
+        des variables "S", "RNV", "REV", "A", "T", "P" et "Depenses",
+        un tableau de taille (nombre de scénarios, nombre d'années).
+
+        Les réponses sont conservées dans un cache LRU dont la clé est
+        la méthode et les cibles normalisées (converties en flottants
+        et arrondies à 1.e-9 près).
+        Les requêtes simultanées sont servies par des threads, chacun
+        empruntant un simulateur dans un ensemble de simulateurs
+        préchargés.
+
+        Parameters
+        ----------
+        adresse : str
+            L'adresse d'écoute (par défaut, "127.0.0.1").
+        port : int
+            Le port d'écoute (par défaut, 8000).
+            Si égal à 0, le système choisit un port libre.
+        nombre_simulateurs : int
+            Le nombre de simulateurs préchargés (par défaut, 4).
+        taille_cache : int
+            Le nombre maximal de réponses dans le cache (par défaut, 4096).
+        json_filename : str
+            Le fichier d'hypothèses des simulateurs (par défaut, celui
+            fourni par le module).
+
+        Attributes
+        ----------
+        adresse : str
+            L'adresse d'écoute.
+        port : int
+            Le port d'écoute.
+        taille_cache : int
+            Le nombre maximal de réponses dans le cache.
+        simulateurs : queue.Queue
+            Les simulateurs disponibles.
+        methodes : dict
+            methodes[nom] est la liste des cibles de la méthode nom.
+        variables : list of str
+            Les variables retournées.
+        nombre_succes : int
+            Le nombre de réponses trouvées dans le cache.
+        nombre_echecs : int
+            Le nombre de réponses calculées.
+
+        Examples
+        --------
+        >>> serveur = ServeurPilotage(port=8000)
+        >>> serveur.demarre()
+        >>> # curl "http://127.0.0.1:8000/pilotage?methode=pilotageCOR"
+        >>> serveur.arrete()
+        """
+        self.adresse = adresse
+        self.port = port
+        self.taille_cache = taille_cache
+        self.methodes = {
+            "pilotageCOR": [],
+            "pilotageParPensionAgeCotisations": ["Pcible", "Acible", "Tcible"],
+            "pilotageParSoldePensionAge": ["Scible", "Pcible", "Acible"],
+            "pilotageParSoldePensionCotisations": [
+                "Scible",
+                "Pcible",
+                "Tcible",
+            ],
+            "pilotageParSoldeAgeCotisations": ["Scible", "Acible", "Tcible"],
+            "pilotageParSoldeAgeDepenses": ["Scible", "Acible", "Dcible"],
+            "pilotageParSoldePensionDepenses": ["Scible", "Pcible", "Dcible"],
+            "pilotageParPensionCotisationsDepenses": [
+                "Pcible",
+                "Tcible",
+                "Dcible",
+            ],
+            "pilotageParAgeCotisationsDepenses": [
+                "Acible",
+                "Tcible",
+                "Dcible",
+            ],
+            "pilotageParAgeEtNiveauDeVie": ["Acible", "RNVcible", "Scible"],
+            "pilotageParNiveauDeVieEtCotisations": [
+                "Tcible",
+                "RNVcible",
+                "Scible",
+            ],
+            "pilotageParSoldePensionDuree": ["Scible", "Pcible", "REVcible"],
+            "pilotageParSoldeCotisationsDuree": [
+                "Scible",
+                "Tcible",
+                "REVcible",
+            ],
+            "pilotageParSoldeDepensesDuree": ["Scible", "Dcible", "REVcible"],
+            "pilotageParPensionCotisationsDuree": [
+                "Pcible",
+                "Tcible",
+                "REVcible",
+            ],
+            "pilotageParCotisationsDepensesDuree": [
+                "Tcible",
+                "Dcible",
+                "REVcible",
+            ],
+        }
+        self.variables = ["S", "RNV", "REV", "A", "T", "P", "Depenses"]
+        # Simulateurs préchargés : les tableaux internes sont calculés
+        # avant la première requête
+        self.simulateurs = queue.Queue()
+        for i in range(nombre_simulateurs):
+            simulateur = SimulateurRetraites(json_filename)
+            simulateur.pilotageCOR()
+            self.simulateurs.put(simulateur)
+        # Cache LRU des réponses sérialisées
+        self._cache = OrderedDict()
+        self._verrou = threading.Lock()
+        self.nombre_succes = 0
+        self.nombre_echecs = 0
+        self._serveur = None
+        self._thread = None
+        return None
+
+    def normalise(self, requete):
+        """
+        Vérifie et normalise une requête de pilotage.
+
+        Parameters
+        ----------
+        requete : dict
+            La requête : la clé "methode" est le nom de la méthode de
+            pilotage (par défaut, "pilotageCOR") et les autres clés sont
+            les cibles.
+
+        Returns
+        -------
+        cle : tuple
+            La clé normalisée (methode, ((cible, valeur), ...)), où les
+            cibles sont triées et les cibles None sont omises.
+            Une cible qui n'est pas un nombre fini lève une ValueError.
+        """
+        requete = dict(requete)
+        methode = requete.pop("methode", "pilotageCOR")
+        if methode not in self.methodes:
+            raise ValueError(
+                "Mauvaise valeur pour la méthode : %s" % (methode)
+            )
+        cibles = []
+        for nom in sorted(requete):
+            if nom not in self.methodes[methode]:
+                raise ValueError(
+                    "La cible %s n'est pas utilisée par la méthode %s"
+                    % (nom, methode)
+                )
+            valeur = requete[nom]
+            if valeur is None or valeur == "":
+                continue
+            try:
+                valeur = round(float(valeur), 9)
+            except (TypeError, ValueError):
+                valeur = None
+            if valeur is None or not math.isfinite(valeur):
+                raise ValueError(
+                    "Mauvaise valeur pour la cible %s : %s"
+                    % (nom, requete[nom])
+                )
+            cibles.append((nom, valeur))
+        cle = (methode, tuple(cibles))
+        return cle
+
+    def evalue(self, requete):
+        """
+        Evalue une requête de pilotage, en utilisant le cache.
+
+        Parameters
+        ----------
+        requete : dict
+            La requête (voir la méthode normalise).
+
+        Returns
+        -------
+        reponse : bytes
+            La réponse sérialisée en JSON.
+        """
+        cle = self.normalise(requete)
+        with self._verrou:
+            if cle in self._cache:
+                self._cache.move_to_end(cle)
+                self.nombre_succes += 1
+                return self._cache[cle]
+            self.nombre_echecs += 1
+        methode, cibles = cle
+        simulateur = self.simulateurs.get()
+        try:
+            analyse = getattr(simulateur, methode)(**dict(cibles))
+            reponse = {
+                "methode": methode,
+                "cibles": dict(cibles),
+                "annees": list(simulateur.annees),
+                "scenarios": list(simulateur.scenarios),
+            }
+            for nom in self.variables:
+                reponse[nom] = analyse.getTableau(nom).tolist()
+        finally:
+            self.simulateurs.put(simulateur)
+        reponse = json.dumps(reponse).encode("utf-8")
+        with self._verrou:
+            self._cache[cle] = reponse
+            self._cache.move_to_end(cle)
+            while len(self._cache) > self.taille_cache:
+                self._cache.popitem(last=False)
+        return reponse
+
+    def getStatistiquesCache(self):
+        """
+        Retourne les statistiques du cache.
+
+        Returns
+        -------
+        statistiques : dict
+            Les clés sont "taille", "succes" et "echecs".
+        """
+        with self._verrou:
+            statistiques = {
+                "taille": len(self._cache),
+                "succes": self.nombre_succes,
+                "echecs": self.nombre_echecs,
+            }
+        return statistiques
+
+    def demarre(self):
+        """
+        Démarre le service dans un thread.
+
+        Si le port est 0, l'attribut port contient ensuite le port
+        choisi par le système.
+        """
+        if self._serveur is not None:
+            raise ValueError("Le service est déjà démarré")
+        self._serveur = ThreadingHTTPServer(
+            (self.adresse, self.port), _GestionnaireRequetes
+        )
+        self._serveur.daemon_threads = True
+        self._serveur.serveur_pilotage = self
+        self.port = self._serveur.server_address[1]
+        self._thread = threading.Thread(
+            target=self._serveur.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return None
+
+    def arrete(self):
+        """
+        Arrête le service.
+        """
+        if self._serveur is not None:
+            self._serveur.shutdown()
+            self._serveur.server_close()
+            self._thread.join()
+            self._serveur = None
+            self._thread = None
+        return None
+
+
+class _GestionnaireRequetes(BaseHTTPRequestHandler):
+    """
+    Gestionnaire des requêtes HTTP du service de pilotage.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        serveur = self.server.serveur_pilotage
+        if url.path == "/sante":
+            self._repond(200, {"statut": "ok"})
+        elif url.path == "/methodes":
+            self._repond(200, serveur.methodes)
+        elif url.path == "/pilotage":
+            self._pilote(dict(parse_qsl(url.query)))
+        else:
+            self._repond(404, {"erreur": "Chemin inconnu : %s" % (url.path)})
+        return None
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/pilotage":
+            self._repond(404, {"erreur": "Chemin inconnu : %s" % (url.path)})
+            return None
+        try:
+            longueur = _litLongueur(self.headers)
+        except ValueError as erreur:
+            # Le contenu ne peut pas être lu : la connexion est fermée
+            self.close_connection = True
+            self._repond(400, {"erreur": str(erreur)})
+            return None
+        try:
+            requete = json.loads(self.rfile.read(longueur) or b"{}")
+        except ValueError:
+            self._repond(400, {"erreur": "Contenu JSON invalide"})
+            return None
+        if not isinstance(requete, dict):
+            self._repond(400, {"erreur": "La requête doit être un objet"})
+            return None
+        self._pilote(requete)
+        return None
+
+    def _pilote(self, requete):
+        try:
+            reponse = self.server.serveur_pilotage.evalue(requete)
+        except ValueError as erreur:
+            self._repond(400, {"erreur": str(erreur)})
+            return None
+        self._envoie(200, reponse)
+        return None
+
+    def _repond(self, code, contenu):
+        self._envoie(code, json.dumps(contenu).encode("utf-8"))
+        return None
+
+    def _envoie(self, code, reponse):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reponse)))
+        self.end_headers()
+        self.wfile.write(reponse)
+        return None
+
+    def log_message(self, format, *args):
+        # Pas de journal sur la sortie d'erreur à chaque requête
+        return None
+
+
+def _litLongueur(entetes):
+    """
+    Retourne la longueur du contenu d'une requête.
+
+    Parameters
+    ----------
+    entetes : email.message.Message
+        Les en-têtes de la requête.
+
+    Returns
+    -------
+    longueur : int
+        La longueur du contenu en octets (0 si l'en-tête Content-Length
+        est absent).
+    """
+    valeur = entetes.get("Content-Length", "0")
+    try:
+        longueur = int(valeur)
+    except ValueError:
+        longueur = -1
+    if longueur < 0:
+        raise ValueError(
+            "Mauvaise valeur pour l'en-tête Content-Length : %s" % (valeur)
+        )
+    return longueur
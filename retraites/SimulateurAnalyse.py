@@ -1,9 +1,27 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """Classe de gestion d'une analyse d'un système de retraites."""
+from retraites import OutilsDessin
+from retraites.TrajectoireDifferee import TrajectoireDifferee
+from retraites.TrajectoirePartagee import TrajectoirePartagee
+import copy
+import numpy as np
 import pylab as pl
 import os
 
+# Trajectoires d'une analyse, dans l'ordre du tableau sérialisé
+_TRAJECTOIRES = [
+    "T",
+    "P",
+    "A",
+    "S",
+    "RNV",
+    "REV",
+    "Depenses",
+    "PIB",
+    "PensionBrut",
+]
+
 
 class SimulateurAnalyse:
     def __init__(
@@ -36,6 +54,13 @@ class SimulateurAnalyse:
         trajectoire[s][a] est la valeur numérique du
         scénario s à l'année a
 
+        Les sorties S, RNV, REV, Depenses, PIB et PensionBrut peuvent
+        être des TrajectoireDifferee : chaque scénario est alors calculé
+        lors du premier accès.
+        Une analyse peut être restreinte à certains scénarios et à
+        certaines années (voir les paramètres scenarios et annees des
+        méthodes de pilotage).
+
         Parameters
         ----------
         T : dict
@@ -158,6 +183,8 @@ class SimulateurAnalyse:
             La liste des variables de l'analyse.
         liste_legendes : list of str
             La liste des légendes des variables de l'analyse.
+        variables_pourcentage : list of str
+            La liste des variables dessinées en %.
 
         Examples
         --------
@@ -232,8 +259,105 @@ class SimulateurAnalyse:
             u"Produit Intérieur Brut (Milliards EUR)",
             u"Pension annuelle (brut) de droit direct (kEUR)",
         ]
+        self.variables_pourcentage = ["S", "RNV", "T", "P", "REV", "Depenses"]
         return None
 
+    def __reduce_ex__(self, protocole):
+        """
+        Retourne la forme compacte de l'analyse, pour pickle.
+
+        Les neuf trajectoires de l'analyse sont rangées dans un unique
+        tableau dense de taille (9, len(scenarios), len(annees)) : avec
+        le protocole 5, ce tableau peut être transmis hors bande.
+        Les sorties calculées à la demande sont calculées ici.
+        Après désérialisation, les trajectoires sont des vues sur ce
+        tableau, copiées à l'écriture (voir TrajectoirePartagee).
+        Si une trajectoire n'est pas définie pour tous les scénarios et
+        toutes les années, l'analyse est sérialisée attribut par
+        attribut.
+
+        Parameters
+        ----------
+        protocole : int
+            Le protocole de pickle.
+        """
+        scenarios = list(self.scenarios)
+        annees = list(self.annees)
+        try:
+            tableau = np.array(
+                [
+                    _tableauTrajectoire(getattr(self, nom), scenarios, annees)
+                    for nom in _TRAJECTOIRES
+                ],
+                dtype=float,
+            )
+        except (KeyError, TypeError, ValueError):
+            return object.__reduce_ex__(self, protocole)
+        etat = self.__dict__.copy()
+        for nom in _TRAJECTOIRES:
+            del etat[nom]
+        return (_creeAnalyseDepuisTableau, (tableau, etat))
+
+    def copie(self):
+        """
+        Retourne une copie de l'analyse.
+
+        Les trajectoires de la copie partagent leur stockage avec
+        celles de l'analyse : aucune valeur n'est copiée avant d'être
+        modifiée (voir TrajectoirePartagee), et les sorties calculées à
+        la demande ne sont calculées qu'une fois pour toutes les copies
+        (voir TrajectoireDifferee).
+        La modification de la copie ne modifie pas l'analyse.
+
+        Returns
+        -------
+        analyse : SimulateurAnalyse
+            La copie.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> analyse = simulateur.pilotageCOR()
+        >>> copie = analyse.copie()
+        >>> copie.A[3][2050] = 64.0
+        """
+        analyse = SimulateurAnalyse.__new__(SimulateurAnalyse)
+        for nom, valeur in self.__dict__.items():
+            if nom in _TRAJECTOIRES:
+                valeur = _copieTrajectoire(valeur)
+            else:
+                valeur = copy.deepcopy(valeur)
+            setattr(analyse, nom, valeur)
+        return analyse
+
+    def getTableau(self, nom):
+        """
+        Retourne les valeurs d'une trajectoire sous la forme d'un tableau.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la trajectoire, parmi "T", "P", "A", "S", "RNV",
+            "REV", "Depenses", "PIB" et "PensionBrut".
+
+        Returns
+        -------
+        tableau : ndarray
+            Un nouveau tableau de taille (len(scenarios), len(annees)).
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> analyse = simulateur.pilotageCOR()
+        >>> S = analyse.getTableau("S")
+        """
+        if nom not in _TRAJECTOIRES:
+            raise ValueError("Mauvaise valeur pour le nom : %s" % (nom))
+        tableau = _tableauTrajectoire(
+            getattr(self, nom), list(self.scenarios), list(self.annees)
+        )
+        return tableau
+
     def setAfficheMessageEcriture(self, affiche_quand_ecrit):
         """
         Configure l'affichage d'un message quand on écrit un fichier
@@ -345,7 +469,7 @@ class SimulateurAnalyse:
         """
         return self.dir_image
 
-    def sauveFigure(self, filename):
+    def sauveFigure(self, filename, figure=None):
         """
         Sauvegarde l'image dans le répertoire.
 
@@ -355,6 +479,8 @@ class SimulateurAnalyse:
         ----------
         filename : str
             Le nom de base des fichiers à sauver.
+        figure : matplotlib.figure.Figure
+            La figure à sauver (par défaut, la figure courante de pylab).
 
         Examples
         --------
@@ -362,14 +488,22 @@ class SimulateurAnalyse:
         >>> analyse = simulateur.pilotageCOR()
         >>> analyse.dessineVariable("Depenses")
         >>> analyse.sauveFigure("depenses")
-        """
 
+        Sans utiliser l'état global de pylab :
+
+        >>> from matplotlib.figure import Figure
+        >>> figure = Figure()
+        >>> analyse.dessineVariable("Depenses", ax=figure.add_subplot())
+        >>> analyse.sauveFigure("depenses", figure)
+        """
+        if figure is None:
+            figure = pl.gcf()
         for ext in self.ext_image:
             basefilename = filename + "." + ext
-            filename = os.path.join(self.dir_image, basefilename)
+            chemin = os.path.join(self.dir_image, basefilename)
             if self.affiche_quand_ecrit:
-                print("Ecriture du fichier %s" % (filename))
-            pl.savefig(filename)
+                print("Ecriture du fichier %s" % (chemin))
+            figure.savefig(chemin)
         return None
 
     def dessineVariable(
@@ -381,11 +515,18 @@ class SimulateurAnalyse:
         dessine_legende=False,
         scenarios_indices=None,
         dessine_annees=None,
+        ax=None,
+        nombre_max_courbes=None,
     ):
         """
         Dessine un graphique associé à une variable donnée
         pour tous les scénarios.
 
+        La variable peut aussi être un tableau de trajectoires, par
+        exemple issu de SimulateurRetraites.pilotageStochastique.
+        Les trajectoires sont alors dessinées par une seule collection
+        de lignes, ce qui permet d'en superposer des milliers.
+
         Le nom peut être une égal à une des chaînes de caractères parmi
         les chaînes suivantes : "T", "P", "A", "S", "RNV", "REV",
         "Depenses", "PIB", "PensionBrut".
@@ -394,8 +535,10 @@ class SimulateurAnalyse:
         ----------
         nom : str
             Le nom de la variable.
-        v : dict
-            La variable à dessiner (par défaut, en fonction du nom)
+        v : dict or ndarray
+            La variable à dessiner (par défaut, en fonction du nom).
+            Si c'est un tableau, il est de taille (n, len(annees)) et
+            chaque ligne est une trajectoire.
         taille_fonte_titre : int
             La taille de la fonte du titre
             (par défaut, taille_fonte_titre=8)
@@ -409,6 +552,22 @@ class SimulateurAnalyse:
             (par défaut, scenarios_indices = range(1,7))
         dessine_annees : list of int
             La liste des années à dessiner.
+        ax : matplotlib.axes.Axes
+            Les axes dans lesquels dessiner (par défaut, les axes
+            courants de pylab).
+            Si les axes sont donnés, l'état global de pylab n'est pas
+            utilisé, ce qui permet de dessiner plusieurs figures
+            simultanément dans des threads différents.
+        nombre_max_courbes : int
+            Si v est un tableau de plus de nombre_max_courbes
+            trajectoires, seules nombre_max_courbes trajectoires
+            régulièrement espacées sont dessinées (par défaut,
+            toutes les trajectoires sont dessinées).
+
+        Returns
+        -------
+        ax : matplotlib.axes.Axes
+            Les axes du graphique.
 
         Examples
         --------
@@ -421,6 +580,21 @@ class SimulateurAnalyse:
         >>> analyse.dessineVariable("RNV", dessine_annees = range(2020,2041))
         >>> analyse.dessineVariable("RNV", taille_fonte_titre = 14)
         >>> analyse.dessineVariable("B", simulateur.B)
+
+        Sans utiliser l'état global de pylab :
+
+        >>> from matplotlib.figure import Figure
+        >>> figure = Figure()
+        >>> ax = analyse.dessineVariable("RNV", ax=figure.add_subplot())
+
+        Superpose des trajectoires aléatoires :
+
+        >>> resultat, quantiles = simulateur.pilotageStochastique(
+        ...     croissance, chomage
+        ... )
+        >>> analyse.dessineVariable(
+        ...     "S", resultat["S"], nombre_max_courbes=1000
+        ... )
         """
 
         if v is None:
@@ -445,6 +619,9 @@ class SimulateurAnalyse:
             else:
                 raise TypeError("Mauvaise valeur pour le nom : %s" % (nom))
 
+        if ax is None:
+            ax = pl.gca()
+
         if scenarios_indices is None:
             scenarios_indices = self.scenarios
 
@@ -456,30 +633,32 @@ class SimulateurAnalyse:
             else:
                 list_annees_dessin = self.annees
 
-        for s in scenarios_indices:
-            if (
-                nom == "S"
-                or nom == "RNV"
-                or nom == "T"
-                or nom == "P"
-                or nom == "REV"
-                or nom == "Depenses"
-            ):
-                # Ce sont des % : multiplie par 100.0
-                y = [100.0 * v[s][a] for a in list_annees_dessin]
-            else:
-                y = [v[s][a] for a in list_annees_dessin]
+        Y = OutilsDessin.tableauDessin(
+            v, scenarios_indices, self.annees, list_annees_dessin
+        )
+        if nom in self.variables_pourcentage:
+            # Ce sont des % : multiplie par 100.0
+            Y = 100.0 * Y
+        if isinstance(v, np.ndarray):
+            OutilsDessin.dessineEnsemble(
+                ax, list_annees_dessin, Y, nombre_max_courbes
+            )
+        else:
             if self.labels_is_long:
-                label_variable = self.scenarios_labels[s]
+                labels = [self.scenarios_labels[s] for s in scenarios_indices]
             else:
-                label_variable = self.scenarios_labels_courts[s]
-            pl.plot(list_annees_dessin, y, label=label_variable)
+                labels = [
+                    self.scenarios_labels_courts[s] for s in scenarios_indices
+                ]
+            lignes = ax.plot(list_annees_dessin, Y.T)
+            for ligne, label_variable in zip(lignes, labels):
+                ligne.set_label(label_variable)
 
         # titres des figures
         indice_variable = self.liste_variables.index(nom)
         titre_figure = self.liste_legendes[indice_variable]
 
-        pl.title(titre_figure, fontsize=taille_fonte_titre)
+        ax.set_title(titre_figure, fontsize=taille_fonte_titre)
 
         # Ajuste les limites de l'axe des ordonnées
         if yaxis_lim == []:
@@ -489,13 +668,13 @@ class SimulateurAnalyse:
                 yaxis_lim = self.yaxis_lim[nom]
 
         if yaxis_lim != []:
-            pl.ylim(bottom=yaxis_lim[0], top=yaxis_lim[1])
+            ax.set_ylim(bottom=yaxis_lim[0], top=yaxis_lim[1])
 
         if dessine_legende:
-            pl.legend(loc="best")
-        return None
+            ax.legend(loc="best")
+        return ax
 
-    def dessineSimulation(self, taille_fonte_titre=8):
+    def dessineSimulation(self, taille_fonte_titre=8, figure=None):
         """
         Dessine une simulation.
 
@@ -508,6 +687,14 @@ class SimulateurAnalyse:
         ----------
         taille_fonte_titre : int
             La taille de la fonte (par défaut, fs=8).
+        figure : matplotlib.figure.Figure
+            La figure dans laquelle dessiner (par défaut, la figure
+            courante de pylab).
+
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            La figure de la simulation.
 
         Examples
         --------
@@ -515,14 +702,26 @@ class SimulateurAnalyse:
         >>> analyse = simulateur.pilotageCOR()
         >>> analyse.dessineSimulation()
         >>> analyse.dessineSimulation(taille_fonte_titre = 4)
-        """
 
+        Sans utiliser l'état global de pylab :
+
+        >>> from matplotlib.figure import Figure
+        >>> figure = analyse.dessineSimulation(figure=Figure((6, 8)))
+        """
+        if figure is None:
+            # Comme pl.subplot, réutilise les axes de la figure courante
+            figure = pl.gcf()
+            ajouteAxes = pl.subplot
+        else:
+            ajouteAxes = figure.add_subplot
         for i in range(6):
-            pl.subplot(3, 2, i + 1)
+            ax = ajouteAxes(3, 2, i + 1)
             nom = self.liste_variables[i]
-            self.dessineVariable(nom, taille_fonte_titre=taille_fonte_titre)
-        pl.tight_layout(rect=[0, 0.03, 1, 0.95])
-        return None
+            self.dessineVariable(
+                nom, taille_fonte_titre=taille_fonte_titre, ax=ax
+            )
+        figure.tight_layout(rect=[0, 0.03, 1, 0.95])
+        return figure
 
     def afficheVariable(self, v):
         """
@@ -574,21 +773,115 @@ class SimulateurAnalyse:
                 )
         return None
 
-    def dessineLegende(self):
+    def dessineLegende(self, figure=None):
         """
         Crée un graphique présentant les légendes des graphiques.
 
+        Parameters
+        ----------
+        figure : matplotlib.figure.Figure
+            La figure dans laquelle dessiner (par défaut, crée une
+            nouvelle figure pylab).
+
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            La figure des légendes.
+
         Examples
         --------
         >>> simulateur = SimulateurRetraites()
         >>> analyse = simulateur.pilotageCOR()
         >>> analyse.dessineLegende()
         """
+        if figure is None:
+            figure = pl.figure(figsize=(6, 2))
         # Juste les légendes
-        pl.figure(figsize=(6, 2))
+        ax = figure.add_subplot()
         for s in self.scenarios:
-            pl.plot(0.0, 0.0, label=self.scenarios_labels[s])
-        pl.legend(loc="center")
-        pl.ylim(bottom=0.0, top=0.7)
-        pl.axis("off")
-        return None
+            ax.plot(0.0, 0.0, label=self.scenarios_labels[s])
+        ax.legend(loc="center")
+        ax.set_ylim(bottom=0.0, top=0.7)
+        ax.axis("off")
+        return figure
+
+
+def _tableauTrajectoire(v, scenarios, annees):
+    """
+    Retourne les valeurs d'une trajectoire sous la forme d'un tableau.
+
+    Parameters
+    ----------
+    v : dict
+        Une trajectoire v[s][a].
+    scenarios : list of int
+        Les scénarios, dans l'ordre des lignes.
+    annees : list of int
+        Les années, dans l'ordre des colonnes.
+
+    Returns
+    -------
+    tableau : ndarray
+        Le tableau de taille (len(scenarios), len(annees)).
+    """
+    if (
+        isinstance(v, TrajectoirePartagee)
+        and v.scenarios == scenarios
+        and v.annees == annees
+    ):
+        tableau = v.getTableau()
+    else:
+        tableau = np.array(
+            [[v[s][a] for a in annees] for s in scenarios], dtype=float
+        )
+    return tableau
+
+
+def _creeAnalyseDepuisTableau(tableau, etat):
+    """
+    Recrée une analyse à partir de sa forme compacte.
+
+    Voir SimulateurAnalyse.__reduce_ex__.
+
+    Parameters
+    ----------
+    tableau : ndarray
+        Le tableau des trajectoires, de taille
+        (9, len(scenarios), len(annees)).
+    etat : dict
+        Les autres attributs de l'analyse.
+
+    Returns
+    -------
+    analyse : SimulateurAnalyse
+        L'analyse.
+    """
+    analyse = SimulateurAnalyse.__new__(SimulateurAnalyse)
+    analyse.__dict__.update(etat)
+    for k, nom in enumerate(_TRAJECTOIRES):
+        trajectoire = TrajectoirePartagee(
+            etat["scenarios"], etat["annees"], tableau[k]
+        )
+        setattr(analyse, nom, trajectoire)
+    return analyse
+
+
+def _copieTrajectoire(trajectoire):
+    """
+    Retourne une copie d'une trajectoire d'une analyse.
+
+    Parameters
+    ----------
+    trajectoire : dict
+        La trajectoire.
+
+    Returns
+    -------
+    copie : dict
+        La copie, qui partage si possible le stockage de la trajectoire.
+    """
+    if isinstance(trajectoire, (TrajectoirePartagee, TrajectoireDifferee)):
+        copie = trajectoire.copie()
+    else:
+        copie = {s: dict(trajectoire[s]) for s in trajectoire}
+    return copie
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe d'évaluation asynchrone des pilotages et des modèles probabilistes.
+"""
+from retraites.EtudeImpact import EtudeImpact
+from retraites.FonctionPension import FonctionPension
+import asyncio
+import functools
+import openturns as ot
+
+
+class SimulateurAsynchrone:
+    def __init__(self, simulateur, executeur=None):
+        """
+        Crée des versions asynchrones des calculs d'un simulateur.
+
+        Chaque calcul est exécuté dans un exécuteur, si bien que la
+        boucle d'événements asyncio n'est pas bloquée et que de
+        nombreux calculs peuvent être lancés simultanément.
+        Chaque méthode accepte un délai maximal : au-delà, l'exception
+        asyncio.TimeoutError est levée.
+        Un calcul annulé (par exemple par asyncio.Task.cancel) ou
+        interrompu par le délai n'est pas démarré s'il est encore en
+        attente dans l'exécuteur ; s'il a déjà démarré, son résultat
+        est ignoré.
+
+        Parameters
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        executeur : concurrent.futures.Executor
+            L'exécuteur des calculs (par défaut, l'exécuteur par défaut
+            de la boucle d'événements, fondé sur des threads).
+
+        Attributes
+        ----------
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        executeur : concurrent.futures.Executor
+            L'exécuteur des calculs.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> asynchrone = SimulateurAsynchrone(simulateur)
+        >>> async def calcule():
+        ...     analyses = await asyncio.gather(
+        ...         asynchrone.pilote("pilotageCOR"),
+        ...         asynchrone.pilote(
+        ...             "pilotageParSoldePensionAge", {"Acible": 63.0}, 1.0
+        ...         ),
+        ...     )
+        ...     return analyses
+        >>> analyses = asyncio.run(calcule())
+        """
+        self.simulateur = simulateur
+        self.executeur = executeur
+        return None
+
+    async def _execute(self, fonction, delai=None):
+        """
+        Exécute une fonction sans argument dans l'exécuteur.
+
+        Parameters
+        ----------
+        fonction : function
+            La fonction à exécuter.
+        delai : float
+            Le délai maximal en secondes (par défaut, pas de délai).
+
+        Returns
+        -------
+        resultat : object
+            Le résultat de la fonction.
+        """
+        boucle = asyncio.get_running_loop()
+        future = boucle.run_in_executor(self.executeur, fonction)
+        resultat = await asyncio.wait_for(future, delai)
+        return resultat
+
+    async def pilote(self, methode, cibles=None, delai=None):
+        """
+        Evalue une méthode de pilotage du simulateur.
+
+        Parameters
+        ----------
+        methode : str
+            Le nom de la méthode de pilotage, par exemple
+            "pilotageParSoldePensionAge".
+        cibles : dict
+            Les arguments de la méthode, par exemple {"Acible": 63.0}
+            (par défaut, aucun argument).
+        delai : float
+            Le délai maximal en secondes (par défaut, pas de délai).
+
+        Returns
+        -------
+        analyse : SimulateurAnalyse
+            Le résultat de la méthode de pilotage.
+        """
+        if not methode.startswith("pilotage") or not hasattr(
+            self.simulateur, methode
+        ):
+            raise TypeError("Mauvaise valeur pour la méthode : %s" % (methode))
+        if cibles is None:
+            cibles = dict()
+        fonction = functools.partial(
+            getattr(self.simulateur, methode), **cibles
+        )
+        analyse = await self._execute(fonction, delai)
+        return analyse
+
+    async def calculeAge(self, REVcible, delai=None):
+        """
+        Calcule l'âge en fonction de la durée de vie à la retraite.
+
+        Voir SimulateurRetraites.calculeAge.
+
+        Parameters
+        ----------
+        REVcible : float
+            La durée de vie à la retraite.
+        delai : float
+            Le délai maximal en secondes (par défaut, pas de délai).
+
+        Returns
+        -------
+        As : dict
+            Une trajectoire d'âge de départ effectif moyen en retraite.
+        """
+        fonction = functools.partial(self.simulateur.calculeAge, REVcible)
+        As = await self._execute(fonction, delai)
+        return As
+
+    async def calculeEtudeImpact(self, delai=None):
+        """
+        Calcule la trajectoire de l'étude d'impact.
+
+        Voir EtudeImpact.calcule.
+
+        Parameters
+        ----------
+        delai : float
+            Le délai maximal en secondes (par défaut, pas de délai).
+
+        Returns
+        -------
+        analyse : SimulateurAnalyse
+            L'analyse de l'étude d'impact.
+        """
+
+        def _calcule():
+            etudeImpact = EtudeImpact(self.simulateur)
+            return etudeImpact.calcule()
+
+        analyse = await self._execute(_calcule, delai)
+        return analyse
+
+    async def evalueFonctionPension(self, annee, X, delai=None):
+        """
+        Evalue le modèle de pension pour une année donnée.
+
+        Voir FonctionPension.
+
+        Parameters
+        ----------
+        annee : int
+            L'année de calcul de P.
+        X : ot.Point or ot.Sample
+            Le point [S, D, As, F, TauC] ou l'échantillon de points.
+        delai : float
+            Le délai maximal en secondes (par défaut, pas de délai).
+
+        Returns
+        -------
+        Y : ot.Point or ot.Sample
+            La valeur de P en chaque point.
+        """
+        fonction = ot.Function(FonctionPension(self.simulateur, annee))
+        Y = await self._execute(functools.partial(fonction, X), delai)
+        return Y
+
+    async def genereEchantillonSortiesParBlocs(
+        self, modele, taille, tailleBloc=1000, methode="MonteCarlo", delai=None
+    ):
+        """
+        Génère un échantillon de P par blocs, dès qu'ils sont calculés.
+
+        C'est un générateur asynchrone : chaque bloc de l'échantillon de
+        sortie est retourné dès qu'il est évalué, ce qui permet
+        d'afficher des résultats partiels d'un grand calcul de
+        Monte-Carlo. Si le consommateur s'arrête ou est annulé, les blocs
+        suivants ne sont pas calculés.
+
+        Parameters
+        ----------
+        modele : ModelePensionProbabiliste
+            Le modèle probabiliste.
+        taille : int
+            La taille totale de l'échantillon.
+        tailleBloc : int
+            La taille des blocs (par défaut, 1000).
+        methode : str
+            La méthode de génération du plan d'expériences
+            (voir ModelePensionProbabiliste.genereEchantillonEntrees).
+        delai : float
+            Le délai maximal en secondes du calcul de chaque bloc
+            (par défaut, pas de délai).
+
+        Yields
+        ------
+        echantillon : ot.Sample
+            Le bloc suivant de l'échantillon de P, de dimension 1.
+
+        Examples
+        --------
+        >>> async def calcule():
+        ...     echantillon = ot.Sample(0, 1)
+        ...     async for bloc in asynchrone.genereEchantillonSortiesParBlocs(
+        ...         modele, 100000, 10000
+        ...     ):
+        ...         echantillon.add(bloc)
+        ...         print(echantillon.computeMean())
+        >>> asyncio.run(calcule())
+        """
+        if tailleBloc < 1:
+            raise ValueError(
+                "La taille de bloc doit être positive : %s" % (tailleBloc)
+            )
+        fonction = functools.partial(
+            modele.genereEchantillonEntrees, taille, methode
+        )
+        entrees = await self._execute(fonction, delai)
+        fonction = modele.getFonction()
+        for debut in range(0, taille, tailleBloc):
+            fin = min(taille, debut + tailleBloc)
+            bloc = entrees[debut:fin]
+            echantillon = await self._execute(
+                functools.partial(fonction, bloc), delai
+            )
+            yield echantillon
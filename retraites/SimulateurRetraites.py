@@ -4,17 +4,112 @@
 Classe de gestion d'un simulateur de retraites.
 """
 
-from copy import deepcopy
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+import functools
+import hashlib
+import inspect
 import json
+from retraites import NoyauxCompiles
+from retraites import OutilsDessin
+from retraites.DonneesTableaux import DonneesTableaux
 from retraites.SimulateurAnalyse import SimulateurAnalyse
+from retraites.TableInterpolation import TableInterpolation
+from retraites.TrajectoireDifferee import TrajectoireDifferee
+from retraites.TrajectoirePartagee import TrajectoirePartagee
+import numpy as np
 import pylab as pl
 import os
 import retraites
-import scipy.optimize as spo
+import threading
+
+
+def _normaliseCible(valeur):
+    """
+    Retourne une forme canonique et hachable d'une cible.
+
+    Parameters
+    ----------
+    valeur : float, str, dict, sequence or ndarray
+        La cible : un flottant, un nom, une trajectoire, une séquence
+        (liste, tuple, range, ...) ou un tableau.
+
+    Returns
+    -------
+    normalisee : float or tuple
+        Un flottant, ou un tuple décrivant la trajectoire ou le tableau.
+    """
+    if isinstance(valeur, str):
+        normalisee = valeur
+    elif isinstance(valeur, Mapping):
+        normalisee = tuple(
+            (cle, _normaliseCible(valeur[cle])) for cle in sorted(valeur)
+        )
+    elif isinstance(valeur, np.ndarray):
+        tableau = np.ascontiguousarray(valeur, dtype=float)
+        normalisee = ("ndarray", tableau.shape, tableau.tobytes())
+    elif isinstance(valeur, Sequence):
+        normalisee = tuple(_normaliseCible(v) for v in valeur)
+    else:
+        normalisee = float(valeur)
+    return normalisee
+
+
+def _memorise(methode):
+    """
+    Mémorise les résultats d'une méthode du simulateur.
+
+    Si le cache du simulateur est actif (voir
+    SimulateurRetraites.activeCache), le résultat est recherché dans
+    le cache en mémoire, puis dans le cache persistant, avant d'être
+    calculé.
+    Le résultat mémorisé n'est jamais retourné : chaque appel retourne
+    une copie, qui ne copie aucune valeur avant sa modification.
+
+    Parameters
+    ----------
+    methode : function
+        La méthode à mémoriser.
+
+    Returns
+    -------
+    enveloppe : function
+        La méthode mémorisée.
+    """
+    signature = inspect.signature(methode)
+
+    @functools.wraps(methode)
+    def enveloppe(self, *args, **kwargs):
+        if self._cache is None:
+            return methode(self, *args, **kwargs)
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        del arguments["self"]
+        cle = self.calculeCleCache(methode.__name__, arguments)
+        with self._verrou_cache:
+            if cle in self._cache:
+                self._cache.move_to_end(cle)
+                self.nombre_succes += 1
+                return self._cache[cle].copie()
+            self.nombre_echecs += 1
+        resultat = None
+        if self._cache_persistant is not None:
+            resultat = self._cache_persistant.lit(cle)
+        if resultat is None:
+            resultat = methode(self, *args, **kwargs)
+            if self._cache_persistant is not None:
+                self._cache_persistant.ecrit(cle, resultat)
+        with self._verrou_cache:
+            self._cache[cle] = resultat
+            self._cache.move_to_end(cle)
+            while len(self._cache) > self.taille_cache:
+                self._cache.popitem(last=False)
+        return resultat.copie()
+
+    return enveloppe
 
 
 class SimulateurRetraites:
-    def __init__(self, json_filename=None):
+    def __init__(self, json_filename=None, donnees_partagees=None):
         """
         Crée un simulateur à partir d'un fichier d'hypothèses JSON.
 
@@ -32,6 +127,15 @@ class SimulateurRetraites:
         9) pilotageParAgeEtNiveauDeVie (sous-entendu et par solde financier)
         10) pilotageParNiveauDeVieEtCotisations (sous-entendu et
             par solde financier)
+        11) pilotageParSoldePensionDuree
+        12) pilotageParSoldeCotisationsDuree
+        13) pilotageParSoldeDepensesDuree
+        14) pilotageParPensionCotisationsDuree
+        15) pilotageParCotisationsDepensesDuree
+
+        Les pilotages 11 à 15 imposent la durée de vie en retraite au
+        lieu de l'âge de départ.
+        La méthode pilotageParCibles impose trois variables quelconques.
 
         Les scénarios sont numérotés de 1 à 6 dans l'attribut "scenarios"
         (contrairement à l'usage Python ordinaire qui voudrait plutôt que
@@ -44,12 +148,42 @@ class SimulateurRetraites:
         trajectoire[s][a] est la valeur numérique du
         scénario s à l'année a
 
+        Au-delà des six scénarios du COR, la méthode pilotageConjonctures
+        applique ces pilotages à des couples (croissance, chômage)
+        quelconques, obtenus par interpolation entre les scénarios du COR.
+        Les calculs sont alors vectorisés sur des tableaux numpy.
+        La méthode pilotageStochastique l'applique à des trajectoires
+        de croissance et de chômage variables d'une année à l'autre.
+
+        La méthode activeCache mémorise les résultats des pilotages
+        pour les appels répétés avec les mêmes cibles.
+
+        Les hypothèses sont lues une seule fois, à la création du
+        simulateur : la conjoncture du COR qui en est déduite est
+        utilisée par tous les pilotages.
+        C'est pourquoi les trajectoires du COR (attributs T, P, A, G,
+        NR, NC, TCR, TCS, CNV, dP, B et EV) sont en lecture seule : la
+        modification d'une valeur produit une exception TypeError.
+        Pour piloter d'autres leviers, il faut utiliser une copie (voir
+        genereTrajectoire) et, pour d'autres hypothèses, créer un
+        simulateur à partir d'un autre fichier JSON.
+        Pour la même raison, ces attributs et l'attribut data ne doivent
+        pas être remplacés.
+
         Parameters
         ----------
         json_filename : str
             le nom du fichier JSON contenant les hypothèses
             (par défaut, charge le fichier "fileProjection.json" fourni
             par le module)
+        donnees_partagees : DonneesPartagees or DonneesTableaux
+            Les hypothèses publiées en mémoire partagée par un autre
+            processus, ou copiées dans des tableaux denses (par défaut,
+            aucune).
+            Si elles sont données, le fichier JSON n'est pas lu : les
+            trajectoires et les tableaux du COR sont des vues en
+            lecture seule sur ces tableaux, et l'attribut data
+            est None.
 
         Attributes
         ----------
@@ -93,48 +227,48 @@ class SimulateurRetraites:
         scenarios_labels_courts : list of str
             Les scénarios pour chaque scénario
             de la liste retournée par getScenarios().
-        T : dict
-            Une trajectoire.
+        T : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Le taux de cotisations retraites
-        P : dict
-            Une trajectoire.
+        P : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Le niveau moyen brut des pensions par rapport au
             niveau moyen brut des salaires
-        A : dict
-            Une trajectoire.
+        A : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             L'âge effectif moyen de départ en retraite
-        G : dict
-            Une trajectoire.
+        G : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Effectif moyen d'une génération arrivant aux âges
             de la retraite
-        NR  : dict
-            Une trajectoire.
+        NR  : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Nombre de retraités de droit direct (tous régimes confondus)
-        NC : dict
-            Une trajectoire.
+        NC : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Nombre de personnes en emploi (ou nombre de cotisants)
-        TCR : dict
-            Une trajectoire.
+        TCR : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Taux des prélèvements sociaux sur les pensions de retraite
             Son nom est TPR dans le composant, TCR dans le fichier json
-        TCS : dict
-            Une trajectoire.
+        TCS : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Taux des prélèvements sociaux sur les salaires et
             revenus d'activité ;
             Son nom est TPR dans le composant, TCR dans le fichier json
-        CNV : dict
-            Une trajectoire.
+        CNV : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Coefficient pour passer du ratio "pensions/salaire moyen"
             au ratio "niveau de vie/salaire moyen"
-        dP : dict
-            Une trajectoire.
+        dP : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Autres dépenses de retraite rapportées au nombre de
             retraités de droit direct en % du revenu d'activités brut moyen
-        B : dict
-            Une trajectoire.
+        B : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             part des revenus d'activités bruts dans le PIB
-        EV : dict
-            Une trajectoire.
+        EV : TrajectoirePartagee
+            Une trajectoire en lecture seule.
             Espérance de vie à 60 ans par génération
         liste_variables : list of str
             La liste des variables du modèle : B, NR, etc...
@@ -159,6 +293,7 @@ class SimulateurRetraites:
         rechercheAgeRTol : float
             La tolérance relative sur l'âge pour l'inversion de l'âge
             en fonction du ratio de durée de vie en retraite.
+            L'inversion étant exacte, ce paramètre n'est plus utilisé.
 
         Examples
         --------
@@ -168,19 +303,24 @@ class SimulateurRetraites:
         >>> simulateur.dessineLegende()
         """
 
-        if json_filename is None:
-            # Loading default JSON data
-            json_filename = os.path.join(
-                retraites.__path__[0], "fileProjection.json"
-            )
+        self._donnees_partagees = donnees_partagees
+        if donnees_partagees is not None:
+            # Les hypothèses sont lues dans les tableaux partagés
+            self.data = None
+        else:
+            if json_filename is None:
+                # Loading default JSON data
+                json_filename = os.path.join(
+                    retraites.__path__[0], "fileProjection.json"
+                )
 
-        # initialisations diverses
-        # chargement des donnees du COR pour les 6 scenarios
+            # initialisations diverses
+            # chargement des donnees du COR pour les 6 scenarios
 
-        # Lit les hypothèses de calcul dans le fichier JSON
-        json_file = open(json_filename)
-        self.data = json.load(json_file)
-        json_file.close()
+            # Lit les hypothèses de calcul dans le fichier JSON
+            json_file = open(json_filename)
+            self.data = json.load(json_file)
+            json_file.close()
 
         # Paramètres constants
         # Annee correspondant à la date d'aujourd'hui
@@ -225,21 +365,26 @@ class SimulateurRetraites:
             "+1%/an, Chômage: 10%",
         ]
 
-        # Extrait les variables depuis les données
-        self.T = self.get("T")
-        self.P = self.get("P")
-        self.A = self.get("A")
-        self.G = self.get("G")
-        self.NR = self.get("NR")
-        self.NC = self.get("NC")
+        # Tableaux et tables d'interpolation, calculés à la demande
+        self._tableaux = dict()
+        self._tables = dict()
+
+        # Extrait les variables depuis les données, en lecture seule
+        # car la conjoncture du COR est calculée une seule fois
+        self.T = self._getTrajectoireCOR("T")
+        self.P = self._getTrajectoireCOR("P")
+        self.A = self._getTrajectoireCOR("A")
+        self.G = self._getTrajectoireCOR("G")
+        self.NR = self._getTrajectoireCOR("NR")
+        self.NC = self._getTrajectoireCOR("NC")
         # Son nom est TPR dans le composant, TCR dans le fichier json
-        self.TCR = self.get("TCR")
+        self.TCR = self._getTrajectoireCOR("TCR")
         # Son nom est TCS dans le composant, TCS dans le fichier json
-        self.TCS = self.get("TCS")
-        self.CNV = self.get("CNV")
-        self.dP = self.get("dP")
-        self.B = self.get("B")
-        self.EV = self.get("EV")
+        self.TCS = self._getTrajectoireCOR("TCS")
+        self.CNV = self._getTrajectoireCOR("CNV")
+        self.dP = self._getTrajectoireCOR("dP")
+        self.B = self._getTrajectoireCOR("B")
+        self.EV = self._getTrajectoireCOR("EV")
 
         self.liste_variables = [
             "B",
@@ -285,12 +430,52 @@ class SimulateurRetraites:
         self.rechercheAgeBornes = [60.0, 70.0]
         # Tolérance relative sur l'âge
         self.rechercheAgeRTol = 1.0e-3
+        # Ages entiers des tables de la durée de vie en retraite
+        self._ages_REV = np.arange(50, 80)
+
+        # Noyaux des pilotages quelconques, construits à la demande
+        self._noyaux = dict()
+        # Variables décrivant une conjoncture économique et démographique
+        self._noms_conjoncture = [
+            "T",
+            "P",
+            "A",
+            "G",
+            "NR",
+            "NC",
+            "TCR",
+            "TCS",
+            "CNV",
+            "dP",
+            "B",
+        ]
+        self._conjoncture_COR = None
+        self._sorties_COR = None
+        # Mémorisation des résultats, inactive par défaut
+        self._cache = None
+        self._cache_persistant = None
+        self._verrou_cache = None
+        self._empreinte_donnees = None
+        # Noyaux compilés si numba est installé
+        if NoyauxCompiles.estDisponible():
+            self._moteur = "numba"
+        else:
+            self._moteur = "numpy"
         return None
 
-    def pilotageCOR(self):
+    @_memorise
+    def pilotageCOR(self, scenarios=None, annees=None):
         """
         Pilotage 1 : statu quo du COR.
 
+        Parameters
+        ----------
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
+
         Returns
         -------
         resultat : SimulateurAnalyse
@@ -301,37 +486,102 @@ class SimulateurRetraites:
         >>> simulateur = SimulateurRetraites()
         >>> simulateur.pilotageCOR()
         """
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(self.T, self.P, self.A)
+        # Les trajectoires de l'analyse sont des copies modifiables
         resultat = self._creerAnalyse(
-            self.T, self.P, self.A, S, RNV, REV, Depenses
+            self.T.copie(), self.P.copie(), self.A.copie(), scenarios, annees
         )
         return resultat
 
-    def _creerAnalyse(self, Ts, Ps, As, Ss, RNVs, REVs, Depenses):
+    def _creerAnalyse(self, Ts, Ps, As, scenarios=None, annees=None):
         """
-        Retourne une analyse en fonction des objets essentiels.
+        Retourne une analyse en fonction des leviers.
+
+        Les sorties de l'analyse ne sont pas calculées immédiatement :
+        chaque scénario de chaque sortie est calculé lors du premier
+        accès, puis conservé (voir TrajectoireDifferee).
+        Ainsi, une boucle d'optimisation qui lit uniquement
+        analyse.S[3] ne calcule que le scénario 3.
+
+        Parameters
+        ----------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
         resultat : SimulateurAnalyse
             Le résultat du pilotage.
         """
-        PIB = self._genereTrajectoirePIB()
-        PensionBrut = self._calculePensionAnnuelleDroitDirect(PIB, As)
+        tableaux = [self._versTableau(v) for v in [Ts, Ps, As]]
+        if scenarios is None and annees is None:
+            scenarios = self.scenarios
+            annees = self.annees
+            annees_standard = self.annees_standard
+        else:
+            if scenarios is None:
+                scenarios = self.scenarios
+            if annees is None:
+                annees = self.annees
+            for s in scenarios:
+                if s not in self.scenarios:
+                    raise ValueError(
+                        "Mauvaise valeur pour le scénario : %s" % (s)
+                    )
+            for a in annees:
+                if a not in self.annees:
+                    raise ValueError("Mauvaise valeur pour l'année : %s" % (a))
+            scenarios = list(scenarios)
+            annees = list(annees)
+            annees_standard = [a for a in self.annees_standard if a in annees]
+            # Restreint les leviers
+            lignes = [self.scenarios.index(s) for s in scenarios]
+            colonnes = [self.annees.index(a) for a in annees]
+            Ts, Ps, As = [
+                TrajectoirePartagee(
+                    scenarios, annees, tableau[np.ix_(lignes, colonnes)]
+                )
+                for tableau in tableaux
+            ]
+        # Sorties de chaque scénario, calculées à la demande
+        sorties = dict()
+
+        def calculeSortie(nom):
+            def calcule(s):
+                if s not in sorties:
+                    sorties[s] = self._calculeSortiesScenario(
+                        s, *tableaux, annees
+                    )
+                return sorties[s][nom]
+
+            return calcule
+
+        S, RNV, REV, Depenses, PIB, PensionBrut = [
+            TrajectoireDifferee(scenarios, calculeSortie(nom))
+            for nom in ["S", "RNV", "REV", "Depenses", "PIB", "PensionBrut"]
+        ]
         resultat = SimulateurAnalyse(
             Ts,
             Ps,
             As,
-            Ss,
-            RNVs,
-            REVs,
+            S,
+            RNV,
+            REV,
             Depenses,
             PIB,
             PensionBrut,
-            self.scenarios,
+            scenarios,
             self.annees_EV,
-            self.annees,
-            self.annees_standard,
+            annees,
+            annees_standard,
             self.scenarios_labels,
             self.scenarios_labels_courts,
             self.dir_image,
@@ -339,8 +589,122 @@ class SimulateurRetraites:
         )
         return resultat
 
+    def _calculeSortiesScenario(self, s, T, P, A, annees):
+        """
+        Calcule les sorties d'un scénario en fonction des leviers.
+
+        Si les leviers passés du scénario sont ceux du COR, les sorties
+        passées sont celles du COR (voir _getSortiesCOR) : seules les
+        années futures sont calculées.
+
+        Parameters
+        ----------
+        s : int
+            Le scénario.
+        T : ndarray
+            Le taux de cotisations, de taille
+            (len(scenarios), len(annees)).
+        P : ndarray
+            Le niveau des pensions par rapport aux salaires, de taille
+            (len(scenarios), len(annees)).
+        A : ndarray
+            L'âge effectif moyen de départ à la retraite, de taille
+            (len(scenarios), len(annees)).
+        annees : list of int
+            Les années calculées.
+
+        Returns
+        -------
+        sorties : dict
+            sorties[nom][a] est la valeur de la sortie nom à l'année a,
+            pour nom dans "S", "RNV", "REV", "Depenses", "PIB" et
+            "PensionBrut".
+        """
+        i = self.scenarios.index(s)
+        colonnes = [self.annees.index(a) for a in annees]
+        leviers = {
+            nom: v[i, colonnes] for nom, v in zip(["T", "P", "A"], [T, P, A])
+        }
+        # Si les leviers passés sont ceux du COR, les sorties passées
+        # sont celles du COR : seules les années futures sont calculées
+        i0 = self.annees.index(self.annee_courante)
+        sorties_COR = self._getSortiesCOR()
+        passe = [k for k, j in enumerate(colonnes) if j < i0]
+        lignes_passe = [colonnes[k] for k in passe]
+        if all(
+            np.array_equal(
+                leviers[nom][passe], sorties_COR[nom][i, lignes_passe]
+            )
+            for nom in leviers
+        ):
+            calculees = [k for k, j in enumerate(colonnes) if j >= i0]
+        else:
+            calculees = list(range(len(colonnes)))
+        noms = ["S", "RNV", "REV", "Depenses", "PIB", "PensionBrut"]
+        tableaux = {
+            nom: np.array(sorties_COR[nom][i, colonnes]) for nom in noms
+        }
+        if len(calculees) > 0:
+            c = self._getConjonctureRestreinte(
+                i, [colonnes[k] for k in calculees]
+            )
+            T, P, A = [leviers[nom][np.newaxis, calculees] for nom in leviers]
+            S, RNV, REV, Depenses = self._noyau_S_RNV_REV(c, T, P, A)
+            resultats = {
+                "S": S,
+                "RNV": RNV,
+                "REV": REV,
+                "Depenses": Depenses,
+                "PIB": c["PIB"],
+                "PensionBrut": self._noyau_PensionBrut(c, A),
+            }
+            for nom in noms:
+                tableaux[nom][calculees] = resultats[nom][0]
+        sorties = dict()
+        for nom in noms:
+            sorties[nom] = dict(zip(annees, tableaux[nom].tolist()))
+        return sorties
+
+    def _getConjonctureRestreinte(self, i, colonnes):
+        """
+        Restreint la conjoncture du COR à un scénario et à des années.
+
+        Parameters
+        ----------
+        i : int
+            L'indice du scénario dans scenarios.
+        colonnes : list of int
+            Les indices des années dans annees.
+
+        Returns
+        -------
+        c : dict
+            La conjoncture : c[nom] est le tableau de taille
+            (1, len(colonnes)) de la variable nom.
+            L'espérance de vie, indexée par génération, est celle du
+            scénario.
+        """
+        conjoncture = self._getConjonctureCOR()
+        c = dict()
+        for nom in conjoncture:
+            if nom == "EV":
+                c[nom] = conjoncture[nom][[i]]
+            elif nom == "annees":
+                c[nom] = conjoncture[nom][colonnes]
+            elif nom == "age_mort_REV":
+                c[nom] = conjoncture[nom][:, [i]][..., colonnes]
+            else:
+                c[nom] = conjoncture[nom][[i]][:, colonnes]
+        return c
+
+    @_memorise
     def pilotageParPensionAgeCotisations(
-        self, Pcible=None, Acible=None, Tcible=None
+        self,
+        Pcible=None,
+        Acible=None,
+        Tcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 1 par les pensions, l'age et les cotisations.
@@ -372,6 +736,11 @@ class SimulateurRetraites:
             L'âge de départ à la retraite.
         Tcible : float
             Le taux de cotisations.
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -399,12 +768,17 @@ class SimulateurRetraites:
         As = self.genereTrajectoire("A", Acible)
         Ts = self.genereTrajectoire("T", Tcible)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParSoldePensionAge(
-        self, Scible=None, Pcible=None, Acible=None
+        self,
+        Scible=None,
+        Pcible=None,
+        Acible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 2 : impose le solde, les pensions et l'âge.
@@ -436,6 +810,11 @@ class SimulateurRetraites:
             Le niveau de pension des retraites par rapport aux actifs
         Acible : float
             L'âge de départ à la retraite
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -454,12 +833,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ss_Ps_As(Ss, Ps, As)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParSoldePensionCotisations(
-        self, Scible=None, Pcible=None, Tcible=None
+        self,
+        Scible=None,
+        Pcible=None,
+        Tcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 3 : impose le solde, les pensions et les cotisations.
@@ -491,6 +875,11 @@ class SimulateurRetraites:
             Le niveau de pension des retraites par rapport aux actifs
         Tcible : float
             Le taux de cotisations
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -509,12 +898,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ss_Ps_Ts(Ss, Ps, Ts)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParSoldeAgeCotisations(
-        self, Scible=None, Acible=None, Tcible=None
+        self,
+        Scible=None,
+        Acible=None,
+        Tcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 4 : impose le solde, l'âge et les cotisations.
@@ -546,6 +940,11 @@ class SimulateurRetraites:
             L'âge de départ à la retraite
         Tcible : float
             Le taux de cotisations
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -564,12 +963,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ss_As_Ts(Ss, As, Ts)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParSoldeAgeDepenses(
-        self, Scible=None, Acible=None, Dcible=None
+        self,
+        Scible=None,
+        Acible=None,
+        Dcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 5 : impose le solde, l'âge et les dépenses.
@@ -601,6 +1005,11 @@ class SimulateurRetraites:
             L'âge de départ à la retraite
         Dcible : float
             Le niveau de dépenses
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -619,12 +1028,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ss_As_Ds(Ss, As, Ds)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParSoldePensionDepenses(
-        self, Scible=None, Pcible=None, Dcible=None
+        self,
+        Scible=None,
+        Pcible=None,
+        Dcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 6 : impose le solde, les pensions et les dépenses.
@@ -656,6 +1070,11 @@ class SimulateurRetraites:
             Le niveau de pension des retraites par rapport aux actifs
         Dcible : float
             Le niveau de dépenses
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -674,12 +1093,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ss_Ps_Ds(Ss, Ps, Ds)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParPensionCotisationsDepenses(
-        self, Pcible=None, Tcible=None, Dcible=None
+        self,
+        Pcible=None,
+        Tcible=None,
+        Dcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 7 : impose les pensions, les cotisations et les dépenses.
@@ -711,6 +1135,11 @@ class SimulateurRetraites:
             Le taux de cotisations
         Dcible : float
             Le niveau de dépenses
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -729,12 +1158,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ps_Ts_Ds(Ps, Ts, Ds)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParAgeCotisationsDepenses(
-        self, Acible=None, Tcible=None, Dcible=None
+        self,
+        Acible=None,
+        Tcible=None,
+        Dcible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 8 : impose l'âge, les cotisations et les dépenses.
@@ -766,6 +1200,11 @@ class SimulateurRetraites:
             Le taux de cotisations
         Dcible : float
             Le niveau de dépenses
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -784,12 +1223,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_As_Ts_Ds(As, Ts, Ds)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParAgeEtNiveauDeVie(
-        self, Acible=None, RNVcible=None, Scible=None
+        self,
+        Acible=None,
+        RNVcible=None,
+        Scible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 9 : impose l'âge, le niveau de vie et le solde.
@@ -822,6 +1266,11 @@ class SimulateurRetraites:
             rapport à l’ensemble de la population
         Scible : float
             La situation financière en % de PIB
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -840,12 +1289,17 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_As_RNV_S(As, RNVs, Ss)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
+    @_memorise
     def pilotageParNiveauDeVieEtCotisations(
-        self, Tcible=None, RNVcible=None, Scible=None
+        self,
+        Tcible=None,
+        RNVcible=None,
+        Scible=None,
+        scenarios=None,
+        annees=None,
     ):
         """
         Pilotage 10 : impose le niveau de vie, les cotisations et le solde.
@@ -878,6 +1332,11 @@ class SimulateurRetraites:
             l’ensemble de la population
         Scible : float
             La situation financière en % de PIB
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
@@ -896,310 +1355,2303 @@ class SimulateurRetraites:
         # Calcule le pilotage
         Ts, Ps, As = self._calcule_fixant_Ts_RNV_S(Ts, RNVs, Ss)
         # Simule
-        S, RNV, REV, Depenses = self._calcule_S_RNV_REV(Ts, Ps, As)
-        resultat = self._creerAnalyse(Ts, Ps, As, S, RNV, REV, Depenses)
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
         return resultat
 
-    def get(self, var):
+    @_memorise
+    def pilotageParSoldePensionDuree(
+        self,
+        Scible=None,
+        Pcible=None,
+        REVcible=None,
+        scenarios=None,
+        annees=None,
+    ):
         """
-        Retourne une donnée du COR correspondant à un nom donné.
+        Pilotage 11 : impose solde, pensions et durée de vie en retraite.
 
-        Parameters
-        ----------
-        var : str
-            La variable à extraire
+        Cela revient à imposer :
 
-        Returns
-        -------
-        v : dict
-            Une trajectoire : v[s][a] est la valeur de la variable
-            pour le scénario s à l'année a
+        1) le bilan financer
+        2) le niveau des pensions par rapport aux salaires
+        3) la durée de vie en retraite
 
-        Examples
-        --------
-        >>> simulateur = SimulateurRetraites()
-        >>> T = simulateur.get("T")
-        """
-        if var == "EV":
-            an = self.annees_EV
-        else:
-            an = self.annees
+        L'âge de départ à la retraite est calculé en inversant la durée
+        de vie en retraite (voir calculeAge), dans le même calcul
+        vectorisé que les autres leviers.
 
-        v = dict()
+        La gestion des paramètres optionnels est fondée sur le principe
+        suivant.
 
-        for s in self.scenarios:
-            v[s] = dict()
-            for a in an:
-                v[s][a] = self.data[var][str(s)][str(a)]
+        * Si la valeur cible n'est pas donnée, utilise
+          par défaut la trajectoire du COR.
 
-        return v
+        * Si la valeur cible donnée est un flottant, utilise
+          la trajectoire du COR pour les années passées et cette
+          valeur pour les années futures.
 
-    def _calcule_fixant_Ss_Ps_As(self, Ss, Ps, As):
-        """
-        Calcul à solde, pension et âge définis.
+        * Si la valeur cible donnée est un dictionnaire, considère
+          que c'est une trajectoire et utilise cette trajectoire.
 
         Parameters
         ----------
-        Ss : dict
-            Le solde financier en % de PIB.
-        Ps : dict
-            Le montant des pensions par rapport aux salaires.
-        As : dict
-            L'âge de départ à la retraite.
+        Scible : float
+            La situation financière en % de PIB
+        Pcible : float
+            Le niveau de pension des retraites par rapport aux actifs
+        REVcible : float
+            La durée de vie en retraite, en proportion de la vie totale
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        resultat : SimulateurAnalyse
+            Le résultat du pilotage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.pilotageParSoldePensionDuree(REVcible=0.30)
         """
+        # Génère les trajectoires en fonction des paramètres
+        Ss = self.genereTrajectoire("S", Scible)
+        Ps = self.genereTrajectoire("P", Pcible)
+        REVs = self.genereTrajectoire("REV", REVcible)
+        # Calcule le pilotage
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_Ps_REV, ["S", "P", "REV"], [Ss, Ps, REVs]
+        )
+        # Simule
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
+        return resultat
 
-        # Calcule Ts
-        Ts = deepcopy(self.T)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                Ts[s][a] = Ss[s][a] / self.B[s][a] + K * (
-                    Ps[s][a] + self.dP[s][a]
-                )
+    @_memorise
+    def pilotageParSoldeCotisationsDuree(
+        self,
+        Scible=None,
+        Tcible=None,
+        REVcible=None,
+        scenarios=None,
+        annees=None,
+    ):
+        """
+        Pilotage 12 : impose solde, cotisations et durée de vie en retraite.
 
-        return Ts, Ps, As
+        Cela revient à imposer :
 
-    def _calcule_fixant_Ss_Ps_Ts(self, Ss, Ps, Ts):
-        """
-        Calcul à solde, pension et cotisations définis
+        1) le bilan financer
+        2) le taux de cotisations
+        3) la durée de vie en retraite
 
-        Parameters
-        ----------
-        Ss : dict
-            Le solde financier en % de PIB.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        Ts : dict
-            Le taux de cotisations.
+        L'âge de départ à la retraite est calculé en inversant la durée
+        de vie en retraite (voir calculeAge), dans le même calcul
+        vectorisé que les autres leviers.
 
-        Returns
-        -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
-        """
+        La gestion des paramètres optionnels est fondée sur le principe
+        suivant.
 
-        # Calcule As
-        As = deepcopy(self.A)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                K = (Ts[s][a] - Ss[s][a] / self.B[s][a]) / (
-                    Ps[s][a] + self.dP[s][a]
-                )
-                As[s][a] = (
-                    self.A[s][a]
-                    + (self.NR[s][a] - K * self.NC[s][a])
-                    / (0.5 * K + 1)
-                    / self.G[s][a]
-                )
+        * Si la valeur cible n'est pas donnée, utilise
+          par défaut la trajectoire du COR.
 
-        return Ts, Ps, As
+        * Si la valeur cible donnée est un flottant, utilise
+          la trajectoire du COR pour les années passées et cette
+          valeur pour les années futures.
 
-    def _calcule_fixant_Ss_As_Ts(self, Ss, As, Ts):
-        """
-        Calcul à solde, âge et cotisations définis
+        * Si la valeur cible donnée est un dictionnaire, considère
+          que c'est une trajectoire et utilise cette trajectoire.
 
         Parameters
         ----------
-        Ss : dict
-            Le solde financier en % de PIB.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
-        Ts : dict
-            Le taux de cotisations.
+        Scible : float
+            La situation financière en % de PIB
+        Tcible : float
+            Le taux de cotisations
+        REVcible : float
+            La durée de vie en retraite, en proportion de la vie totale
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
 
         Returns
         -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        resultat : SimulateurAnalyse
+            Le résultat du pilotage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.pilotageParSoldeCotisationsDuree(REVcible=0.30)
         """
+        # Génère les trajectoires en fonction des paramètres
+        Ss = self.genereTrajectoire("S", Scible)
+        Ts = self.genereTrajectoire("T", Tcible)
+        REVs = self.genereTrajectoire("REV", REVcible)
+        # Calcule le pilotage
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_Ts_REV, ["S", "T", "REV"], [Ss, Ts, REVs]
+        )
+        # Simule
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
+        return resultat
 
-        # Calcule Ps
-        Ps = deepcopy(self.P)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                Ps[s][a] = (Ts[s][a] - Ss[s][a] / self.B[s][a]) / K - self.dP[
-                    s
-                ][a]
+    @_memorise
+    def pilotageParSoldeDepensesDuree(
+        self,
+        Scible=None,
+        Dcible=None,
+        REVcible=None,
+        scenarios=None,
+        annees=None,
+    ):
+        """
+        Pilotage 13 : impose solde, dépenses et durée de vie en retraite.
 
-        return Ts, Ps, As
+        Cela revient à imposer :
 
-    def _calcule_fixant_Ss_As_Ds(self, Ss, As, Ds):
-        """
-        Calcul à solde, âge et dépenses définis
+        1) le bilan financer
+        2) le niveau de dépenses
+        3) la durée de vie en retraite
 
-        Parameters
-        ----------
+        L'âge de départ à la retraite est calculé en inversant la durée
+        de vie en retraite (voir calculeAge), dans le même calcul
+        vectorisé que les autres leviers.
+
+        La gestion des paramètres optionnels est fondée sur le principe
+        suivant.
+
+        * Si la valeur cible n'est pas donnée, utilise
+          par défaut la trajectoire du COR.
+
+        * Si la valeur cible donnée est un flottant, utilise
+          la trajectoire du COR pour les années passées et cette
+          valeur pour les années futures.
+
+        * Si la valeur cible donnée est un dictionnaire, considère
+          que c'est une trajectoire et utilise cette trajectoire.
+
+        Parameters
+        ----------
+        Scible : float
+            La situation financière en % de PIB
+        Dcible : float
+            Le niveau de dépenses
+        REVcible : float
+            La durée de vie en retraite, en proportion de la vie totale
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
+
+        Returns
+        -------
+        resultat : SimulateurAnalyse
+            Le résultat du pilotage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.pilotageParSoldeDepensesDuree(REVcible=0.30)
+        """
+        # Génère les trajectoires en fonction des paramètres
+        Ss = self.genereTrajectoire("S", Scible)
+        Ds = self.genereTrajectoire("Depenses", Dcible)
+        REVs = self.genereTrajectoire("REV", REVcible)
+        # Calcule le pilotage
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_Ds_REV,
+            ["S", "Depenses", "REV"],
+            [Ss, Ds, REVs],
+        )
+        # Simule
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
+        return resultat
+
+    @_memorise
+    def pilotageParPensionCotisationsDuree(
+        self,
+        Pcible=None,
+        Tcible=None,
+        REVcible=None,
+        scenarios=None,
+        annees=None,
+    ):
+        """
+        Pilotage 14 : impose pensions, cotisations et durée de vie en retraite.
+
+        Cela revient à imposer :
+
+        1) le niveau des pensions par rapport aux salaires
+        2) le taux de cotisations
+        3) la durée de vie en retraite
+
+        L'âge de départ à la retraite est calculé en inversant la durée
+        de vie en retraite (voir calculeAge), dans le même calcul
+        vectorisé que les autres leviers.
+
+        La gestion des paramètres optionnels est fondée sur le principe
+        suivant.
+
+        * Si la valeur cible n'est pas donnée, utilise
+          par défaut la trajectoire du COR.
+
+        * Si la valeur cible donnée est un flottant, utilise
+          la trajectoire du COR pour les années passées et cette
+          valeur pour les années futures.
+
+        * Si la valeur cible donnée est un dictionnaire, considère
+          que c'est une trajectoire et utilise cette trajectoire.
+
+        Parameters
+        ----------
+        Pcible : float
+            Le niveau de pension des retraites par rapport aux actifs
+        Tcible : float
+            Le taux de cotisations
+        REVcible : float
+            La durée de vie en retraite, en proportion de la vie totale
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
+
+        Returns
+        -------
+        resultat : SimulateurAnalyse
+            Le résultat du pilotage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.pilotageParPensionCotisationsDuree(REVcible=0.30)
+        """
+        # Génère les trajectoires en fonction des paramètres
+        Ps = self.genereTrajectoire("P", Pcible)
+        Ts = self.genereTrajectoire("T", Tcible)
+        REVs = self.genereTrajectoire("REV", REVcible)
+        # Calcule le pilotage
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ps_Ts_REV, ["P", "T", "REV"], [Ps, Ts, REVs]
+        )
+        # Simule
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
+        return resultat
+
+    @_memorise
+    def pilotageParCotisationsDepensesDuree(
+        self,
+        Tcible=None,
+        Dcible=None,
+        REVcible=None,
+        scenarios=None,
+        annees=None,
+    ):
+        """
+        Pilotage 15 : impose cotisations, dépenses et durée de vie en retraite.
+
+        Cela revient à imposer :
+
+        1) le taux de cotisations
+        2) le niveau de dépenses
+        3) la durée de vie en retraite
+
+        L'âge de départ à la retraite est calculé en inversant la durée
+        de vie en retraite (voir calculeAge), dans le même calcul
+        vectorisé que les autres leviers.
+
+        La gestion des paramètres optionnels est fondée sur le principe
+        suivant.
+
+        * Si la valeur cible n'est pas donnée, utilise
+          par défaut la trajectoire du COR.
+
+        * Si la valeur cible donnée est un flottant, utilise
+          la trajectoire du COR pour les années passées et cette
+          valeur pour les années futures.
+
+        * Si la valeur cible donnée est un dictionnaire, considère
+          que c'est une trajectoire et utilise cette trajectoire.
+
+        Parameters
+        ----------
+        Tcible : float
+            Le taux de cotisations
+        Dcible : float
+            Le niveau de dépenses
+        REVcible : float
+            La durée de vie en retraite, en proportion de la vie totale
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
+
+        Returns
+        -------
+        resultat : SimulateurAnalyse
+            Le résultat du pilotage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.pilotageParCotisationsDepensesDuree(REVcible=0.30)
+        """
+        # Génère les trajectoires en fonction des paramètres
+        Ts = self.genereTrajectoire("T", Tcible)
+        Ds = self.genereTrajectoire("Depenses", Dcible)
+        REVs = self.genereTrajectoire("REV", REVcible)
+        # Calcule le pilotage
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ts_Ds_REV,
+            ["T", "Depenses", "REV"],
+            [Ts, Ds, REVs],
+        )
+        # Simule
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
+        return resultat
+
+    @_memorise
+    def pilotageParCibles(
+        self,
+        noms,
+        Scible=None,
+        Pcible=None,
+        Acible=None,
+        Tcible=None,
+        Dcible=None,
+        RNVcible=None,
+        REVcible=None,
+        scenarios=None,
+        annees=None,
+    ):
+        """
+        Pilotage quelconque : impose trois variables choisies.
+
+        Les trois variables imposées sont choisies parmi le solde "S",
+        le niveau des pensions "P", l'âge de départ "A", le taux de
+        cotisations "T", les dépenses "Depenses", le niveau de vie
+        "RNV" et la durée de vie en retraite "REV".
+        Les leviers T, P et A qui ne sont pas imposés sont calculés par
+        un noyau vectorisé construit pour cette liste de variables
+        (voir _construitNoyau), aussi rapide que ceux des autres
+        méthodes de pilotage.
+        Par exemple, ["RNV", "Depenses", "A"] impose le niveau de vie,
+        les dépenses et l'âge de départ.
+
+        Certaines listes de variables ne déterminent pas les leviers,
+        car les variables sont liées : A et REV ; P, A et Depenses ;
+        T, S et Depenses ; T, P et RNV.
+        Une exception ValueError est alors levée.
+
+        La gestion des paramètres optionnels est celle des autres
+        méthodes de pilotage : si la cible d'une variable imposée n'est
+        pas donnée, utilise la trajectoire du COR.
+        Les cibles des variables qui ne sont pas imposées doivent
+        être None.
+
+        Parameters
+        ----------
+        noms : list of str
+            Les noms des trois variables imposées.
+        Scible : float
+            La situation financière en % de PIB
+        Pcible : float
+            Le niveau de pension des retraites par rapport aux actifs
+        Acible : float
+            L'âge de départ à la retraite
+        Tcible : float
+            Le taux de cotisations
+        Dcible : float
+            Le niveau de dépenses
+        RNVcible : float
+            Le niveau de vie des retraités par rapport à l'ensemble
+            de la population
+        REVcible : float
+            La durée de vie en retraite, en proportion de la vie totale
+        scenarios : list of int
+            Les scénarios de l'analyse (par défaut, tous les
+            scénarios).
+        annees : list of int
+            Les années de l'analyse (par défaut, toutes les années).
+
+        Returns
+        -------
+        resultat : SimulateurAnalyse
+            Le résultat du pilotage.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.pilotageParCibles(
+        ...     ["RNV", "Depenses", "A"], RNVcible=0.9, Dcible=0.13
+        ... )
+        """
+        cibles = {
+            "S": Scible,
+            "P": Pcible,
+            "A": Acible,
+            "T": Tcible,
+            "Depenses": Dcible,
+            "RNV": RNVcible,
+            "REV": REVcible,
+        }
+        noyau = self._construitNoyau(noms)
+        for nom in cibles:
+            if nom not in noms and cibles[nom] is not None:
+                raise ValueError(
+                    "La cible %s n'est pas une variable imposée : %s"
+                    % (nom, noms)
+                )
+        # Génère les trajectoires en fonction des paramètres
+        trajectoires = [
+            self.genereTrajectoire(nom, cibles[nom]) for nom in noms
+        ]
+        # Calcule le pilotage
+        Ts, Ps, As = self._calculeFixant(noyau, list(noms), trajectoires)
+        # Simule
+        resultat = self._creerAnalyse(Ts, Ps, As, scenarios, annees)
+        return resultat
+
+    def get(self, var):
+        """
+        Retourne une donnée du COR correspondant à un nom donné.
+
+        Parameters
+        ----------
+        var : str
+            La variable à extraire
+
+        Returns
+        -------
+        v : dict
+            Une trajectoire : v[s][a] est la valeur de la variable
+            pour le scénario s à l'année a
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> T = simulateur.get("T")
+        """
+        if var == "EV":
+            an = self.annees_EV
+        else:
+            an = self.annees
+
+        if self._donnees_partagees is not None:
+            # Vue sur les tableaux partagés, sans copie
+            v = TrajectoirePartagee(
+                self.scenarios, an, self._getTableauPartage(var, an)
+            )
+            return v
+
+        v = dict()
+
+        for s in self.scenarios:
+            v[s] = dict()
+            for a in an:
+                v[s][a] = self.data[var][str(s)][str(a)]
+
+        return v
+
+    def _getTrajectoireCOR(self, nom):
+        """
+        Retourne une trajectoire du COR en lecture seule.
+
+        La trajectoire partage le tableau de la variable (voir
+        getTableau) : elle n'est pas modifiable, sans quoi elle
+        différerait de la conjoncture du COR utilisée par les pilotages.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la variable dans le fichier JSON.
+
+        Returns
+        -------
+        trajectoire : TrajectoirePartagee
+            La trajectoire en lecture seule.
+        """
+        if nom == "EV":
+            an = self.annees_EV
+        else:
+            an = self.annees
+        trajectoire = TrajectoirePartagee(
+            self.scenarios, an, self.getTableau(nom), lecture_seule=True
+        )
+        return trajectoire
+
+    def getTableau(self, nom):
+        """
+        Retourne une donnée du COR sous la forme d'un tableau.
+
+        Le tableau est calculé au premier appel, puis conservé.
+        Il est protégé en écriture car il est partagé.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la variable dans le fichier JSON : "T", "P", "A",
+            "G", "NR", "NC", "TCR", "TCS", "CNV", "dP", "B" ou "EV",
+            ou bien "PIB" pour le PIB (Milliards EUR) de chaque scénario.
+
+        Returns
+        -------
+        tableau : ndarray
+            Un tableau de taille (len(scenarios), len(annees)),
+            ou (len(scenarios), len(annees_EV)) pour "EV".
+            tableau[i, j] est la valeur de la variable pour le
+            scénario scenarios[i] à l'année annees[j].
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> NC = simulateur.getTableau("NC")
+        >>> NC[simulateur.scenarios.index(3), simulateur.annees.index(2050)]
+        """
+        if nom not in self._tableaux:
+            if nom == "PIB":
+                croissance = [
+                    self.scenarios_croissance[s] for s in self.scenarios
+                ]
+                croissance = np.array(croissance)[:, np.newaxis]
+                tableau = self._calculeTableauPIB(croissance)
+            else:
+                if nom == "EV":
+                    an = self.annees_EV
+                else:
+                    an = self.annees
+                if self._donnees_partagees is not None:
+                    tableau = self._getTableauPartage(nom, an)
+                else:
+                    v = self.get(nom)
+                    tableau = np.array(
+                        [[v[s][a] for a in an] for s in self.scenarios]
+                    )
+            tableau.flags.writeable = False
+            self._tableaux[nom] = tableau
+        return self._tableaux[nom]
+
+    def _getTableauPartage(self, nom, annees):
+        """
+        Retourne une vue sur un tableau des données partagées.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la variable dans le fichier JSON.
+        annees : list of int
+            Les années du tableau.
+
+        Returns
+        -------
+        tableau : ndarray
+            La vue en lecture seule, de taille
+            (len(scenarios), len(annees)).
+        """
+        donnees = self._donnees_partagees
+        tableau = donnees.getTableau(nom)
+        if donnees.scenarios != list(self.scenarios):
+            lignes = [donnees.scenarios.index(s) for s in self.scenarios]
+            tableau = tableau[lignes]
+        annees_tableau = donnees.annees[nom]
+        j0 = annees_tableau.index(annees[0])
+        j1 = j0 + len(annees)
+        if annees_tableau[j0:j1] == list(annees):
+            # Années consécutives : la vue évite une copie
+            tableau = tableau[:, j0:j1]
+        else:
+            colonnes = [annees_tableau.index(a) for a in annees]
+            tableau = tableau[:, colonnes]
+        tableau.flags.writeable = False
+        return tableau
+
+    def getTableChomage(self):
+        """
+        Retourne la table d'interpolation en fonction du taux de chômage.
+
+        Les variables NC, dP, B, NR, G et A sont tabulées aux taux de
+        chômage des scénarios optimiste, central et pessimiste,
+        pour toutes les années de la liste annees.
+
+        La table est calculée au premier appel, puis partagée par tous
+        les objets qui l'utilisent, par exemple les FonctionPension
+        créées à partir de ce simulateur.
+
+        Returns
+        -------
+        table : TableInterpolation
+            La table d'interpolation, de taille (6, 3, len(annees)).
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> table = simulateur.getTableChomage()
+        >>> indice_annee = simulateur.annees.index(2050)
+        >>> valeurs = table.interpole(8.0, indice_annee)
+        >>> NC = valeurs[table.getIndice("NC")]
+        """
+        if "chomage" not in self._tables:
+            scenarios_table = [
+                self.scenario_optimiste,
+                self.scenario_central,
+                self.scenario_pessimiste,
+            ]
+            table_TauC = [self.scenarios_chomage[s] for s in scenarios_table]
+            indices = [self.scenarios.index(s) for s in scenarios_table]
+            noms = ["NC", "dP", "B", "NR", "G", "A"]
+            valeurs = [self.getTableau(nom)[indices, :] for nom in noms]
+            self._tables["chomage"] = TableInterpolation(
+                table_TauC, valeurs, noms
+            )
+        return self._tables["chomage"]
+
+    def _getTablesConjoncture(self):
+        """
+        Retourne les tables d'interpolation de la conjoncture.
+
+        La conjoncture d'un couple (croissance, chômage) est la somme
+        de deux interpolations linéaires par morceaux :
+
+        * la table de croissance, tabulée aux scénarios du COR dont le
+          taux de chômage est celui du scénario central,
+        * la table des écarts dus au chômage, tabulée aux taux de chômage
+          des scénarios optimiste, central et pessimiste, chaque écart
+          étant mesuré par rapport au scénario de même croissance et de
+          chômage central.
+
+        Cette décomposition reproduit exactement les six scénarios
+        du COR.
+
+        Returns
+        -------
+        table_croissance : TableInterpolation
+            La table des variables en fonction de la croissance.
+        table_chomage : TableInterpolation
+            La table des écarts en fonction du taux de chômage.
+        """
+        if "croissance" not in self._tables:
+            chomage_central = self.scenarios_chomage[self.scenario_central]
+            scenarios_croissance = [
+                s
+                for s in self.scenarios
+                if self.scenarios_chomage[s] == chomage_central
+            ]
+            scenarios_croissance.sort(
+                key=lambda s: self.scenarios_croissance[s]
+            )
+            noms = self._noms_conjoncture
+            indices = [self.scenarios.index(s) for s in scenarios_croissance]
+            valeurs = np.array(
+                [self.getTableau(nom)[indices, :] for nom in noms]
+            )
+            abscisses = [
+                self.scenarios_croissance[s] for s in scenarios_croissance
+            ]
+            table_croissance = TableInterpolation(abscisses, valeurs, noms)
+            # Ecarts dus au chômage à croissance égale
+            scenarios_chomage = [
+                self.scenario_optimiste,
+                self.scenario_central,
+                self.scenario_pessimiste,
+            ]
+            ecarts = np.zeros((len(noms), 3, len(self.annees)))
+            for k, s in enumerate(scenarios_chomage):
+                croissance = self.scenarios_croissance[s]
+                if croissance not in abscisses:
+                    raise ValueError(
+                        "Aucun scénario de chômage central pour la "
+                        "croissance : %s" % (croissance)
+                    )
+                i = self.scenarios.index(s)
+                i_reference = indices[abscisses.index(croissance)]
+                for v, nom in enumerate(noms):
+                    tableau = self.getTableau(nom)
+                    ecarts[v, k, :] = tableau[i, :] - tableau[i_reference, :]
+            abscisses = [self.scenarios_chomage[s] for s in scenarios_chomage]
+            table_chomage = TableInterpolation(abscisses, ecarts, noms)
+            self._tables["croissance"] = table_croissance
+            self._tables["ecarts_chomage"] = table_chomage
+        return self._tables["croissance"], self._tables["ecarts_chomage"]
+
+    def genereConjoncture(self, croissance, chomage):
+        """
+        Génère la conjoncture de couples (croissance, chômage) quelconques.
+
+        Les variables qui dépendent de la conjoncture économique sont
+        interpolées entre les scénarios du COR, qui sont retrouvés
+        exactement. L'espérance de vie, qui ne dépend pas de la
+        conjoncture, est celle du scénario central.
+
+        Les taux peuvent être constants ou varier d'une année à
+        l'autre : chaque année est alors interpolée avec ses propres
+        taux et le PIB est composé avec la croissance de chaque année.
+        Les taux doivent être dans les intervalles couverts par les
+        scénarios du COR, sinon une exception ValueError est levée.
+
+        Parameters
+        ----------
+        croissance : float or ndarray
+            Le ou les taux de croissance annuels (%), par exemple 1.3.
+            Un tableau de dimension 1, de taille n, donne un taux
+            constant par conjoncture.
+            Un tableau de taille (n, len(annees)) ou
+            (n, len(annees_futures)) donne une trajectoire de taux par
+            conjoncture, par exemple simulée par un processus aléatoire.
+            Dans le second cas, les années passées sont celles du
+            scénario central.
+        chomage : float or ndarray
+            Le ou les taux de chômage (%), par exemple 7.0, sous
+            les mêmes formes que la croissance.
+            Les deux taux sont combinés selon les règles de diffusion
+            de numpy, pour obtenir n conjonctures.
+
+        Returns
+        -------
+        conjoncture : dict
+            conjoncture[nom] est le tableau de taille (n, len(annees))
+            de la variable nom, pour nom dans "T", "P", "A", "G", "NR",
+            "NC", "TCR", "TCS", "CNV", "dP", "B" et "PIB".
+            conjoncture["EV"] est l'espérance de vie, de taille
+            (1, len(annees_EV)), conjoncture["annees"] le tableau
+            des années et conjoncture["age_mort_REV"] la table de l'âge
+            de décès (voir _calculeTableREV).
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> conjoncture = simulateur.genereConjoncture([1.1, 1.4], 8.0)
+        >>> NC = conjoncture["NC"]
+        """
+        croissance = self._genereTaux(
+            croissance, self.scenarios_croissance[self.scenario_central]
+        )
+        chomage = self._genereTaux(
+            chomage, self.scenarios_chomage[self.scenario_central]
+        )
+        croissance, chomage = np.broadcast_arrays(croissance, chomage)
+        table_croissance, table_chomage = self._getTablesConjoncture()
+        valeurs = table_croissance.interpole(croissance)
+        valeurs = valeurs + table_chomage.interpole(chomage)
+        conjoncture = dict(zip(self._noms_conjoncture, valeurs))
+        i_central = self.scenarios.index(self.scenario_central)
+        conjoncture["EV"] = self.getTableau("EV")[[i_central]]
+        conjoncture["PIB"] = self._calculeTableauPIB(croissance)
+        conjoncture["annees"] = np.array(self.annees)
+        conjoncture["age_mort_REV"] = self._getConjonctureCOR()[
+            "age_mort_REV"
+        ][:, [i_central]]
+        return conjoncture
+
+    def _genereTaux(self, taux, taux_passe):
+        """
+        Met en forme un taux de croissance ou de chômage.
+
+        Parameters
+        ----------
+        taux : float or ndarray
+            Le taux (voir genereConjoncture).
+        taux_passe : float
+            Le taux des années passées, si le taux n'est donné que
+            pour les années futures.
+
+        Returns
+        -------
+        taux : ndarray
+            Un tableau de taille (n, 1) ou (n, len(annees)).
+        """
+        taux = np.asarray(taux, dtype=float)
+        if taux.ndim <= 1:
+            taux = np.atleast_1d(taux)[:, np.newaxis]
+        elif taux.ndim > 2:
+            raise ValueError(
+                "Mauvaise dimension pour le taux : %s" % (taux.ndim)
+            )
+        elif taux.shape[1] in [1, len(self.annees)]:
+            pass
+        elif taux.shape[1] == len(self.annees_futures):
+            i0 = self.annees.index(self.annee_courante)
+            passe = np.full((taux.shape[0], i0), taux_passe)
+            taux = np.concatenate([passe, taux], axis=1)
+        else:
+            raise ValueError(
+                "Mauvais nombre d'années pour le taux : %s" % (taux.shape[1])
+            )
+        return taux
+
+    def pilotageConjonctures(
+        self,
+        croissance,
+        chomage,
+        methode="pilotageCOR",
+        Scible=None,
+        Pcible=None,
+        Acible=None,
+        Tcible=None,
+        Dcible=None,
+        RNVcible=None,
+        REVcible=None,
+    ):
+        """
+        Pilote le système de retraites pour des conjonctures quelconques.
+
+        Le calcul est vectorisé sur les conjonctures : il n'est pas limité
+        aux six scénarios du COR, ce qui permet par exemple d'explorer
+        continûment le plan (croissance, chômage) ou d'évaluer un grand
+        échantillon de conjonctures. Aux taux des scénarios du COR,
+        les résultats sont ceux des méthodes de pilotage.
+
+        Les cibles sont celles de la méthode de pilotage choisie.
+        Chaque cible peut être :
+
+        * None : la valeur de la conjoncture (statu quo), ou bien,
+          pour le solde, les dépenses et le niveau de vie, la valeur
+          calculée avec les leviers de la conjoncture ;
+        * un flottant : la valeur pour toutes les années futures ;
+        * un tableau dont la dernière dimension est de taille
+          len(annees_futures) (années futures), len(annees) (toutes les
+          années) ou 1 (valeur future constante), diffusable vers
+          (n, nombre d'années).
+
+        Parameters
+        ----------
+        croissance : float or ndarray
+            Le ou les taux de croissance annuels (%).
+        chomage : float or ndarray
+            Le ou les taux de chômage (%).
+        methode : str or list of str
+            Le nom de la méthode de pilotage, par exemple
+            "pilotageParSoldePensionAge", ou la liste des noms des trois
+            variables imposées, par exemple ["RNV", "Depenses", "A"]
+            (voir pilotageParCibles).
+        Scible : float or ndarray
+            Le solde financier en % de PIB.
+        Pcible : float or ndarray
+            Le niveau des pensions par rapport aux salaires.
+        Acible : float or ndarray
+            L'âge effectif moyen de départ à la retraite.
+        Tcible : float or ndarray
+            Le taux de cotisations.
+        Dcible : float or ndarray
+            Le montant des dépenses de retraites en % de PIB.
+        RNVcible : float or ndarray
+            Le niveau de vie des retraités par rapport à l'ensemble
+            de la population.
+        REVcible : float or ndarray
+            La durée de vie en retraite, en proportion de la vie totale.
+
+        Returns
+        -------
+        resultat : dict
+            resultat[nom] est le tableau de taille (n, len(annees)) de la
+            variable nom, pour nom dans "T", "P", "A", "S", "RNV", "REV",
+            "Depenses", "PIB" et "PensionBrut".
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> croissance = np.linspace(1.0, 1.8, 9)
+        >>> resultat = simulateur.pilotageConjonctures(
+        ...     croissance, 7.0, "pilotageParSoldePensionAge",
+        ...     Scible=0.0, Acible=63.0
+        ... )
+        >>> P = resultat["P"]
+        """
+        cibles = {
+            "S": Scible,
+            "P": Pcible,
+            "A": Acible,
+            "T": Tcible,
+            "Depenses": Dcible,
+            "RNV": RNVcible,
+            "REV": REVcible,
+        }
+        noyau, noms = self._decritPilotage(methode)
+        if methode == "pilotageCOR":
+            noms_cibles = []
+        else:
+            noms_cibles = noms
+        for nom in cibles:
+            if nom not in noms_cibles and cibles[nom] is not None:
+                raise ValueError(
+                    "La cible %s n'est pas utilisée par la méthode %s"
+                    % (nom, methode)
+                )
+        c = self.genereConjoncture(croissance, chomage)
+        S, RNV, REV, Depenses = self._noyau_S_RNV_REV(
+            c, c["T"], c["P"], c["A"]
+        )
+        base = {
+            "T": c["T"],
+            "P": c["P"],
+            "A": c["A"],
+            "S": S,
+            "Depenses": Depenses,
+            "RNV": RNV,
+            "REV": REV,
+        }
+        tableaux = [
+            self._genereTableau(nom, cibles[nom], base[nom]) for nom in noms
+        ]
+        T, P, A = self._pilote(c, noyau, noms, tableaux)
+        S, RNV, REV, Depenses = self._noyau_S_RNV_REV(c, T, P, A)
+        PensionBrut = self._noyau_PensionBrut(c, A)
+        forme = T.shape
+        resultat = {
+            "T": T,
+            "P": P,
+            "A": A,
+            "S": S,
+            "RNV": RNV,
+            "REV": REV,
+            "Depenses": Depenses,
+            "PIB": np.broadcast_to(c["PIB"], forme).copy(),
+            "PensionBrut": PensionBrut,
+        }
+        return resultat
+
+    def pilotageStochastique(
+        self,
+        croissance,
+        chomage,
+        methode="pilotageCOR",
+        Scible=None,
+        Pcible=None,
+        Acible=None,
+        Tcible=None,
+        Dcible=None,
+        RNVcible=None,
+        niveaux=None,
+        tailleBloc=10000,
+        REVcible=None,
+    ):
+        """
+        Pilote le système de retraites pour des trajectoires aléatoires.
+
+        Les trajectoires de croissance et de chômage sont par exemple
+        simulées par un processus aléatoire choisi par l'utilisateur.
+        Chaque trajectoire est propagée dans le PIB, la pension brute et
+        le pilotage choisi, comme dans la méthode pilotageConjonctures.
+        Le calcul est vectorisé et réalisé par blocs de trajectoires,
+        pour limiter la mémoire consommée par les calculs intermédiaires.
+
+        Parameters
+        ----------
+        croissance : ndarray
+            Les taux de croissance annuels (%), de taille
+            (n, len(annees)) ou (n, len(annees_futures)).
+        chomage : ndarray
+            Les taux de chômage (%), de même taille que la croissance.
+        methode : str or list of str
+            Le nom de la méthode de pilotage ou la liste des noms des
+            variables imposées (voir pilotageConjonctures).
+        Scible, Pcible, Acible, Tcible, Dcible, RNVcible : float or ndarray
+            Les cibles du pilotage (voir pilotageConjonctures).
+            Un tableau dont la première dimension est de taille n donne
+            une cible par trajectoire.
+        niveaux : list of float
+            Les niveaux des quantiles calculés pour chaque année,
+            par exemple pour dessiner un graphique en éventail
+            (par défaut, [0.05, 0.25, 0.5, 0.75, 0.95]).
+        tailleBloc : int
+            Le nombre de trajectoires calculées simultanément.
+        REVcible : float or ndarray
+            La cible de durée de vie en retraite, comme les autres cibles.
+
+        Returns
+        -------
+        resultat : dict
+            resultat[nom] est le tableau de taille (n, len(annees)) de la
+            variable nom, pour nom dans "T", "P", "A", "S", "RNV", "REV",
+            "Depenses", "PIB" et "PensionBrut".
+        quantiles : dict
+            quantiles[nom] est le tableau de taille
+            (len(niveaux), len(annees)) des quantiles de la variable nom.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> n = 1000
+        >>> nombre_annees = len(simulateur.annees_futures)
+        >>> bruit = np.random.normal(0.0, 0.1, (n, nombre_annees))
+        >>> croissance = np.clip(1.3 + np.cumsum(bruit, axis=1), 1.0, 1.8)
+        >>> chomage = np.full((n, nombre_annees), 7.0)
+        >>> resultat, quantiles = simulateur.pilotageStochastique(
+        ...     croissance, chomage, "pilotageParSoldePensionAge",
+        ...     Scible=0.0, Acible=63.0
+        ... )
+        >>> mediane = quantiles["P"][2]
+        """
+        if tailleBloc < 1:
+            raise ValueError(
+                "La taille de bloc doit être positive : %s" % (tailleBloc)
+            )
+        if niveaux is None:
+            niveaux = [0.05, 0.25, 0.5, 0.75, 0.95]
+        croissance = self._genereTaux(
+            croissance, self.scenarios_croissance[self.scenario_central]
+        )
+        chomage = self._genereTaux(
+            chomage, self.scenarios_chomage[self.scenario_central]
+        )
+        croissance, chomage = np.broadcast_arrays(croissance, chomage)
+        n = croissance.shape[0]
+        cibles = [Scible, Pcible, Acible, Tcible, Dcible, RNVcible, REVcible]
+        resultat = dict()
+        for debut in range(0, n, tailleBloc):
+            fin = min(n, debut + tailleBloc)
+            cibles_bloc = []
+            for cible in cibles:
+                if isinstance(cible, np.ndarray) and cible.ndim >= 2:
+                    if cible.shape[0] == n:
+                        cible = cible[debut:fin]
+                cibles_bloc.append(cible)
+            bloc = self.pilotageConjonctures(
+                croissance[debut:fin],
+                chomage[debut:fin],
+                methode,
+                *cibles_bloc
+            )
+            for nom in bloc:
+                if nom not in resultat:
+                    resultat[nom] = np.empty((n,) + bloc[nom].shape[1:])
+                resultat[nom][debut:fin] = bloc[nom]
+        quantiles = dict()
+        for nom in resultat:
+            quantiles[nom] = np.quantile(resultat[nom], niveaux, axis=0)
+        return resultat, quantiles
+
+    def _decritPilotage(self, methode):
+        """
+        Retourne le noyau vectorisé d'une méthode de pilotage.
+
+        Parameters
+        ----------
+        methode : str or list of str
+            Le nom de la méthode de pilotage, ou la liste des noms des
+            trois variables imposées (voir pilotageParCibles).
+
+        Returns
+        -------
+        noyau : function
+            Le noyau vectorisé du pilotage.
+        noms : list of str
+            Les noms des variables imposées, dans l'ordre des arguments
+            du noyau.
+        """
+        if methode in ["pilotageCOR", "pilotageParPensionAgeCotisations"]:
+            noyau, noms = self._noyau_fixant_Ps_As_Ts, ["P", "A", "T"]
+        elif methode == "pilotageParSoldePensionAge":
+            noyau, noms = self._noyau_fixant_Ss_Ps_As, ["S", "P", "A"]
+        elif methode == "pilotageParSoldePensionCotisations":
+            noyau, noms = self._noyau_fixant_Ss_Ps_Ts, ["S", "P", "T"]
+        elif methode == "pilotageParSoldeAgeCotisations":
+            noyau, noms = self._noyau_fixant_Ss_As_Ts, ["S", "A", "T"]
+        elif methode == "pilotageParSoldeAgeDepenses":
+            noyau, noms = self._noyau_fixant_Ss_As_Ds, ["S", "A", "Depenses"]
+        elif methode == "pilotageParSoldePensionDepenses":
+            noyau, noms = self._noyau_fixant_Ss_Ps_Ds, ["S", "P", "Depenses"]
+        elif methode == "pilotageParPensionCotisationsDepenses":
+            noyau, noms = self._noyau_fixant_Ps_Ts_Ds, ["P", "T", "Depenses"]
+        elif methode == "pilotageParAgeCotisationsDepenses":
+            noyau, noms = self._noyau_fixant_As_Ts_Ds, ["A", "T", "Depenses"]
+        elif methode == "pilotageParAgeEtNiveauDeVie":
+            noyau, noms = self._noyau_fixant_As_RNV_S, ["A", "RNV", "S"]
+        elif methode == "pilotageParNiveauDeVieEtCotisations":
+            noyau, noms = self._noyau_fixant_Ts_RNV_S, ["T", "RNV", "S"]
+        elif methode == "pilotageParSoldePensionDuree":
+            noyau, noms = self._noyau_fixant_Ss_Ps_REV, ["S", "P", "REV"]
+        elif methode == "pilotageParSoldeCotisationsDuree":
+            noyau, noms = self._noyau_fixant_Ss_Ts_REV, ["S", "T", "REV"]
+        elif methode == "pilotageParSoldeDepensesDuree":
+            noyau = self._noyau_fixant_Ss_Ds_REV
+            noms = ["S", "Depenses", "REV"]
+        elif methode == "pilotageParPensionCotisationsDuree":
+            noyau, noms = self._noyau_fixant_Ps_Ts_REV, ["P", "T", "REV"]
+        elif methode == "pilotageParCotisationsDepensesDuree":
+            noyau = self._noyau_fixant_Ts_Ds_REV
+            noms = ["T", "Depenses", "REV"]
+        elif isinstance(methode, (list, tuple)):
+            noyau, noms = self._construitNoyau(methode), list(methode)
+        else:
+            raise TypeError("Mauvaise valeur pour la méthode : %s" % (methode))
+        return noyau, noms
+
+    def _genereTableau(self, nom, valeur, base):
+        """
+        Génère le tableau d'une variable imposée à un pilotage.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la variable.
+        valeur : float or ndarray
+            La valeur imposée (voir pilotageConjonctures).
+        base : ndarray
+            La valeur de la variable dans la conjoncture, de taille
+            (n, len(annees)).
+
+        Returns
+        -------
+        tableau : ndarray
+            Le tableau de la variable, dont la dernière dimension
+            est celle des années.
+        """
+        if valeur is None:
+            return base
+        if isinstance(valeur, Mapping):
+            raise TypeError(
+                "Une trajectoire par scénario ne s'applique pas à une "
+                "conjoncture quelconque : %s" % (nom)
+            )
+        valeur = np.asarray(valeur, dtype=float)
+        if valeur.ndim == 0 or valeur.shape[-1] in [
+            1,
+            len(self.annees_futures),
+        ]:
+            i0 = self.annees.index(self.annee_courante)
+            forme = np.broadcast_shapes(base.shape[:-1], valeur.shape[:-1])
+            tableau = np.array(np.broadcast_to(base, forme + base.shape[-1:]))
+            tableau[..., i0:] = valeur
+        elif valeur.shape[-1] == len(self.annees):
+            tableau = valeur
+        else:
+            raise ValueError(
+                "Mauvaise taille pour la cible %s : %s" % (nom, valeur.shape)
+            )
+        return tableau
+
+    def _calcule_fixant_Ss_Ps_As(self, Ss, Ps, As):
+        """
+        Calcul à solde, pension et âge définis.
+
+        Parameters
+        ----------
+        Ss : dict
+            Le solde financier en % de PIB.
+        Ps : dict
+            Le montant des pensions par rapport aux salaires.
+        As : dict
+            L'âge de départ à la retraite.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_Ps_As, ["S", "P", "A"], [Ss, Ps, As]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_Ss_Ps_Ts(self, Ss, Ps, Ts):
+        """
+        Calcul à solde, pension et cotisations définis
+
+        Parameters
+        ----------
+        Ss : dict
+            Le solde financier en % de PIB.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        Ts : dict
+            Le taux de cotisations.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_Ps_Ts, ["S", "P", "T"], [Ss, Ps, Ts]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_Ss_As_Ts(self, Ss, As, Ts):
+        """
+        Calcul à solde, âge et cotisations définis
+
+        Parameters
+        ----------
+        Ss : dict
+            Le solde financier en % de PIB.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        Ts : dict
+            Le taux de cotisations.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_As_Ts, ["S", "A", "T"], [Ss, As, Ts]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_Ss_As_Ds(self, Ss, As, Ds):
+        """
+        Calcul à solde, âge et dépenses définis
+
+        Parameters
+        ----------
+        Ss : dict
+            Le solde financier en % de PIB.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        Ds : dict
+            Le montant des dépenses de retraites en % de PIB.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_As_Ds, ["S", "A", "Depenses"], [Ss, As, Ds]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_Ss_Ps_Ds(self, Ss, Ps, Ds):
+        """
+        Calcul à solde, pension et dépenses définis
+
+        Parameters
+        ----------
+        Ss : dict
+            Le solde financier en % de PIB.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        Ds : dict
+            Le montant des dépenses de retraites en % de PIB.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le montant des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ss_Ps_Ds, ["S", "P", "Depenses"], [Ss, Ps, Ds]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_Ps_Ts_Ds(self, Ps, Ts, Ds):
+        """
+        Calcul à pension, cotisations et dépenses définis
+
+        Parameters
+        ----------
+        Ps : dict
+            Le montant des pensions par rapport aux salaires.
+        Ts : dict
+            Le taux de cotisations.
+        Ds : dict
+            Le montant des dépenses de retraites en % de PIB.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le montant des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ps_Ts_Ds, ["P", "T", "Depenses"], [Ps, Ts, Ds]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_As_Ts_Ds(self, As, Ts, Ds):
+        """
+        Calcul à âge, cotisations et dépenses définis
+
+        Parameters
+        ----------
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        Ts : dict
+            Le taux de cotisations.
+        Ds : dict
+            Le montant des dépenses de retraites en % de PIB.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_As_Ts_Ds, ["A", "T", "Depenses"], [As, Ts, Ds]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_As_RNV_S(self, As, RNVs, Ss):
+        """
+        Pilotage 1 : calcul à âge et niveau de vie défini
+
+        Parameters
+        ----------
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        RNVs : dict
+            Le niveau de vie des retraités par rapport à l'ensemble
+            de la population
+        Ss : dict
+            Le solde financier en % de PIB.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_As_RNV_S, ["A", "RNV", "S"], [As, RNVs, Ss]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_Ts_RNV_S(self, Ts, RNVs, Ss):
+        """
+        Pilotage 3 : calcul à cotisations et niveau de vie défini
+
+        Parameters
+        ----------
+        Ts : dict
+            Le taux de cotisations.
+        RNVs : dict
+            Le niveau de vie des retraités par rapport à l'ensemble
+            de la population
+        Ss : dict
+            Le solde financier en % de PIB.
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_Ts_RNV_S, ["T", "RNV", "S"], [Ts, RNVs, Ss]
+        )
+        return Ts, Ps, As
+
+    def _calcule_fixant_As_Ts_S(self, As, Ts, Ss):
+        """
+        Pilotage 4 : calcul à cotisations et âge définis
+
+        Parameters
+        ----------
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        Ts : dict
+            Le taux de cotisations.
         Ss : dict
             Le solde financier en % de PIB.
-        As : dict
+
+        Returns
+        -------
+        Ts : dict
+            Le taux de cotisations.
+        Ps : dict
+            Le niveau des pensions par rapport aux salaires.
+        As : dict
+            L'âge effectif moyen de départ à la retraite.
+        """
+        Ts, Ps, As = self._calculeFixant(
+            self._noyau_fixant_As_Ts_S, ["A", "T", "S"], [As, Ts, Ss]
+        )
+        return Ts, Ps, As
+
+    def _getSortiesCOR(self):
+        """
+        Retourne les leviers et les sorties des scénarios du COR.
+
+        Les sorties sont calculées au premier appel, puis conservées :
+        elles restent valides car les trajectoires du COR sont en
+        lecture seule.
+        Elles fournissent les années passées des pilotages dont les
+        leviers passés sont ceux du COR : seules les années futures
+        sont alors calculées.
+
+        Returns
+        -------
+        sorties : dict
+            sorties[nom] est le tableau de taille
+            (len(scenarios), len(annees)) de la variable nom, pour nom
+            dans "T", "P", "A", "S", "RNV", "REV", "Depenses", "PIB" et
+            "PensionBrut". Les tableaux sont protégés en écriture.
+        """
+        if self._sorties_COR is None:
+            conjoncture = self._getConjonctureCOR()
+            T, P, A = [self._versTableau(v) for v in [self.T, self.P, self.A]]
+            S, RNV, REV, Depenses = self._noyau_S_RNV_REV(conjoncture, T, P, A)
+            sorties = {
+                "T": T,
+                "P": P,
+                "A": A,
+                "S": S,
+                "RNV": RNV,
+                "REV": REV,
+                "Depenses": Depenses,
+                "PIB": conjoncture["PIB"],
+                "PensionBrut": self._noyau_PensionBrut(conjoncture, A),
+            }
+            for nom in sorties:
+                sorties[nom].flags.writeable = False
+            self._sorties_COR = sorties
+        return self._sorties_COR
+
+    def _noyau_fixant_Ps_As_Ts(self, c, Ps, As, Ts):
+        """
+        Noyau vectorisé du calcul à pension, âge et cotisations définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires.
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+        Ts : ndarray
+            Le taux de cotisations.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ss_Ps_As(self, c, Ss, Ps, As):
+        """
+        Noyau vectorisé du calcul à solde, pension et âge définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires.
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        K = self._calcule_K(c, As)
+        Ts = Ss / c["B"] + K * (Ps + c["dP"])
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ss_Ps_Ts(self, c, Ss, Ps, Ts):
+        """
+        Noyau vectorisé du calcul à solde, pension et cotisations définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires.
+        Ts : ndarray
+            Le taux de cotisations.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        K = (Ts - Ss / c["B"]) / (Ps + c["dP"])
+        As = self._calcule_A_depuis_K(c, K)
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ss_As_Ts(self, c, Ss, As, Ts):
+        """
+        Noyau vectorisé du calcul à solde, âge et cotisations définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        As : ndarray
             L'âge effectif moyen de départ à la retraite.
-        Ds : dict
-            Le montant des dépenses de retraites en % de PIB.
+        Ts : ndarray
+            Le taux de cotisations.
 
         Returns
         -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
         """
+        K = self._calcule_K(c, As)
+        Ps = (Ts - Ss / c["B"]) / K - c["dP"]
+        return Ts, Ps, As
 
-        # Calcule Ps et Ts
-        Ps, Ts = deepcopy(self.P), deepcopy(self.T)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                Ts[s][a] = (Ss[s][a] + Ds[s][a]) / self.B[s][a]
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                Ps[s][a] = (Ts[s][a] - Ss[s][a] / self.B[s][a]) / K - self.dP[
-                    s
-                ][a]
+    def _noyau_fixant_Ss_As_Ds(self, c, Ss, As, Ds):
+        """
+        Noyau vectorisé du calcul à solde, âge et dépenses définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+        Ds : ndarray
+            Le montant des dépenses de retraites en % de PIB.
 
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        Ts = (Ss + Ds) / c["B"]
+        K = self._calcule_K(c, As)
+        Ps = (Ts - Ss / c["B"]) / K - c["dP"]
         return Ts, Ps, As
 
-    def _calcule_fixant_Ss_Ps_Ds(self, Ss, Ps, Ds):
+    def _noyau_fixant_Ss_Ps_Ds(self, c, Ss, Ps, Ds):
         """
-        Calcul à solde, pension et dépenses définis
+        Noyau vectorisé du calcul à solde, pension et dépenses définis.
 
         Parameters
         ----------
-        Ss : dict
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
             Le solde financier en % de PIB.
-        Ps : dict
+        Ps : ndarray
             Le niveau des pensions par rapport aux salaires.
-        Ds : dict
+        Ds : ndarray
             Le montant des dépenses de retraites en % de PIB.
 
         Returns
         -------
-        Ts : dict
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        K = Ds / c["B"] / (Ps + c["dP"])
+        As = self._calcule_A_depuis_K(c, K)
+        Ts = (Ss + Ds) / c["B"]
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ps_Ts_Ds(self, c, Ps, Ts, Ds):
+        """
+        Noyau vectorisé du calcul à pension, cotisations et dépenses définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires.
+        Ts : ndarray
             Le taux de cotisations.
-        Ps : dict
-            Le montant des pensions par rapport aux salaires.
-        As : dict
+        Ds : ndarray
+            Le montant des dépenses de retraites en % de PIB.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        K = Ds / c["B"] / (Ps + c["dP"])
+        As = self._calcule_A_depuis_K(c, K)
+        return Ts, Ps, As
+
+    def _noyau_fixant_As_Ts_Ds(self, c, As, Ts, Ds):
+        """
+        Noyau vectorisé du calcul à âge, cotisations et dépenses définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        As : ndarray
             L'âge effectif moyen de départ à la retraite.
+        Ts : ndarray
+            Le taux de cotisations.
+        Ds : ndarray
+            Le montant des dépenses de retraites en % de PIB.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        K = self._calcule_K(c, As)
+        Ps = Ds / c["B"] / K - c["dP"]
+        return Ts, Ps, As
+
+    def _noyau_fixant_As_RNV_S(self, c, As, RNVs, Ss):
         """
+        Noyau vectorisé du calcul à âge, niveau de vie et solde définis.
 
-        # Calcule As et Ts
-        As, Ts = deepcopy(self.A), deepcopy(self.T)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                K = Ds[s][a] / self.B[s][a] / (Ps[s][a] + self.dP[s][a])
-                As[s][a] = (
-                    self.A[s][a]
-                    + (self.NR[s][a] - K * self.NC[s][a])
-                    / (0.5 * K + 1)
-                    / self.G[s][a]
-                )
-                Ts[s][a] = (Ss[s][a] + Ds[s][a]) / self.B[s][a]
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+        RNVs : ndarray
+            Le niveau de vie des retraités par rapport à l'ensemble
+            de la population
+        Ss : ndarray
+            Le solde financier en % de PIB.
 
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        if self._moteur == "numba":
+            return NoyauxCompiles.noyauFixantAsRNVS(c, As, RNVs, Ss)
+        K = self._calcule_K(c, As)
+        Z = (1.0 - c["TCR"]) * c["CNV"] / RNVs
+        U = 1.0 - (c["TCS"] - c["T"])
+        L = Ss / c["B"]
+        Ps = (U - L - K * c["dP"]) / (Z + K)
+        Ts = U - Ps * Z
         return Ts, Ps, As
 
-    def _calcule_fixant_Ps_Ts_Ds(self, Ps, Ts, Ds):
+    def _noyau_fixant_Ts_RNV_S(self, c, Ts, RNVs, Ss):
         """
-        Calcul à pension, cotisations et dépenses définis
+        Noyau vectorisé du calcul à cotisations, niveau de vie et solde
+        définis.
 
         Parameters
         ----------
-        Ps : dict
-            Le montant des pensions par rapport aux salaires.
-        Ts : dict
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ts : ndarray
             Le taux de cotisations.
-        Ds : dict
+        RNVs : ndarray
+            Le niveau de vie des retraités par rapport à l'ensemble
+            de la population
+        Ss : ndarray
+            Le solde financier en % de PIB.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        Ps = (
+            RNVs
+            * (1.0 - (c["TCS"] + Ts - c["T"]))
+            / c["CNV"]
+            / (1.0 - c["TCR"])
+        )
+        K = (Ts - Ss / c["B"]) / (Ps + c["dP"])
+        As = self._calcule_A_depuis_K(c, K)
+        return Ts, Ps, As
+
+    def _noyau_fixant_As_Ts_S(self, c, As, Ts, Ss):
+        """
+        Noyau vectorisé du calcul à âge, cotisations et solde définis.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+        Ts : ndarray
+            Le taux de cotisations.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        return self._noyau_fixant_Ss_As_Ts(c, Ss, As, Ts)
+
+    def _noyau_fixant_Ss_Ps_REV(self, c, Ss, Ps, REVs):
+        """
+        Noyau vectorisé du calcul à solde, pension et durée de vie
+        en retraite définis.
+
+        L'âge est obtenu en inversant la durée de vie en retraite, puis
+        le noyau _noyau_fixant_Ss_Ps_As calcule les autres leviers.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires.
+        REVs : ndarray
+            La durée de vie en retraite.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        As = self._noyau_A_depuis_REV(c, REVs)
+        Ts, Ps, As = self._noyau_fixant_Ss_Ps_As(c, Ss, Ps, As)
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ss_Ts_REV(self, c, Ss, Ts, REVs):
+        """
+        Noyau vectorisé du calcul à solde, cotisations et durée de vie
+        en retraite définis.
+
+        L'âge est obtenu en inversant la durée de vie en retraite, puis
+        le noyau _noyau_fixant_Ss_As_Ts calcule les autres leviers.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        Ts : ndarray
+            Le taux de cotisations.
+        REVs : ndarray
+            La durée de vie en retraite.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        As = self._noyau_A_depuis_REV(c, REVs)
+        Ts, Ps, As = self._noyau_fixant_Ss_As_Ts(c, Ss, As, Ts)
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ss_Ds_REV(self, c, Ss, Ds, REVs):
+        """
+        Noyau vectorisé du calcul à solde, dépenses et durée de vie
+        en retraite définis.
+
+        L'âge est obtenu en inversant la durée de vie en retraite, puis
+        le noyau _noyau_fixant_Ss_As_Ds calcule les autres leviers.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ss : ndarray
+            Le solde financier en % de PIB.
+        Ds : ndarray
             Le montant des dépenses de retraites en % de PIB.
+        REVs : ndarray
+            La durée de vie en retraite.
 
         Returns
         -------
-        Ts : dict
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        As = self._noyau_A_depuis_REV(c, REVs)
+        Ts, Ps, As = self._noyau_fixant_Ss_As_Ds(c, Ss, As, Ds)
+        return Ts, Ps, As
+
+    def _noyau_fixant_Ps_Ts_REV(self, c, Ps, Ts, REVs):
+        """
+        Noyau vectorisé du calcul à pension, cotisations et durée de vie
+        en retraite définis.
+
+        L'âge est obtenu en inversant la durée de vie en retraite, puis
+        le noyau _noyau_fixant_Ps_As_Ts calcule les autres leviers.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires.
+        Ts : ndarray
             Le taux de cotisations.
-        Ps : dict
-            Le montant des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        REVs : ndarray
+            La durée de vie en retraite.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
         """
+        As = self._noyau_A_depuis_REV(c, REVs)
+        Ts, Ps, As = self._noyau_fixant_Ps_As_Ts(c, Ps, As, Ts)
+        return Ts, Ps, As
 
-        # Calcule As
-        As = deepcopy(self.A)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                K = Ds[s][a] / self.B[s][a] / (Ps[s][a] + self.dP[s][a])
-                As[s][a] = (
-                    self.A[s][a]
-                    + (self.NR[s][a] - K * self.NC[s][a])
-                    / (0.5 * K + 1)
-                    / self.G[s][a]
+    def _noyau_fixant_Ts_Ds_REV(self, c, Ts, Ds, REVs):
+        """
+        Noyau vectorisé du calcul à cotisations, dépenses et durée de vie
+        en retraite définis.
+
+        L'âge est obtenu en inversant la durée de vie en retraite, puis
+        le noyau _noyau_fixant_As_Ts_Ds calcule les autres leviers.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        Ts : ndarray
+            Le taux de cotisations.
+        Ds : ndarray
+            Le montant des dépenses de retraites en % de PIB.
+        REVs : ndarray
+            La durée de vie en retraite.
+
+        Returns
+        -------
+        Ts, Ps, As : ndarray
+            Le taux de cotisations, le niveau des pensions et l'âge.
+        """
+        As = self._noyau_A_depuis_REV(c, REVs)
+        Ts, Ps, As = self._noyau_fixant_As_Ts_Ds(c, As, Ts, Ds)
+        return Ts, Ps, As
+
+    def _construitNoyau(self, noms):
+        """
+        Construit le noyau vectorisé d'un pilotage quelconque.
+
+        Les leviers T, P et A et les sorties S, Depenses, RNV et REV
+        sont liés par les relations suivantes, pour chaque année :
+
+        * REV est une fonction de A (voir _noyau_REV), et K, le
+          rapport entre retraités et cotisants, est une fonction de A
+          (voir _calcule_K) ;
+        * Depenses = B * K * (P + dP) ;
+        * S = B * T - Depenses ;
+        * RNV * (U - T) = (1 - TCR) * CNV * P, où U = 1 - (TCS - T_COR).
+
+        Pour trois variables imposées, le noyau résout successivement
+        chaque relation dont une seule variable est inconnue.
+        Le seul cas où aucune relation ne peut être résolue seule,
+        avec A, S et RNV imposés, est résolu explicitement.
+        Le plan de résolution est construit une seule fois pour chaque
+        liste de variables imposées, puis conservé.
+
+        Parameters
+        ----------
+        noms : list of str
+            Les noms des trois variables imposées, parmi "S", "P", "A",
+            "T", "Depenses", "RNV" et "REV".
+
+        Returns
+        -------
+        noyau : function
+            Le noyau vectorisé : noyau(c, X, Y, Z) retourne les leviers
+            T, P et A, où X, Y et Z sont les tableaux des variables
+            imposées, dans l'ordre de noms.
+        """
+        cle = tuple(noms)
+        if cle in self._noyaux:
+            return self._noyaux[cle]
+        variables = ["S", "P", "A", "T", "Depenses", "RNV", "REV"]
+        for nom in noms:
+            if nom not in variables:
+                raise ValueError("Mauvaise valeur pour le nom : %s" % (nom))
+        if len(set(noms)) != 3 or len(noms) != 3:
+            raise ValueError(
+                "Il faut imposer trois variables différentes : %s" % (noms,)
+            )
+        if "A" in noms and "REV" in noms:
+            raise ValueError("A et REV ne peuvent pas être imposés ensemble")
+        connues = set(noms)
+        plan = []
+        if "REV" in connues:
+            plan.append(("A", "REV"))
+            connues.add("A")
+        if "A" in connues:
+            plan.append(("K", "A"))
+            connues.add("K")
+        relations = [
+            {"Depenses", "K", "P"},
+            {"S", "T", "Depenses"},
+            {"RNV", "T", "P"},
+        ]
+        for relation in relations:
+            if relation <= connues:
+                raise ValueError(
+                    "Les variables %s sont liées : elles ne peuvent pas "
+                    "être imposées ensemble" % (sorted(relation))
                 )
+        if {"K", "S", "RNV"} <= connues:
+            plan.append(("T", "K_S_RNV"))
+            connues |= {"P", "T"}
+        resolue = True
+        while resolue:
+            resolue = False
+            for i, relation in enumerate(relations):
+                inconnues = relation - connues
+                if len(inconnues) == 1:
+                    (nom,) = inconnues
+                    plan.append((nom, i))
+                    connues.add(nom)
+                    resolue = True
+        if "A" not in connues:
+            plan.append(("A", "K"))
+
+        def noyau(c, *tableaux):
+            v = dict(zip(noms, tableaux))
+            for nom, relation in plan:
+                self._resoutEtape(c, v, nom, relation)
+            return v["T"], v["P"], v["A"]
+
+        self._noyaux[cle] = noyau
+        return noyau
+
+    def _resoutEtape(self, c, v, nom, relation):
+        """
+        Calcule une variable d'un pilotage quelconque.
+
+        Voir _construitNoyau.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        v : dict
+            v[nom] est le tableau de la variable nom, s'il est connu.
+            Le tableau calculé est ajouté à v.
+        nom : str
+            Le nom de la variable calculée.
+        relation : int or str
+            L'indice de la relation (0 pour les dépenses, 1 pour le solde
+            et 2 pour le niveau de vie) ou le nom de la variable dont
+            dépend la variable calculée.
+        """
+        U = 1.0 - (c["TCS"] - c["T"])
+        W = (1.0 - c["TCR"]) * c["CNV"]
+        if relation == "REV":
+            v["A"] = self._noyau_A_depuis_REV(c, v["REV"])
+        elif relation == "A":
+            v["K"] = self._calcule_K(c, v["A"])
+        elif relation == "K":
+            v["A"] = self._calcule_A_depuis_K(c, v["K"])
+        elif relation == "K_S_RNV":
+            Z = W / v["RNV"]
+            L = v["S"] / c["B"]
+            v["P"] = (U - L - v["K"] * c["dP"]) / (Z + v["K"])
+            v["T"] = U - v["P"] * Z
+        elif relation == 0 and nom == "Depenses":
+            v["Depenses"] = c["B"] * v["K"] * (v["P"] + c["dP"])
+        elif relation == 0 and nom == "K":
+            v["K"] = v["Depenses"] / c["B"] / (v["P"] + c["dP"])
+        elif relation == 0:
+            v["P"] = v["Depenses"] / c["B"] / v["K"] - c["dP"]
+        elif relation == 1 and nom == "S":
+            v["S"] = c["B"] * v["T"] - v["Depenses"]
+        elif relation == 1 and nom == "T":
+            v["T"] = (v["S"] + v["Depenses"]) / c["B"]
+        elif relation == 1:
+            v["Depenses"] = c["B"] * v["T"] - v["S"]
+        elif nom == "RNV":
+            v["RNV"] = W * v["P"] / (U - v["T"])
+        elif nom == "P":
+            v["P"] = v["RNV"] * (U - v["T"]) / W
+        else:
+            v["T"] = U - W * v["P"] / v["RNV"]
+        return None
+
+    def _calcule_K(self, c, As):
+        """
+        Calcule le rapport entre retraités et cotisants.
+
+        Si l'âge de départ As est plus élevé que celui du COR,
+        le nombre de retraités est diminué de G x (As - A) et le nombre
+        de cotisants est augmenté de la moitié de cet effectif.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+
+        Returns
+        -------
+        K : ndarray
+            Le rapport entre le nombre de retraités et le nombre de
+            cotisants.
+        """
+        GdA = c["G"] * (As - c["A"])
+        K = (c["NR"] - GdA) / (c["NC"] + 0.5 * GdA)
+        return K
+
+    def _calcule_A_depuis_K(self, c, K):
+        """
+        Calcule l'âge de départ correspondant à un rapport K donné.
+
+        C'est la fonction réciproque de la méthode _calcule_K.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        K : ndarray
+            Le rapport entre le nombre de retraités et le nombre de
+            cotisants.
+
+        Returns
+        -------
+        As : ndarray
+            L'âge effectif moyen de départ à la retraite.
+        """
+        As = c["A"] + (c["NR"] - K * c["NC"]) / (0.5 * K + 1.0) / c["G"]
+        return As
+
+    def _noyau_S_RNV_REV(self, c, Ts, Ps, As):
+        """
+        Noyau vectorisé du calcul des sorties du modèle.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom
+            et c["annees"] est le tableau des années correspondantes.
+        Ts : ndarray
+            Le taux de cotisations
+        Ps : ndarray
+            Le niveau des pensions par rapport aux salaires
+        As : ndarray
+            L'âge moyen de départ à la retraite
+
+        Returns
+        -------
+        S : ndarray
+            Le solde financier en % de PIB.
+        RNV : ndarray
+            Le niveau de vie des retraités.
+        REV : ndarray
+            La proportion d'âge de vie en retraite.
+        Depenses : ndarray
+            Le montant des dépenses.
+        """
+        if self._moteur == "numba":
+            return NoyauxCompiles.noyauSorties(
+                c, Ts, Ps, As, self.annees_EV[0]
+            )
+        K = self._calcule_K(c, As)
+        U = 1.0 - (c["TCS"] - c["T"])
+        Depenses = c["B"] * K * (Ps + c["dP"])
+        S = c["B"] * (Ts - K * (Ps + c["dP"]))
+        RNV = Ps * (1.0 - c["TCR"]) / (U - Ts) * c["CNV"]
+        REV = self._noyau_REV(c, As)
+        return S, RNV, REV, Depenses
+
+    def _noyau_REV(self, c, As):
+        """
+        Noyau vectorisé du calcul de la proportion de vie en retraite.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c["EV"] est le tableau de l'espérance de vie
+            par génération et c["annees"] est le tableau des années.
+        As : ndarray
+            L'âge moyen de départ à la retraite
+
+        Returns
+        -------
+        REV : ndarray
+            La proportion d'âge de vie en retraite.
+        """
+        annee_naissance = np.round(c["annees"] + 0.5 - As).astype(int)
+        indices = annee_naissance - self.annees_EV[0]
+        if np.any(indices < 0) or np.any(indices >= len(self.annees_EV)):
+            raise ValueError(
+                "Année de naissance hors des données d'espérance de vie"
+            )
+        forme = indices.shape[:-1] + c["EV"].shape[-1:]
+        EV = np.broadcast_to(c["EV"], forme)
+        age_mort = 60.0 + np.take_along_axis(EV, indices, axis=-1)
+        REV = (age_mort - As) / age_mort
+        return REV
+
+    def _calculeTableREV(self, EV):
+        """
+        Calcule la table de l'âge de décès par âge de départ entier.
+
+        Pour un âge de départ As dans l'intervalle ]k, k + 1[, où k est
+        un entier, l'année de naissance est a - k et la proportion de vie
+        en retraite est REV = 1 - As / M, où M = 60 + EV[a - k] est
+        l'âge de décès.
+        La proportion de vie en retraite est donc affine par morceaux en
+        fonction de l'âge, avec un saut à chaque âge entier, quand la
+        génération change.
+        La table contient M pour chaque âge entier de l'attribut
+        _ages_REV et chaque année.
+
+        Parameters
+        ----------
+        EV : ndarray
+            L'espérance de vie, de taille (n, len(annees_EV)).
+
+        Returns
+        -------
+        age_mort : ndarray
+            Un tableau de taille (len(_ages_REV), n, len(annees)).
+            Les générations en dehors de annees_EV ont pour valeur nan.
+        """
+        annees = np.array(self.annees)
+        indices = (
+            annees[np.newaxis, :]
+            - self._ages_REV[:, np.newaxis]
+            - self.annees_EV[0]
+        )
+        valides = (indices >= 0) & (indices < len(self.annees_EV))
+        indices = np.clip(indices, 0, len(self.annees_EV) - 1)
+        age_mort = 60.0 + np.take(EV, indices, axis=-1)
+        age_mort = np.where(valides, age_mort, np.nan)
+        age_mort = np.moveaxis(age_mort, -2, 0)
+        return age_mort
+
+    def _noyau_A_depuis_REV(self, c, REV):
+        """
+        Noyau vectorisé du calcul de l'âge en fonction de REV.
+
+        C'est l'inverse exact du noyau _noyau_REV, dans les bornes de
+        l'attribut rechercheAgeBornes.
+        Sur chaque morceau ]k, k + 1[, l'âge est As = (1 - REV) * M.
+        L'âge retenu est sur le dernier morceau dont la valeur à gauche
+        est supérieure ou égale à REV.
+        Si REV tombe dans le saut entre deux morceaux, l'âge est l'âge
+        entier du saut, comme le donnerait une recherche de zéro par
+        dichotomie.
+
+        Parameters
+        ----------
+        c : dict
+            La conjoncture : c["age_mort_REV"] est la table de l'âge de
+            décès (voir _calculeTableREV).
+        REV : ndarray
+            La proportion de vie en retraite.
 
-        return Ts, Ps, As
+        Returns
+        -------
+        As : ndarray
+            L'âge moyen de départ à la retraite.
+        """
+        borne_min, borne_max = self.rechercheAgeBornes
+        k_min = int(np.floor(borne_min))
+        k_max = int(np.ceil(borne_max))
+        if k_min < self._ages_REV[0] or k_max > self._ages_REV[-1] + 1:
+            raise ValueError(
+                "Mauvaise valeur pour les bornes de l'âge : %s"
+                % (self.rechercheAgeBornes)
+            )
+        tranche = slice(k_min - self._ages_REV[0], k_max - self._ages_REV[0])
+        ages = self._ages_REV[tranche]
+        age_mort = c["age_mort_REV"][tranche]
+        REV = np.asarray(REV, dtype=float)
+        candidats = (1.0 - REV) * age_mort
+        ages = ages.reshape((-1,) + (1,) * (candidats.ndim - 1))
+        with np.errstate(invalid="ignore"):
+            valides = candidats >= ages
+        if not np.all(np.any(valides, axis=0)):
+            raise ValueError(
+                "La proportion de vie en retraite est hors des bornes"
+            )
+        # Dernier morceau valide
+        dernier = len(ages) - 1 - np.argmax(valides[::-1], axis=0)
+        As = np.take_along_axis(candidats, dernier[np.newaxis], axis=0)[0]
+        # Saut vers le morceau suivant, sauf après le dernier morceau
+        As = np.where(
+            dernier < len(ages) - 1,
+            np.minimum(As, ages.ravel()[dernier] + 1.0),
+            As,
+        )
+        if np.any(As < borne_min) or np.any(As > borne_max):
+            raise ValueError(
+                "La proportion de vie en retraite est hors des bornes"
+            )
+        return As
 
-    def _calcule_fixant_As_Ts_Ds(self, As, Ts, Ds):
+    def _noyau_PensionBrut(self, c, As):
         """
-        Calcul à âge, cotisations et dépenses définis
+        Noyau vectorisé du calcul de la pension annuelle de droit direct.
 
         Parameters
         ----------
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
-        Ts : dict
-            Le taux de cotisations.
-        Ds : dict
-            Le montant des dépenses de retraites en % de PIB.
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom.
+        As : ndarray
+            L'âge de départ à la retraite modifié par l'utilisateur
 
         Returns
         -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        pensionBrut : ndarray
+            La pension annuelle brut (kEUR).
         """
+        GdA = c["G"] * (As - c["A"])
+        pensionBrut = (
+            c["B"] * c["P"] * c["PIB"] * 1000.0 / (c["NC"] + 0.5 * GdA)
+        )
+        return pensionBrut
 
-        # Calcule Ps
-        Ps = deepcopy(self.P)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                Ps[s][a] = Ds[s][a] / self.B[s][a] / K - self.dP[s][a]
-
-        return Ts, Ps, As
-
-    def _calcule_fixant_As_RNV_S(self, As, RNVs, Ss):
+    def _calculeFixant(self, noyau, noms, trajectoires):
         """
-        Pilotage 1 : calcul à âge et niveau de vie défini
+        Applique un noyau de pilotage aux trajectoires du COR.
+
+        Les trajectoires imposées sont retournées telles quelles.
+        Les trajectoires calculées sont celles du COR pour les années
+        passées et celles du noyau pour les années futures.
 
         Parameters
         ----------
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
-        RNVs : dict
-            Le niveau de vie des retraités par rapport à l'ensemble
-            de la population
-        Ss : dict
-            Le solde financier en % de PIB.
+        noyau : function
+            Le noyau vectorisé du pilotage.
+        noms : list of str
+            Les noms des trois variables imposées, dans l'ordre des
+            arguments du noyau.
+        trajectoires : list of dict
+            Les trois trajectoires imposées.
 
         Returns
         -------
@@ -1210,156 +3662,154 @@ class SimulateurRetraites:
         As : dict
             L'âge effectif moyen de départ à la retraite.
         """
-
-        # Calcule Ps et Ts
-        Ts, Ps = deepcopy(self.T), deepcopy(self.P)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                Z = (1.0 - self.TCR[s][a]) * self.CNV[s][a] / RNVs[s][a]
-                U = 1.0 - (self.TCS[s][a] - self.T[s][a])
-                L = Ss[s][a] / self.B[s][a]
-                Ps[s][a] = (U - L - K * self.dP[s][a]) / (Z + K)
-                Ts[s][a] = U - Ps[s][a] * Z
-
+        tableaux = [self._versTableau(v) for v in trajectoires]
+        conjoncture = self._getConjonctureCOR()
+        leviers = self._pilote(conjoncture, noyau, noms, tableaux)
+        resultats = []
+        for nom, tableau in zip(["T", "P", "A"], leviers):
+            if nom in noms:
+                resultats.append(trajectoires[noms.index(nom)])
+            else:
+                resultats.append(self._versTrajectoire(tableau))
+        Ts, Ps, As = resultats
         return Ts, Ps, As
 
-    def _calcule_fixant_Ts_RNV_S(self, Ts, RNVs, Ss):
+    def _pilote(self, c, noyau, noms, tableaux):
         """
-        Pilotage 3 : calcul à cotisations et niveau de vie défini
+        Applique un noyau de pilotage aux années futures d'une conjoncture.
 
         Parameters
         ----------
-        Ts : dict
-            Le taux de cotisations.
-        RNVs : dict
-            Le niveau de vie des retraités par rapport à l'ensemble
-            de la population
-        Ss : dict
-            Le solde financier en % de PIB.
+        c : dict
+            La conjoncture : c[nom] est le tableau de la variable nom,
+            pour toutes les années.
+        noyau : function
+            Le noyau vectorisé du pilotage.
+        noms : list of str
+            Les noms des trois variables imposées, dans l'ordre des
+            arguments du noyau.
+        tableaux : list of ndarray
+            Les trois variables imposées, pour toutes les années.
 
         Returns
         -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        T, P, A : ndarray
+            Les leviers pour toutes les années.
+            Pour les années passées, un levier calculé est celui
+            de la conjoncture.
         """
-
-        # Calcule Ps et As
-        Ps, As = deepcopy(self.P), deepcopy(self.A)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                Ps[s][a] = (
-                    RNVs[s][a]
-                    * (1.0 - (self.TCS[s][a] + Ts[s][a] - self.T[s][a]))
-                    / self.CNV[s][a]
-                    / (1.0 - self.TCR[s][a])
-                )
-                K = (Ts[s][a] - Ss[s][a] / self.B[s][a]) / (
-                    Ps[s][a] + self.dP[s][a]
-                )
-                As[s][a] = (
-                    self.A[s][a]
-                    + (self.NR[s][a] - K * self.NC[s][a])
-                    / (0.5 * K + 1.0)
-                    / self.G[s][a]
+        i0 = self.annees.index(self.annee_courante)
+        futur = self._fenetreFuture(c)
+        leviers_futurs = noyau(futur, *[t[..., i0:] for t in tableaux])
+        forme = np.broadcast_shapes(c["T"].shape, *[t.shape for t in tableaux])
+        leviers = []
+        for nom, levier_futur in zip(["T", "P", "A"], leviers_futurs):
+            if nom in noms:
+                levier = np.array(
+                    np.broadcast_to(tableaux[noms.index(nom)], forme)
                 )
+            else:
+                levier = np.array(np.broadcast_to(c[nom], forme))
+                levier[..., i0:] = levier_futur
+            leviers.append(levier)
+        return leviers
 
-        return Ts, Ps, As
-
-    def _calcule_fixant_As_Ts_S(self, As, Ts, Ss):
+    def _fenetreFuture(self, c):
         """
-        Pilotage 4 : calcul à cotisations et âge définis
+        Restreint une conjoncture aux années futures.
 
         Parameters
         ----------
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
-        Ts : dict
-            Le taux de cotisations.
-        Ss : dict
-            Le solde financier en % de PIB.
+        c : dict
+            La conjoncture, pour toutes les années.
 
         Returns
         -------
-        Ts : dict
-            Le taux de cotisations.
-        Ps : dict
-            Le niveau des pensions par rapport aux salaires.
-        As : dict
-            L'âge effectif moyen de départ à la retraite.
+        futur : dict
+            La conjoncture restreinte aux années futures.
+            L'espérance de vie, indexée par génération, est inchangée.
         """
+        i0 = self.annees.index(self.annee_courante)
+        futur = dict()
+        for nom in c:
+            if nom == "EV":
+                futur[nom] = c[nom]
+            else:
+                futur[nom] = c[nom][..., i0:]
+        return futur
 
-        # Calcule Ps
-        Ps = deepcopy(self.P)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                Ps[s][a] = (Ts[s][a] - Ss[s][a] / self.B[s][a]) / K - self.dP[
-                    s
-                ][a]
-
-        return Ts, Ps, As
-
-    def _calcule_S_RNV_REV(self, Ts, Ps, As):
+    def _versTableau(self, trajectoire):
         """
-        Pilotage 0 : statu quo du COR.
-
-        Calcule les sorties du modèle de retraite en fonction des leviers.
+        Convertit une trajectoire en tableau.
 
         Parameters
         ----------
-        Ts : dict
-            Le taux de cotisations
-        P : dict
-            Le niveau des pensions par rapport aux salaires
-        A : dict
-            L'âge moyen de départ à la retraite
+        trajectoire : dict
+            Une trajectoire : trajectoire[s][a] est la valeur du
+            scénario s à l'année a.
 
         Returns
         -------
-        S : dict
-            Le solde financier en % de PIB.
-        RNV : dict
-            Le niveau de vie des retraités.
-        REV : dict
-            La proportion d'âge de vie en retraite.
-        Depenses : dict
-            Le montant des dépenses.
+        tableau : ndarray
+            Un tableau de taille (len(scenarios), len(annees)).
         """
+        if (
+            isinstance(trajectoire, TrajectoirePartagee)
+            and trajectoire.scenarios == list(self.scenarios)
+            and trajectoire.annees == list(self.annees)
+        ):
+            return trajectoire.getTableau()
+        tableau = np.array(
+            [[trajectoire[s][a] for a in self.annees] for s in self.scenarios],
+            dtype=float,
+        )
+        return tableau
 
-        S, RNV, REV, Depenses = dict(), dict(), dict(), dict()
-
-        for s in self.scenarios:
+    def _versTrajectoire(self, tableau):
+        """
+        Convertit un tableau en trajectoire.
 
-            S[s], RNV[s], REV[s], Depenses[s] = dict(), dict(), dict(), dict()
+        Le tableau n'est pas copié : la trajectoire partage son
+        stockage (voir TrajectoirePartagee).
 
-            for a in self.annees:
+        Parameters
+        ----------
+        tableau : ndarray
+            Un tableau de taille (len(scenarios), len(annees)).
 
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                K = (self.NR[s][a] - GdA) / (self.NC[s][a] + 0.5 * GdA)
-                U = 1.0 - (self.TCS[s][a] - self.T[s][a])
-                Depenses[s][a] = self.B[s][a] * K * (Ps[s][a] + self.dP[s][a])
-                S[s][a] = self.B[s][a] * (
-                    Ts[s][a] - K * (Ps[s][a] + self.dP[s][a])
-                )
-                RNV[s][a] = (
-                    Ps[s][a]
-                    * (1.0 - self.TCR[s][a])
-                    / (U - Ts[s][a])
-                    * self.CNV[s][a]
-                )
+        Returns
+        -------
+        trajectoire : TrajectoirePartagee
+            Une trajectoire : trajectoire[s][a] est la valeur du
+            scénario s à l'année a.
+        """
+        trajectoire = TrajectoirePartagee(self.scenarios, self.annees, tableau)
+        return trajectoire
 
-                annee_naissance = round(a + 0.5 - As[s][a])
-                age_mort = 60.0 + self.EV[s][annee_naissance]
-                REV[s][a] = (age_mort - As[s][a]) / age_mort
+    def _getConjonctureCOR(self):
+        """
+        Retourne la conjoncture des scénarios du COR.
 
-        return S, RNV, REV, Depenses
+        Returns
+        -------
+        conjoncture : dict
+            conjoncture[nom] est le tableau de taille
+            (len(scenarios), len(annees)) de la variable nom, sauf pour
+            l'espérance de vie "EV" indexée par les années de annees_EV.
+            conjoncture["annees"] est le tableau des années.
+            conjoncture["age_mort_REV"] est la table de l'âge de décès
+            (voir _calculeTableREV).
+        """
+        if self._conjoncture_COR is None:
+            conjoncture = dict()
+            for nom in self._noms_conjoncture + ["EV", "PIB"]:
+                conjoncture[nom] = self.getTableau(nom)
+            conjoncture["annees"] = np.array(self.annees)
+            conjoncture["age_mort_REV"] = self._calculeTableREV(
+                conjoncture["EV"]
+            )
+            self._conjoncture_COR = conjoncture
+        return self._conjoncture_COR
 
     def genereTrajectoire(self, nom, valeur=None):
         """
@@ -1373,6 +3823,11 @@ class SimulateurRetraites:
         * Si la valeur donnée est un dictionnaire, considère que c'est
         une trajectoire et utilise cette trajectoire.
 
+        La trajectoire retournée partage son stockage avec la
+        trajectoire du COR ou la trajectoire donnée : seuls les
+        scénarios modifiés ensuite sont copiés (voir
+        TrajectoirePartagee).
+
         Parameters
         ----------
         nom : str
@@ -1382,7 +3837,7 @@ class SimulateurRetraites:
 
         Returns
         -------
-        trajectoire : dict
+        trajectoire : TrajectoirePartagee
             Une trajectoire dans tous les scénarios et pour toutes les années :
             trajectoire[s][a] est la valeur numérique du
             scénario s à l'année a
@@ -1399,60 +3854,36 @@ class SimulateurRetraites:
         >>>                              simulateur.A[1][2020])
         """
 
-        if type(valeur) is dict:
+        if isinstance(valeur, TrajectoirePartagee):
+            # Copie à l'écriture : aucune valeur n'est copiée
+            trajectoire = valeur.copie()
+        elif isinstance(valeur, Mapping):
             # Si la valeur est un dictionnaire, on suppose que
-            # c'est une trajectoire et on le copie
-            trajectoire = deepcopy(valeur)
+            # c'est une trajectoire et on la convertit
+            trajectoire = self._versTrajectoire(self._versTableau(valeur))
         else:
             # Sinon, on suppose que c'est un flottant
-            # et on calcule la trajectoire du COR
+            # et on part de la trajectoire du COR
             if nom == "A":
-                trajectoire = deepcopy(self.A)
-            elif nom == "S":
-                (
-                    S_COR,
-                    RNV_COR,
-                    REV_COR,
-                    Depenses_COR,
-                ) = self._calcule_S_RNV_REV(self.T, self.P, self.A)
-                trajectoire = S_COR
+                tableau = self._versTableau(self.A)
             elif nom == "P":
-                trajectoire = deepcopy(self.P)
+                tableau = self._versTableau(self.P)
             elif nom == "T":
-                trajectoire = deepcopy(self.T)
-            elif nom == "RNV":
-                (
-                    S_COR,
-                    RNV_COR,
-                    REV_COR,
-                    Depenses_COR,
-                ) = self._calcule_S_RNV_REV(self.T, self.P, self.A)
-                trajectoire = RNV_COR
-            elif nom == "Depenses":
-                (
-                    S_COR,
-                    RNV_COR,
-                    REV_COR,
-                    Depenses_COR,
-                ) = self._calcule_S_RNV_REV(self.T, self.P, self.A)
-                trajectoire = Depenses_COR
-            elif nom == "REV":
-                (
-                    S_COR,
-                    RNV_COR,
-                    REV_COR,
-                    Depenses_COR,
-                ) = self._calcule_S_RNV_REV(self.T, self.P, self.A)
-                trajectoire = REV_COR
+                tableau = self._versTableau(self.T)
+            elif nom in ["S", "RNV", "Depenses", "REV"]:
+                # Tableau protégé en écriture, partagé avec le COR
+                tableau = self._getSortiesCOR()[nom]
             else:
                 raise TypeError("Mauvaise valeur pour le nom : %s" % (nom))
 
             if valeur is not None:
                 # Propage la valeur constante dans la trajectoire
                 # pour les années futures
-                for s in self.scenarios:
-                    for a in self.annees_futures:
-                        trajectoire[s][a] = valeur
+                if not tableau.flags.writeable:
+                    tableau = np.array(tableau)
+                i0 = self.annees.index(self.annee_courante)
+                tableau[:, i0:] = valeur
+            trajectoire = self._versTrajectoire(tableau)
 
         return trajectoire
 
@@ -1462,6 +3893,7 @@ class SimulateurRetraites:
         dessine_legende=False,
         scenarios_indices=None,
         dessine_annees=None,
+        figure=None,
     ):
         """
         Dessine les hypothèses de conjoncture.
@@ -1478,16 +3910,30 @@ class SimulateurRetraites:
             scenarios_indices = range(1,7))
         dessine_annees : list of int
             La liste des années à dessiner
+        figure : matplotlib.figure.Figure
+            La figure dans laquelle dessiner (par défaut, crée une
+            nouvelle figure pylab).
+
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            La figure de la conjoncture.
 
         Examples
         --------
         >>> simulateur = SimulateurRetraites()
         >>> simulateur.dessineConjoncture()
+
+        Sans utiliser l'état global de pylab :
+
+        >>> from matplotlib.figure import Figure
+        >>> figure = simulateur.dessineConjoncture(figure=Figure((10, 8)))
         """
-        pl.figure(figsize=(10, 8))
-        pl.suptitle(u"Projections du COR (hypothèses)", fontsize=16)
+        if figure is None:
+            figure = pl.figure(figsize=(10, 8))
+        figure.suptitle(u"Projections du COR (hypothèses)", fontsize=16)
         for c in range(9):
-            pl.subplot(3, 3, c + 1)
+            ax = figure.add_subplot(3, 3, c + 1)
             nom = self.liste_variables[c]
             self.dessineVariable(
                 nom,
@@ -1495,9 +3941,10 @@ class SimulateurRetraites:
                 dessine_legende=dessine_legende,
                 scenarios_indices=scenarios_indices,
                 dessine_annees=dessine_annees,
+                ax=ax,
             )
-        pl.tight_layout(rect=[0, 0.03, 1, 0.95])
-        return None
+        figure.tight_layout(rect=[0, 0.03, 1, 0.95])
+        return figure
 
     def dessineVariable(
         self,
@@ -1508,6 +3955,8 @@ class SimulateurRetraites:
         dessine_legende=False,
         scenarios_indices=None,
         dessine_annees=None,
+        ax=None,
+        nombre_max_courbes=None,
     ):
         """
         Dessine une variable donnée pour tous les scénarios.
@@ -1520,8 +3969,11 @@ class SimulateurRetraites:
         ----------
         nom : str
             Le nom de la variable
-        v : dict
-            La variable à dessiner (par défaut, en fonction du nom)
+        v : dict or ndarray
+            La variable à dessiner (par défaut, en fonction du nom).
+            Si c'est un tableau, chaque ligne est une trajectoire et
+            les trajectoires sont dessinées par une seule collection
+            de lignes.
         taille_fonte_titre : int
             La taille de la fonte du titre
             (par défaut, taille_fonte_titre=8)
@@ -1536,6 +3988,21 @@ class SimulateurRetraites:
             scenarios_indices = range(1,7))
         dessine_annees : list of int
             La liste des années à dessiner
+        ax : matplotlib.axes.Axes
+            Les axes dans lesquels dessiner (par défaut, les axes
+            courants de pylab).
+            Si les axes sont donnés, l'état global de pylab n'est pas
+            utilisé.
+        nombre_max_courbes : int
+            Si v est un tableau de plus de nombre_max_courbes
+            trajectoires, seules nombre_max_courbes trajectoires
+            régulièrement espacées sont dessinées (par défaut,
+            toutes les trajectoires sont dessinées).
+
+        Returns
+        -------
+        ax : matplotlib.axes.Axes
+            Les axes du graphique.
 
         Examples
         --------
@@ -1564,6 +4031,9 @@ class SimulateurRetraites:
             else:
                 raise TypeError("Mauvaise valeur pour le nom : %s" % (nom))
 
+        if ax is None:
+            ax = pl.gca()
+
         if scenarios_indices is None:
             scenarios_indices = self.scenarios
 
@@ -1575,24 +4045,36 @@ class SimulateurRetraites:
             else:
                 list_annees_dessin = self.annees
 
-        for s in scenarios_indices:
-            if nom == "RNV":
-                # Ce sont des % : multiplie par 100.0
-                y = [100.0 * v[s][a] for a in list_annees_dessin]
-            else:
-                y = [v[s][a] for a in list_annees_dessin]
-
+        if nom == "EV":
+            annees = self.annees_EV
+        else:
+            annees = self.annees
+        Y = OutilsDessin.tableauDessin(
+            v, scenarios_indices, annees, list_annees_dessin
+        )
+        if nom == "RNV":
+            # Ce sont des % : multiplie par 100.0
+            Y = 100.0 * Y
+        if isinstance(v, np.ndarray):
+            OutilsDessin.dessineEnsemble(
+                ax, list_annees_dessin, Y, nombre_max_courbes
+            )
+        else:
             if self.labels_is_long:
-                label_variable = self.scenarios_labels[s]
+                labels = [self.scenarios_labels[s] for s in scenarios_indices]
             else:
-                label_variable = self.scenarios_labels_courts[s]
-            pl.plot(list_annees_dessin, y, label=label_variable)
+                labels = [
+                    self.scenarios_labels_courts[s] for s in scenarios_indices
+                ]
+            lignes = ax.plot(list_annees_dessin, Y.T)
+            for ligne, label_variable in zip(lignes, labels):
+                ligne.set_label(label_variable)
 
         # titres des figures
         indice_variable = self.liste_variables.index(nom)
         titre_figure = self.liste_legendes[indice_variable]
 
-        pl.title(titre_figure, fontsize=taille_fonte_titre)
+        ax.set_title(titre_figure, fontsize=taille_fonte_titre)
 
         # Ajuste les limites de l'axe des ordonnées
         if yaxis_lim is None:
@@ -1601,11 +4083,11 @@ class SimulateurRetraites:
                 # If the variable name was found in the dictionnary
                 yaxis_lim = self.yaxis_lim[nom]
         else:
-            pl.ylim(bottom=yaxis_lim[0], top=yaxis_lim[1])
+            ax.set_ylim(bottom=yaxis_lim[0], top=yaxis_lim[1])
 
         if dessine_legende:
-            pl.legend(loc="best")
-        return None
+            ax.legend(loc="best")
+        return ax
 
     def setAfficheMessageEcriture(self, affiche_quand_ecrit):
         """
@@ -1718,7 +4200,253 @@ class SimulateurRetraites:
         """
         return self.dir_image
 
-    def sauveFigure(self, f):
+    def setMoteur(self, moteur):
+        """
+        Configure le moteur de calcul des noyaux.
+
+        Le moteur "numba" utilise les noyaux compilés du module
+        NoyauxCompiles, qui évitent les tableaux temporaires de NumPy :
+        c'est le moteur par défaut si numba est installé.
+        Le moteur "numpy" utilise les noyaux vectorisés.
+        Les résultats des deux moteurs sont identiques.
+
+        Parameters
+        ----------
+        moteur : str
+            Le moteur : "numpy" ou "numba".
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.setMoteur("numpy")
+        """
+        if moteur not in ["numpy", "numba"]:
+            raise ValueError("Mauvaise valeur pour le moteur : %s" % (moteur))
+        if moteur == "numba" and not NoyauxCompiles.estDisponible():
+            raise ValueError("Le module numba n'est pas installé")
+        self._moteur = moteur
+        return None
+
+    def getMoteur(self):
+        """
+        Retourne le moteur de calcul des noyaux.
+
+        Returns
+        -------
+        moteur : str
+            Le moteur : "numpy" ou "numba".
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> moteur = simulateur.getMoteur()
+        """
+        return self._moteur
+
+    def activeCache(self, taille=256, cache_persistant=None):
+        """
+        Active la mémorisation des résultats des pilotages.
+
+        Quand la mémorisation est active, les résultats des méthodes
+        pilotageCOR, pilotagePar... et calculeAge sont conservés dans un
+        cache LRU.
+        La clé est une empreinte du nom de la méthode, des cibles
+        normalisées (converties en flottants ou en trajectoires), de
+        l'empreinte des hypothèses (voir getEmpreinteDonnees) et des
+        paramètres du simulateur qui influencent le résultat.
+        Un appel répété avec les mêmes cibles retourne alors, sans
+        calcul, une copie du résultat mémorisé (voir
+        SimulateurAnalyse.copie) : elle ne copie aucune valeur avant sa
+        modification, qui ne modifie pas le cache.
+
+        Les méthodes pilotageConjonctures et pilotageStochastique ne sont
+        pas mémorisées.
+
+        Si un cache persistant est donné, les résultats absents du cache
+        en mémoire y sont recherchés avant d'être calculés, et les
+        résultats calculés y sont écrits : ils sont alors partagés avec
+        les autres processus qui utilisent le même fichier.
+
+        Parameters
+        ----------
+        taille : int
+            Le nombre maximal de résultats dans le cache (par défaut, 256).
+        cache_persistant : CachePersistant
+            Le cache sur disque (par défaut, pas de cache sur disque).
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> simulateur.activeCache()
+        >>> analyse = simulateur.pilotageParSoldePensionAge(Pcible=0.5)
+        >>> analyse = simulateur.pilotageParSoldePensionAge(Pcible=0.5)
+        >>> simulateur.getStatistiquesCache()
+        {'taille': 1, 'succes': 1, 'echecs': 1}
+        """
+        if taille < 1:
+            raise ValueError(
+                "La taille du cache doit être positive : %s" % (taille)
+            )
+        self._cache = OrderedDict()
+        self._cache_persistant = cache_persistant
+        self._verrou_cache = threading.Lock()
+        self.taille_cache = taille
+        self.nombre_succes = 0
+        self.nombre_echecs = 0
+        return None
+
+    def desactiveCache(self):
+        """
+        Désactive la mémorisation des résultats et vide le cache.
+
+        Examples
+        --------
+        >>> simulateur.desactiveCache()
+        """
+        self._cache = None
+        self._cache_persistant = None
+        self._verrou_cache = None
+        return None
+
+    def getStatistiquesCache(self):
+        """
+        Retourne les statistiques du cache.
+
+        Returns
+        -------
+        statistiques : dict
+            Les clés sont "taille", "succes" et "echecs".
+            Si le cache n'est pas actif, retourne None.
+        """
+        if self._cache is None:
+            return None
+        with self._verrou_cache:
+            statistiques = {
+                "taille": len(self._cache),
+                "succes": self.nombre_succes,
+                "echecs": self.nombre_echecs,
+            }
+        return statistiques
+
+    def getEmpreinteDonnees(self):
+        """
+        Retourne l'empreinte des hypothèses du simulateur.
+
+        L'empreinte est calculée au premier appel, par la fonction
+        SHA-256 appliquée au contenu JSON des hypothèses (attribut data)
+        dont les clés sont triées.
+        Un simulateur créé à partir de données partagées utilise
+        l'empreinte calculée par le processus qui les a publiées.
+
+        Returns
+        -------
+        empreinte : str
+            L'empreinte, en hexadécimal.
+        """
+        if self._empreinte_donnees is None and self.data is None:
+            self._empreinte_donnees = self._donnees_partagees.empreinte
+        if self._empreinte_donnees is None:
+            contenu = json.dumps(self.data, sort_keys=True)
+            self._empreinte_donnees = hashlib.sha256(
+                contenu.encode("utf-8")
+            ).hexdigest()
+        return self._empreinte_donnees
+
+    def calculeCleCache(self, methode, cibles):
+        """
+        Calcule la clé de cache d'un appel.
+
+        Parameters
+        ----------
+        methode : str
+            Le nom de la méthode.
+        cibles : dict
+            Les arguments de la méthode, par exemple {"Acible": 63.0}.
+            Les arguments absents ou None utilisent la trajectoire
+            du COR.
+
+        Returns
+        -------
+        cle : str
+            L'empreinte SHA-256, en hexadécimal, de la méthode, des
+            cibles normalisées, des hypothèses et des paramètres du
+            simulateur.
+        """
+        normalisees = []
+        for nom in sorted(cibles):
+            if cibles[nom] is not None:
+                normalisees.append((nom, _normaliseCible(cibles[nom])))
+        description = (
+            methode,
+            tuple(normalisees),
+            self.getEmpreinteDonnees(),
+            tuple(self.rechercheAgeBornes),
+            self.rechercheAgeRTol,
+            self.dir_image,
+            tuple(self.ext_image),
+        )
+        cle = hashlib.sha256(repr(description).encode("utf-8")).hexdigest()
+        return cle
+
+    def __getstate__(self):
+        """
+        Retourne l'état compact du simulateur, pour pickle.
+
+        Les hypothèses sont transmises sous la forme d'un objet
+        DonneesTableaux, c'est-à-dire d'un unique tableau dense, ou par
+        la référence aux données partagées du simulateur : avec le
+        protocole 5, le tableau peut être transmis hors bande.
+        Les trajectoires, les tableaux et les sorties du COR sont
+        recalculés à partir des hypothèses : les modifications des
+        trajectoires T, P, A, ... du simulateur ne sont pas transmises.
+        Les paramètres modifiables (répertoire et formats des images,
+        bornes de recherche de l'âge, moteur, ...) sont transmis.
+        Le cache est réactivé, vide, avec le même cache persistant.
+
+        Returns
+        -------
+        etat : dict
+            L'état du simulateur.
+        """
+        donnees = self._donnees_partagees
+        if donnees is None:
+            donnees = DonneesTableaux(self)
+        etat = {
+            "donnees": donnees,
+            "labels_is_long": self.labels_is_long,
+            "yaxis_lim": self.yaxis_lim,
+            "ext_image": self.ext_image,
+            "dir_image": self.dir_image,
+            "affiche_quand_ecrit": self.affiche_quand_ecrit,
+            "rechercheAgeBornes": self.rechercheAgeBornes,
+            "rechercheAgeRTol": self.rechercheAgeRTol,
+            "_moteur": self._moteur,
+        }
+        if self._cache is not None:
+            etat["cache"] = (self.taille_cache, self._cache_persistant)
+        return etat
+
+    def __setstate__(self, etat):
+        """
+        Recrée le simulateur à partir de son état compact.
+
+        Parameters
+        ----------
+        etat : dict
+            L'état retourné par __getstate__.
+        """
+        etat = dict(etat)
+        self.__init__(donnees_partagees=etat.pop("donnees"))
+        cache = etat.pop("cache", None)
+        if cache is not None:
+            self.activeCache(*cache)
+        if etat["_moteur"] == "numba" and not NoyauxCompiles.estDisponible():
+            # Le processus qui reçoit le simulateur n'a pas numba
+            etat["_moteur"] = "numpy"
+        self.__dict__.update(etat)
+        return None
+
+    def sauveFigure(self, f, figure=None):
         """
         Sauvegarde l'image dans le répertoire
 
@@ -1728,38 +4456,54 @@ class SimulateurRetraites:
         ----------
         f : str
             Le nom de base des fichiers à sauver
+        figure : matplotlib.figure.Figure
+            La figure à sauver (par défaut, la figure courante de pylab).
 
         Examples
         --------
         >>> simulateur = SimulateurRetraites()
         >>> simulateur.sauveFigure("conjoncture")
         """
-
+        if figure is None:
+            figure = pl.gcf()
         for ext in self.ext_image:
             basefilename = f + "." + ext
             filename = os.path.join(self.dir_image, basefilename)
             if self.affiche_quand_ecrit:
                 print("Ecriture du fichier %s" % (filename))
-            pl.savefig(filename)
+            figure.savefig(filename)
         return None
 
-    def dessineLegende(self):
+    def dessineLegende(self, figure=None):
         """
         Crée un graphique présentant les légendes des graphiques.
 
+        Parameters
+        ----------
+        figure : matplotlib.figure.Figure
+            La figure dans laquelle dessiner (par défaut, crée une
+            nouvelle figure pylab).
+
+        Returns
+        -------
+        figure : matplotlib.figure.Figure
+            La figure des légendes.
+
         Examples
         --------
         >>> simulateur = SimulateurRetraites()
         >>> simulateur.dessineLegende()
         """
+        if figure is None:
+            figure = pl.figure(figsize=(6, 2))
         # Juste les légendes
-        pl.figure(figsize=(6, 2))
+        ax = figure.add_subplot()
         for s in self.scenarios:
-            pl.plot(0.0, 0.0, label=self.scenarios_labels[s])
-        pl.legend(loc="center")
-        pl.ylim(bottom=0.0, top=0.7)
-        pl.axis("off")
-        return None
+            ax.plot(0.0, 0.0, label=self.scenarios_labels[s])
+        ax.legend(loc="center")
+        ax.set_ylim(bottom=0.0, top=0.7)
+        ax.axis("off")
+        return figure
 
     def _genereTrajectoirePIB(self):
         """
@@ -1773,6 +4517,31 @@ class SimulateurRetraites:
         PIB : dict
             Une trajectoire de PIB.
         """
+        PIB = self._versTrajectoire(self.getTableau("PIB"))
+        return PIB
+
+    def _calculeTableauPIB(self, croissance):
+        """
+        Calcule le PIB en fonction de la croissance.
+
+        Le PIB est celui constaté jusqu'en 2018, puis il croît
+        chaque année du taux de croissance de l'année.
+
+        Source :
+        https://fr.wikipedia.org/wiki/Produit_int%C3%A9rieur_brut_de_la_France
+
+        Parameters
+        ----------
+        croissance : ndarray
+            Le taux de croissance annuel (%), diffusable vers un
+            tableau dont la dernière dimension est celle des années.
+
+        Returns
+        -------
+        PIB : ndarray
+            Le PIB (Milliards EUR), de taille
+            (taille commune de croissance,) + (len(annees),).
+        """
         # Historique de PIBs (Milliards EUR)
         PIB_constate = {
             2005: 1772.0,
@@ -1790,50 +4559,22 @@ class SimulateurRetraites:
             2017: 2291.7,
             2018: 2353.1,
         }
-        # Croissance en fonction du scénario
         annee_dernier_PIB = 2018
-        # Génère la trajectoire
-        PIB = dict()
-        for s in self.scenarios:
-            PIB[s] = dict()
-            croissance = self.scenarios_croissance[s]
-            for a in self.annees:
-                if a <= annee_dernier_PIB:
-                    PIB[s][a] = PIB_constate[a]
-                else:
-                    PIB[s][a] = (1.0 + croissance / 100.0) * PIB[s][a - 1]
+        croissance = np.asarray(croissance, dtype=float)
+        forme = np.broadcast_shapes(croissance.shape, (len(self.annees),))
+        croissance = np.broadcast_to(croissance, forme)
+        # Génère la trajectoire, vectorisée sur les conjonctures
+        PIB = np.empty(forme)
+        for j, a in enumerate(self.annees):
+            if a <= annee_dernier_PIB:
+                PIB[..., j] = PIB_constate[a]
+            else:
+                PIB[..., j] = (1.0 + croissance[..., j] / 100.0) * PIB[
+                    ..., j - 1
+                ]
         return PIB
 
-    def _calculePensionAnnuelleDroitDirect(self, PIB, As):
-        """
-        Calcule la pension annuelle de droit direct (brut) en kEUR.
-
-        Parameters
-        ----------
-        PIB : dict
-            La trajectoire de PIB
-        As : dict
-            L'âge de départ à la retraite modifié par l'utilisateur
-
-        Returns
-        -------
-        pensionBrut : dict
-            La trajectoire de pension brut.
-        """
-        pensionBrut = dict()
-        for s in self.scenarios:
-            pensionBrut[s] = dict()
-            for a in self.annees:
-                GdA = self.G[s][a] * (As[s][a] - self.A[s][a])
-                pensionBrut[s][a] = (
-                    self.B[s][a]
-                    * self.P[s][a]
-                    * PIB[s][a]
-                    * 1000.0
-                    / (self.NC[s][a] + 0.5 * GdA)
-                )
-        return pensionBrut
-
+    @_memorise
     def calculeAge(self, REVcible):
         """
         Calcul de l'âge en fonction de la durée de vie à la retraite.
@@ -1846,9 +4587,9 @@ class SimulateurRetraites:
         * Si la valeur cible donnée est un dictionnaire,
         considère que c'est une trajectoire et utilise cette trajectoire.
 
-        Le calcul est réalisé par inversion numérique du ratio de durée
-        de vie en retraite.
-        Pour cela, nous utilisons le module scipy.optimize.
+        Le calcul est réalisé par inversion exacte du ratio de durée
+        de vie en retraite, qui est affine par morceaux en fonction de
+        l'âge (voir _noyau_A_depuis_REV).
 
         La trajectoire d'âge est uniquement déterminée par le ratio
         de durée de vie en retraite.
@@ -1875,56 +4616,10 @@ class SimulateurRetraites:
         >>> analyse = simulateur.pilotageParSoldePensionAge(Acible = Acible)
         """
 
-        def _EcartDeREV(As, args):
-            """
-            Pour un âge de départ à la retraite donné,
-            calcule la différence entre la durée de vie à la retraite pour
-            une année donnée et la durée de vie à la retraite
-            cible REVcible.
-
-            Utilise implicitement les variables simulateur et annee.
-
-            Parameters
-            ----------
-            As : float
-                L'âge de départ à la retraite
-            args : list
-                Une liste de quatre éléments [simulateur, annee,
-                anneeReference, scenarioReference] que l'on décrit
-                ci-dessous.
-            simulateur : SimulateurRetraite
-                Le simulateur
-            annee : float
-                L'année du calcul de la durée de vie
-                à la retraite
-            anneeReference : float
-                L'année de référence du calcul
-                de la durée de vie à la retraite
-            scenarioReference : int
-                Le scénario de référence
-            deltaREV : float
-                La différence entre les deux durées
-                de vie à la retraite
-            """
-            simulateur, scenario, annee, REVcible = args
-            annee_naissance = round(annee + 0.5 - As)
-            age_mort = 60.0 + simulateur.EV[scenario][annee_naissance]
-            REV = (age_mort - As) / age_mort
-            deltaREV = REVcible - REV
-            return deltaREV
-
-        REVs = self.genereTrajectoire("REV", REVcible)
-        #
-        As = deepcopy(self.A)
-        for s in self.scenarios:
-            for a in self.annees_futures:
-                # Calcul l'âge
-                args = [self, s, a, REVs[s][a]]
-                result = spo.root_scalar(
-                    _EcartDeREV,
-                    bracket=self.rechercheAgeBornes,
-                    args=args,
-                    rtol=self.rechercheAgeRTol,
-                )
-                As[s][a] = result.root
+        REVs = self._versTableau(self.genereTrajectoire("REV", REVcible))
+        i0 = self.annees.index(self.annee_courante)
+        futur = self._fenetreFuture(self._getConjonctureCOR())
+        tableau = self._versTableau(self.A)
+        tableau[:, i0:] = self._noyau_A_depuis_REV(futur, REVs[:, i0:])
+        As = self._versTrajectoire(tableau)
         return As
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de table d'interpolation linéaire vectorisée.
+"""
+import numpy as np
+
+
+class TableInterpolation:
+    def __init__(self, abscisses, valeurs, noms):
+        """
+        Crée une table d'interpolation linéaire par morceaux.
+
+        La table contient plusieurs variables tabulées en quelques
+        abscisses (par exemple des taux de chômage), pour chaque année.
+        Les pentes entre deux abscisses consécutives sont précalculées,
+        si bien qu'une interpolation se réduit à une indexation et à
+        une multiplication-addition sur des tableaux.
+
+        Les interpolations sont vectorisées : l'abscisse peut être
+        un flottant ou un tableau, et on peut interpoler toutes les années
+        à la fois ou une sélection d'années.
+
+        Parameters
+        ----------
+        abscisses : list of float
+            Les m abscisses de la table, dans l'ordre croissant.
+        valeurs : ndarray
+            Un tableau de taille (nombre de variables, m, nombre d'années).
+            valeurs[k, i, j] est la valeur de la variable k à l'abscisse i
+            pour l'année d'indice j.
+        noms : list of str
+            Les noms des variables de la table.
+
+        Attributes
+        ----------
+        abscisses : ndarray
+            Les abscisses de la table, de taille m.
+        valeurs : ndarray
+            Les valeurs de la table, de taille
+            (nombre de variables, m, nombre d'années).
+        pentes : ndarray
+            Les pentes entre deux abscisses consécutives, de taille
+            (nombre de variables, m - 1, nombre d'années).
+        noms : list of str
+            Les noms des variables de la table.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> table = simulateur.getTableChomage()
+        >>> valeurs = table.interpole(7.0)
+        >>> NC = valeurs[table.getIndice("NC")]
+        """
+        self.abscisses = np.array(abscisses, dtype=float)
+        self.valeurs = np.array(valeurs, dtype=float)
+        self.noms = list(noms)
+        if self.abscisses.ndim != 1 or len(self.abscisses) < 2:
+            raise ValueError("La table doit contenir au moins deux abscisses")
+        if np.any(np.diff(self.abscisses) <= 0.0):
+            raise ValueError("Les abscisses doivent être croissantes")
+        if self.valeurs.shape[:2] != (len(self.noms), len(self.abscisses)):
+            raise ValueError(
+                "Mauvaise taille pour les valeurs : %s" % (self.valeurs.shape,)
+            )
+        largeurs = np.diff(self.abscisses)[np.newaxis, :, np.newaxis]
+        self.pentes = np.diff(self.valeurs, axis=1) / largeurs
+        # Les tables sont partagées : on les protège en écriture
+        self.abscisses.flags.writeable = False
+        self.valeurs.flags.writeable = False
+        self.pentes.flags.writeable = False
+        return None
+
+    def getIndice(self, nom):
+        """
+        Retourne l'indice d'une variable dans la table.
+
+        Parameters
+        ----------
+        nom : str
+            Le nom de la variable.
+
+        Returns
+        -------
+        indice : int
+            L'indice de la variable dans la première dimension
+            des valeurs.
+        """
+        return self.noms.index(nom)
+
+    def interpole(self, x, indices_annees=None):
+        """
+        Interpole toutes les variables de la table.
+
+        Lève une exception ValueError si une abscisse est en dehors
+        de l'intervalle de la table, comme scipy.interpolate.interp1d.
+
+        Parameters
+        ----------
+        x : float or ndarray
+            La ou les abscisses où interpoler.
+        indices_annees : int or ndarray
+            Le ou les indices des années où interpoler.
+            Si None, interpole pour toutes les années : x est alors
+            combiné avec la dernière dimension, celle des années.
+            Sinon, x est combiné avec indices_annees selon les règles de
+            diffusion de numpy.
+
+        Returns
+        -------
+        y : ndarray
+            Les valeurs interpolées, de taille
+            (nombre de variables,) + taille commune de x et des années.
+        """
+        x = np.asarray(x, dtype=float)
+        if np.any(x < self.abscisses[0]) or np.any(x > self.abscisses[-1]):
+            raise ValueError(
+                "Abscisse en dehors de l'intervalle [%s, %s]"
+                % (self.abscisses[0], self.abscisses[-1])
+            )
+        if indices_annees is None:
+            indices_annees = np.arange(self.valeurs.shape[2])
+        # Indice de l'intervalle contenant chaque abscisse
+        i = np.searchsorted(self.abscisses, x, side="right") - 1
+        i = np.clip(i, 0, len(self.abscisses) - 2)
+        i, j = np.broadcast_arrays(i, indices_annees)
+        dx = x - self.abscisses[i]
+        y = self.valeurs[:, i, j] + self.pentes[:, i, j] * dx
+        return y
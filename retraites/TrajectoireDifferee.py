@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de trajectoire calculée à la demande, scénario par scénario.
+"""
+from collections.abc import Mapping
+
+
+class TrajectoireDifferee(Mapping):
+    def __init__(self, scenarios, calcule):
+        """
+        Crée une trajectoire dont chaque scénario est calculé au premier
+        accès.
+
+        La trajectoire s'utilise comme un dictionnaire :
+        trajectoire[s][a] est la valeur numérique du scénario s à
+        l'année a.
+        Lors du premier accès à trajectoire[s], le scénario s est
+        calculé, puis conservé : les accès suivants ne calculent rien.
+        Les scénarios qui ne sont jamais lus ne sont jamais calculés.
+
+        Une copie (copy.deepcopy) ou une sérialisation (pickle) calcule
+        tous les scénarios et produit un dictionnaire.
+
+        Parameters
+        ----------
+        scenarios : list of int
+            Les scénarios de la trajectoire.
+        calcule : function
+            La fonction qui, pour un scénario s, retourne le
+            dictionnaire {a: valeur} des valeurs de ce scénario.
+
+        Attributes
+        ----------
+        scenarios : list of int
+            Les scénarios de la trajectoire.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        >>> # Calcule uniquement le scénario central
+        >>> analyse.S[3][2050]
+        >>> analyse.S.getScenariosCalcules()
+        [3]
+        """
+        self.scenarios = list(scenarios)
+        self._calcule = calcule
+        self._valeurs = dict()
+        return None
+
+    def __getitem__(self, s):
+        if s not in self._valeurs:
+            if s not in self.scenarios:
+                raise KeyError(s)
+            self._valeurs[s] = self._calcule(s)
+        return self._valeurs[s]
+
+    def __iter__(self):
+        return iter(self.scenarios)
+
+    def __len__(self):
+        return len(self.scenarios)
+
+    def __contains__(self, s):
+        return s in self.scenarios
+
+    def __reduce__(self):
+        # La fonction de calcul n'est pas transmise : la copie est un
+        # dictionnaire dont tous les scénarios sont calculés
+        return (dict, (dict(self.items()),))
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def copie(self):
+        """
+        Retourne une copie de la trajectoire, calculée à la demande.
+
+        Chaque scénario de la copie est calculé par la trajectoire
+        d'origine, au plus une fois pour toutes les copies, puis copié :
+        la modification de la copie ne modifie pas l'original.
+
+        Returns
+        -------
+        trajectoire : TrajectoireDifferee
+            La copie.
+        """
+        trajectoire = TrajectoireDifferee(
+            self.scenarios, lambda s: dict(self[s])
+        )
+        return trajectoire
+
+    def getScenariosCalcules(self):
+        """
+        Retourne les scénarios déjà calculés.
+
+        Returns
+        -------
+        scenarios : list of int
+            Les scénarios calculés, dans l'ordre des scénarios de la
+            trajectoire.
+        """
+        scenarios = [s for s in self.scenarios if s in self._valeurs]
+        return scenarios
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de trajectoire à stockage partagé, copiée à l'écriture.
+"""
+
+from collections.abc import Mapping, MutableMapping
+import numpy as np
+
+
+class TrajectoirePartagee(Mapping):
+    def __init__(self, scenarios, annees, tableau, lecture_seule=False):
+        """
+        Crée une trajectoire fondée sur un tableau, copiée à l'écriture.
+
+        La trajectoire s'utilise comme un dictionnaire :
+        trajectoire[s][a] est la valeur numérique du scénario s à
+        l'année a.
+        Les valeurs de chaque scénario sont une ligne du tableau, qui
+        n'est pas copiée : plusieurs trajectoires, par exemple celles
+        dérivées de la trajectoire du COR, partagent le même stockage.
+        Lors de la première modification d'une valeur d'un scénario,
+        seule la ligne de ce scénario est copiée : les autres
+        trajectoires ne sont pas modifiées.
+
+        Une copie (méthode copie, copy.copy ou copy.deepcopy) ne copie
+        aucune valeur.
+        Pour pickle, la trajectoire est un seul tableau dense, qui
+        peut être transmis hors bande avec le protocole 5.
+
+        Une trajectoire en lecture seule, comme les trajectoires du COR
+        du simulateur, ne peut pas être modifiée : ses copies peuvent
+        l'être.
+
+        Parameters
+        ----------
+        scenarios : list of int
+            Les scénarios de la trajectoire.
+        annees : list of int
+            Les années de la trajectoire.
+        tableau : ndarray
+            Le tableau de taille (len(scenarios), len(annees)).
+            Il ne doit plus être modifié ensuite.
+        lecture_seule : bool
+            Si True, la modification d'une valeur produit une
+            exception TypeError (par défaut, False).
+
+        Attributes
+        ----------
+        scenarios : list of int
+            Les scénarios de la trajectoire.
+        annees : list of int
+            Les années de la trajectoire.
+        lecture_seule : bool
+            True si la trajectoire est en lecture seule.
+
+        Examples
+        --------
+        >>> simulateur = SimulateurRetraites()
+        >>> As = simulateur.genereTrajectoire("A")
+        >>> # Copie uniquement la ligne du scénario 3
+        >>> As[3][2030] = 63.0
+        """
+        self.scenarios = list(scenarios)
+        self.annees = list(annees)
+        self.lecture_seule = lecture_seule
+        tableau = np.asarray(tableau, dtype=float)
+        if tableau.shape != (len(self.scenarios), len(self.annees)):
+            raise ValueError(
+                "Mauvaise taille pour le tableau : %s" % (tableau.shape,)
+            )
+        indices = {a: j for j, a in enumerate(self.annees)}
+        self._lignes = dict()
+        for s, valeurs in zip(self.scenarios, tableau):
+            valeurs.flags.writeable = False
+            self._lignes[s] = _LigneTrajectoire(
+                indices, valeurs, lecture_seule
+            )
+        return None
+
+    def __getitem__(self, s):
+        return self._lignes[s]
+
+    def __iter__(self):
+        return iter(self.scenarios)
+
+    def __len__(self):
+        return len(self.scenarios)
+
+    def __copy__(self):
+        return self.copie()
+
+    def __deepcopy__(self, memo):
+        return self.copie()
+
+    def __reduce__(self):
+        # Sérialisée sous la forme d'un seul tableau dense
+        return (
+            TrajectoirePartagee,
+            (
+                self.scenarios,
+                self.annees,
+                self.getTableau(),
+                self.lecture_seule,
+            ),
+        )
+
+    def __repr__(self):
+        return repr({s: dict(ligne) for s, ligne in self._lignes.items()})
+
+    def copie(self):
+        """
+        Retourne une copie de la trajectoire, qui partage son stockage.
+
+        Returns
+        -------
+        trajectoire : TrajectoirePartagee
+            La copie : la modification d'une des deux trajectoires
+            ne modifie pas l'autre.
+            La copie n'est jamais en lecture seule.
+        """
+        trajectoire = TrajectoirePartagee.__new__(TrajectoirePartagee)
+        trajectoire.scenarios = self.scenarios
+        trajectoire.annees = self.annees
+        trajectoire.lecture_seule = False
+        trajectoire._lignes = dict()
+        for s, ligne in self._lignes.items():
+            trajectoire._lignes[s] = ligne.copie()
+        return trajectoire
+
+    def getTableau(self):
+        """
+        Retourne le tableau des valeurs de la trajectoire.
+
+        Returns
+        -------
+        tableau : ndarray
+            Un nouveau tableau de taille (len(scenarios), len(annees)).
+        """
+        tableau = np.array([self._lignes[s]._valeurs for s in self.scenarios])
+        return tableau
+
+
+class _LigneTrajectoire(MutableMapping):
+    """
+    Valeurs d'un scénario d'une trajectoire partagée, indexées par année.
+    """
+
+    def __init__(self, indices, valeurs, lecture_seule=False):
+        self._indices = indices
+        self._valeurs = valeurs
+        self._lecture_seule = lecture_seule
+
+    def __getitem__(self, a):
+        return self._valeurs.item(self._indices[a])
+
+    def __setitem__(self, a, valeur):
+        if self._lecture_seule:
+            raise TypeError(
+                "La trajectoire est en lecture seule : copier la "
+                "trajectoire avant de la modifier"
+            )
+        j = self._indices[a]
+        if not self._valeurs.flags.writeable:
+            # Copie à l'écriture : la ligne est partagée
+            self._valeurs = self._valeurs.copy()
+        self._valeurs[j] = valeur
+
+    def __delitem__(self, a):
+        raise TypeError(
+            "Une année ne peut pas être supprimée d'une trajectoire : %s" % (a)
+        )
+
+    def __iter__(self):
+        return iter(self._indices)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def copie(self):
+        # Les deux lignes partagent désormais les valeurs
+        self._valeurs.flags.writeable = False
+        return _LigneTrajectoire(self._indices, self._valeurs)
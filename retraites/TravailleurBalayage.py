@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Classe de processus de calcul d'un balayage de pilotage distribué.
+"""
+
+from retraites.BalayagePilotage import _calculeBloc
+from retraites.SimulateurRetraites import SimulateurRetraites
+from urllib.parse import urlencode
+from urllib.request import urlopen, Request
+import io
+import json
+import numpy as np
+
+
+class TravailleurBalayage:
+    def __init__(self, url, simulateur=None, delai=60.0):
+        """
+        Crée un processus de calcul des blocs d'un balayage distribué.
+
+        Le processus demande des blocs au coordinateur (voir
+        CoordinateurBalayage), les calcule par le moteur vectorisé de
+        pilotage (voir SimulateurRetraites.pilotageConjonctures) et
+        renvoie leurs résultats, jusqu'à la fin du balayage.
+        Les hypothèses du simulateur doivent être celles du
+        coordinateur : elles sont vérifiées par leur empreinte.
+
+        Parameters
+        ----------
+        url : str
+            L'URL du coordinateur, par exemple "http://127.0.0.1:8100".
+        simulateur : SimulateurRetraites
+            Le simulateur (par défaut, un simulateur chargeant les
+            hypothèses fournies par le module).
+        delai : float
+            Le délai maximal d'une requête au coordinateur en secondes
+            (par défaut, 60).
+
+        Attributes
+        ----------
+        url : str
+            L'URL du coordinateur.
+        simulateur : SimulateurRetraites
+            Le simulateur.
+        delai : float
+            Le délai maximal d'une requête en secondes.
+        nombre_blocs : int
+            Le nombre de blocs calculés par ce processus.
+
+        Examples
+        --------
+        >>> travailleur = TravailleurBalayage("http://coordinateur:8100")
+        >>> travailleur.execute()
+        """
+        if simulateur is None:
+            simulateur = SimulateurRetraites()
+        self.url = url.rstrip("/")
+        self.simulateur = simulateur
+        self.delai = delai
+        self.nombre_blocs = 0
+        return None
+
+    def calculeBloc(self, description):
+        """
+        Calcule un bloc décrit par le coordinateur.
+
+        Parameters
+        ----------
+        description : dict
+            La description du bloc (voir CoordinateurBalayage.distribue).
+
+        Returns
+        -------
+        contenu : bytes
+            Le résultat du bloc au format NumPy .npz.
+        """
+        empreinte = self.simulateur.getEmpreinteDonnees()
+        if description["empreinte"] != empreinte:
+            raise ValueError(
+                "Les hypothèses du simulateur sont différentes de celles "
+                "du coordinateur : %s" % (empreinte)
+            )
+        parametres = dict()
+        for nom, valeur in description["parametres"].items():
+            if isinstance(valeur, list):
+                valeur = np.array(valeur, dtype=float)
+            parametres[nom] = valeur
+        resultats = _calculeBloc(
+            self.simulateur,
+            description["methode"],
+            parametres,
+            description["variables"],
+        )
+        fichier = io.BytesIO()
+        np.savez(fichier, **resultats)
+        contenu = fichier.getvalue()
+        return contenu
+
+    def execute(self, nombre_blocs=None):
+        """
+        Calcule des blocs jusqu'à la fin du balayage.
+
+        Parameters
+        ----------
+        nombre_blocs : int
+            Le nombre maximal de blocs calculés par cet appel
+            (par défaut, pas de limite).
+
+        Returns
+        -------
+        nombre : int
+            Le nombre de blocs calculés par cet appel.
+        """
+        nombre = 0
+        while nombre_blocs is None or nombre < nombre_blocs:
+            with urlopen(self.url + "/bloc", timeout=self.delai) as reponse:
+                description = json.loads(reponse.read())
+            if description["bloc"] is None:
+                break
+            contenu = self.calculeBloc(description)
+            requete = Request(
+                "%s/bloc/%d?%s"
+                % (
+                    self.url,
+                    description["bloc"],
+                    urlencode({"specification": description["specification"]}),
+                ),
+                data=contenu,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            with urlopen(requete, timeout=self.delai) as reponse:
+                reponse.read()
+            nombre += 1
+            self.nombre_blocs += 1
+        return nombre
@@ -4,6 +4,21 @@ from .SimulateurAnalyse import SimulateurAnalyse
 from .EtudeImpact import EtudeImpact
 from .FonctionPension import FonctionPension
 from .ModelePensionProbabiliste import ModelePensionProbabiliste
+from .TableInterpolation import TableInterpolation
+from .RenduSimulation import RenduSimulation
+from .EnsembleTrajectoires import EnsembleTrajectoires
+from .ServeurPilotage import ServeurPilotage
+from .SimulateurAsynchrone import SimulateurAsynchrone
+from .CachePersistant import CachePersistant
+from .TrajectoireDifferee import TrajectoireDifferee
+from .TrajectoirePartagee import TrajectoirePartagee
+from .DonneesTableaux import DonneesTableaux
+from .DonneesPartagees import DonneesPartagees
+from .BalayagePilotage import BalayagePilotage
+from .CoordinateurBalayage import CoordinateurBalayage
+from .TravailleurBalayage import TravailleurBalayage
+from .ExplorationPareto import ExplorationPareto
+from .RegionAdmissible import RegionAdmissible
 
 __all__ = [
     "SimulateurRetraites",
@@ -11,5 +26,20 @@ __all__ = [
     "EtudeImpact",
     "FonctionPension",
     "ModelePensionProbabiliste",
+    "TableInterpolation",
+    "RenduSimulation",
+    "EnsembleTrajectoires",
+    "ServeurPilotage",
+    "SimulateurAsynchrone",
+    "CachePersistant",
+    "TrajectoireDifferee",
+    "TrajectoirePartagee",
+    "DonneesTableaux",
+    "DonneesPartagees",
+    "BalayagePilotage",
+    "CoordinateurBalayage",
+    "TravailleurBalayage",
+    "ExplorationPareto",
+    "RegionAdmissible",
 ]
 __version__ = "1.0"
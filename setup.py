@@ -27,6 +27,7 @@ setup(
                       'scipy',
                       'openturns',
                       ],
+    extras_require={'numba': ['numba']},
     description="Simulateur financier du système de retraites",
     long_description=long_description,
     long_description_content_type="text/markdown",
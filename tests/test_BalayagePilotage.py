@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Test for BalayagePilotage class.
+"""
+
+import unittest
+from retraites.BalayagePilotage import BalayagePilotage
+from retraites.SimulateurRetraites import SimulateurRetraites
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import tempfile
+import os
+
+
+class CheckBalayagePilotage(unittest.TestCase):
+    def test_Reprise(self):
+        simulateur = SimulateurRetraites()
+        A, RNV = np.meshgrid(
+            np.linspace(60.0, 68.0, 9), np.linspace(0.8, 1.0, 5)
+        )
+        parametres = {
+            "croissance": 1.3,
+            "chomage": 7.0,
+            "Acible": A.ravel(),
+            "RNVcible": RNV.ravel(),
+            "Scible": 0.0,
+        }
+        methode = "pilotageParAgeEtNiveauDeVie"
+        with tempfile.TemporaryDirectory() as repertoire:
+            balayage = BalayagePilotage(
+                simulateur, repertoire, parametres, methode, taille_bloc=10
+            )
+            self.assertEqual(balayage.nombre_configurations, 45)
+            self.assertEqual(balayage.nombre_blocs, 5)
+            with self.assertRaises(ValueError):
+                balayage.getResultats()
+            # Arrêt après deux blocs
+            progressions = []
+            balayage.execute(nombre_blocs=2, rapport=progressions.append)
+            self.assertEqual(len(progressions), 2)
+            self.assertEqual(progressions[-1]["configurations_terminees"], 20)
+            self.assertGreater(progressions[-1]["debit"], 0.0)
+            self.assertGreater(progressions[-1]["duree_restante"], 0.0)
+            # Reprise : seuls les blocs restants sont calculés
+            balayage = BalayagePilotage(
+                simulateur, repertoire, parametres, methode, taille_bloc=10
+            )
+            self.assertEqual(balayage.getBlocsRestants(), [2, 3, 4])
+            self.assertIsNone(balayage.getProgression()["debit"])
+            date = os.path.getmtime(
+                os.path.join(repertoire, "bloc_000000.npz")
+            )
+            balayage.execute()
+            self.assertTrue(balayage.estTermine())
+            self.assertEqual(
+                os.path.getmtime(os.path.join(repertoire, "bloc_000000.npz")),
+                date,
+            )
+            self.assertEqual(balayage.getProgression()["duree_restante"], 0.0)
+            resultats = balayage.getResultats()
+            attendu = simulateur.pilotageConjonctures(
+                1.3,
+                7.0,
+                methode,
+                Acible=A.ravel()[:, np.newaxis],
+                RNVcible=RNV.ravel()[:, np.newaxis],
+                Scible=0.0,
+            )
+            for nom in attendu:
+                np.testing.assert_array_equal(resultats[nom], attendu[nom])
+            # Une autre spécification ne reprend pas le répertoire
+            with self.assertRaises(ValueError):
+                BalayagePilotage(
+                    simulateur, repertoire, parametres, methode, taille_bloc=9
+                )
+        return None
+
+    def test_Executeur(self):
+        simulateur = SimulateurRetraites()
+        croissance = np.linspace(1.0, 1.8, 25)
+        with tempfile.TemporaryDirectory() as repertoire:
+            balayage = BalayagePilotage(
+                simulateur,
+                repertoire,
+                {"croissance": croissance, "chomage": 7.0},
+                taille_bloc=4,
+                variables=["S", "P"],
+            )
+            with ThreadPoolExecutor(max_workers=2) as executeur:
+                balayage.execute(executeur=executeur)
+            resultats = balayage.getResultats()
+        self.assertEqual(sorted(resultats), ["P", "S"])
+        attendu = simulateur.pilotageConjonctures(croissance, 7.0)
+        np.testing.assert_array_equal(resultats["S"], attendu["S"])
+        with self.assertRaises(ValueError):
+            BalayagePilotage(simulateur, repertoire, {"croissance": 1.3})
+        with self.assertRaises(ValueError):
+            BalayagePilotage(
+                simulateur,
+                repertoire,
+                {"croissance": [1.0, 1.3], "chomage": [7.0, 8.0, 9.0]},
+            )
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
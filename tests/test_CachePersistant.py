@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Test for CachePersistant class.
+"""
+
+import unittest
+from retraites.CachePersistant import CachePersistant
+from retraites.SimulateurRetraites import SimulateurRetraites
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+import sqlite3
+import tempfile
+import os
+
+
+def _pilote(arguments):
+    chemin, age = arguments
+    simulateur = SimulateurRetraites()
+    simulateur.activeCache(cache_persistant=CachePersistant(chemin))
+    analyse = simulateur.pilotageParSoldePensionAge(Acible=age)
+    return analyse.P[3][2050]
+
+
+class CheckCachePersistant(unittest.TestCase):
+    def test_LitEcrit(self):
+        with tempfile.TemporaryDirectory() as repertoire:
+            chemin = os.path.join(repertoire, "cache.sqlite")
+            cache = CachePersistant(chemin, taille_max=2500)
+            self.assertIsNone(cache.lit("a"))
+            cache.ecrit("a", b"a" * 1000)
+            cache.ecrit("b", {"x": b"b" * 1000})
+            self.assertEqual(cache.lit("a"), b"a" * 1000)
+            self.assertEqual(cache.lit("b"), {"x": b"b" * 1000})
+            # Un autre objet voit les mêmes résultats
+            autre = CachePersistant(chemin, taille_max=2500)
+            self.assertEqual(autre.lit("b")["x"], b"b" * 1000)
+            # Eviction du résultat le moins récemment utilisé
+            cache.lit("a")
+            cache.ecrit("c", b"c" * 1000)
+            self.assertIsNone(cache.lit("b"))
+            self.assertIsNotNone(cache.lit("c"))
+            statistiques = cache.getStatistiques()
+            self.assertLessEqual(statistiques["taille"], 2500)
+            self.assertEqual(statistiques["nombre"], 2)
+            self.assertEqual(statistiques["echecs"], 2)
+            cache.vide()
+            self.assertEqual(cache.getStatistiques()["nombre"], 0)
+        return None
+
+    def test_TailleTotale(self):
+        with tempfile.TemporaryDirectory() as repertoire:
+            chemin = os.path.join(repertoire, "cache.sqlite")
+            cache = CachePersistant(chemin, taille_max=5000, journal="DELETE")
+            for i in range(10):
+                # Remplacement d'un résultat de taille différente
+                cache.ecrit("a", b"a" * (100 * i))
+                cache.ecrit("b%d" % (i), b"b" * 1000)
+            with closing(sqlite3.connect(chemin)) as connexion:
+                (taille,) = connexion.execute(
+                    "SELECT SUM(taille) FROM resultats"
+                ).fetchone()
+            self.assertEqual(cache.getStatistiques()["taille"], taille)
+            self.assertLessEqual(taille, 5000)
+            cache.vide()
+            self.assertEqual(cache.getStatistiques()["taille"], 0)
+        with self.assertRaises(ValueError):
+            CachePersistant(chemin, journal="MEMORY")
+        return None
+
+    def test_LectureConcurrente(self):
+        with tempfile.TemporaryDirectory() as repertoire:
+            chemin = os.path.join(repertoire, "cache.sqlite")
+            cache = CachePersistant(chemin, taille_max=2500, delai=0.1)
+            cache.ecrit("a", b"a" * 1000)
+            cache.ecrit("b", b"b" * 1000)
+            # Une lecture n'attend pas le verrou d'écriture
+            with closing(
+                sqlite3.connect(chemin, isolation_level=None)
+            ) as connexion:
+                connexion.execute("BEGIN IMMEDIATE")
+                self.assertEqual(cache.lit("a"), b"a" * 1000)
+                connexion.execute("ROLLBACK")
+            # Les dates d'accès sont écrites avec l'écriture suivante
+            cache.ecrit("c", b"c" * 1000)
+            self.assertIsNone(cache.lit("b"))
+            self.assertIsNotNone(cache.lit("a"))
+        return None
+
+    def test_Simulateur(self):
+        with tempfile.TemporaryDirectory() as repertoire:
+            chemin = os.path.join(repertoire, "cache.sqlite")
+            arguments = [(chemin, age) for age in [62.0, 63.0, 62.0, 63.0]]
+            with ProcessPoolExecutor(max_workers=2) as executeur:
+                P = list(executeur.map(_pilote, arguments))
+            self.assertEqual(P[0], P[2])
+            cache = CachePersistant(chemin)
+            self.assertEqual(cache.getStatistiques()["nombre"], 2)
+            # Un nouveau simulateur lit les résultats sur disque
+            simulateur = SimulateurRetraites()
+            simulateur.activeCache(cache_persistant=cache)
+            analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+            self.assertEqual(analyse.P[3][2050], P[1])
+            self.assertEqual(cache.getStatistiques()["succes"], 1)
+            As = simulateur.calculeAge(0.30)
+            self.assertEqual(cache.getStatistiques()["nombre"], 3)
+            simulateur.desactiveCache()
+            simulateur.activeCache(cache_persistant=cache)
+            self.assertEqual(simulateur.calculeAge(0.30), As)
+            self.assertEqual(cache.getStatistiques()["succes"], 2)
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
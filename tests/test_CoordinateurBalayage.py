@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Test for CoordinateurBalayage and TravailleurBalayage classes.
+"""
+
+import unittest
+from retraites.BalayagePilotage import BalayagePilotage
+from retraites.CoordinateurBalayage import CoordinateurBalayage
+from retraites.TravailleurBalayage import TravailleurBalayage
+from retraites.SimulateurRetraites import SimulateurRetraites
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+import http.client
+import numpy as np
+import tempfile
+import json
+import io
+
+
+class CheckCoordinateurBalayage(unittest.TestCase):
+    def test_Distribue(self):
+        simulateur = SimulateurRetraites()
+        parametres = {
+            "croissance": np.linspace(1.0, 1.8, 30),
+            "chomage": 7.0,
+            "Acible": np.linspace(62.0, 64.0, 30),
+        }
+        methode = "pilotageParSoldePensionAge"
+        with tempfile.TemporaryDirectory() as repertoire:
+            balayage = BalayagePilotage(
+                simulateur, repertoire, parametres, methode, taille_bloc=4
+            )
+            coordinateur = CoordinateurBalayage(balayage)
+            coordinateur.demarre()
+            try:
+                url = coordinateur.getURL()
+                # Un bloc distribué à un processus qui s'arrête
+                with urlopen(url + "/bloc") as reponse:
+                    perdu = json.loads(reponse.read())["bloc"]
+                travailleurs = [
+                    TravailleurBalayage(url, simulateur) for i in range(2)
+                ]
+                with ThreadPoolExecutor(max_workers=2) as executeur:
+                    nombres = list(
+                        executeur.map(lambda t: t.execute(), travailleurs)
+                    )
+                self.assertTrue(coordinateur.attend(10.0))
+                self.assertEqual(sum(nombres), balayage.nombre_blocs)
+                # Le bloc perdu a été volé
+                self.assertGreaterEqual(coordinateur.nombre_vols, 1)
+                self.assertNotIn(perdu, balayage.getBlocsRestants())
+                with urlopen(url + "/progression") as reponse:
+                    progression = json.loads(reponse.read())
+                self.assertEqual(progression["blocs_termines"], 8)
+                # Un résultat d'un autre balayage est refusé
+                requete = Request(
+                    url + "/bloc/0?specification=autre", data=b""
+                )
+                with self.assertRaises(HTTPError):
+                    urlopen(requete)
+                # En-tête Content-Length invalide
+                connexion = http.client.HTTPConnection(
+                    coordinateur.adresse, coordinateur.port, timeout=10
+                )
+                connexion.putrequest("POST", "/bloc/0")
+                connexion.putheader("Content-Length", "abc")
+                connexion.endheaders()
+                self.assertEqual(connexion.getresponse().status, 400)
+                connexion.close()
+                # Contenus illisibles : archive tronquée, fichier .npy
+                tampon = io.BytesIO()
+                np.savez(tampon, T=np.zeros((4, 3)))
+                tampon_npy = io.BytesIO()
+                np.save(tampon_npy, np.zeros((4, 3)))
+                for contenu in [tampon.getvalue()[:50], tampon_npy.getvalue()]:
+                    requete = Request(
+                        url
+                        + "/bloc/0?specification="
+                        + balayage.specification,
+                        data=contenu,
+                    )
+                    with self.assertRaises(HTTPError) as contexte:
+                        urlopen(requete)
+                    self.assertEqual(contexte.exception.code, 400)
+            finally:
+                coordinateur.arrete()
+            resultats = balayage.getResultats()
+        attendu = simulateur.pilotageConjonctures(
+            parametres["croissance"],
+            7.0,
+            methode,
+            Acible=parametres["Acible"][:, np.newaxis],
+        )
+        for nom in attendu:
+            np.testing.assert_array_equal(resultats[nom], attendu[nom])
+        return None
+
+    def test_Relance(self):
+        simulateur = SimulateurRetraites()
+        with tempfile.TemporaryDirectory() as repertoire:
+            balayage = BalayagePilotage(
+                simulateur,
+                repertoire,
+                {"croissance": [1.0, 1.3, 1.8], "chomage": 7.0},
+                taille_bloc=1,
+            )
+            coordinateur = CoordinateurBalayage(balayage, delai=0.0)
+            premier = coordinateur.distribue()
+            # La réservation a expiré : le bloc est distribué de nouveau
+            second = coordinateur.distribue()
+            self.assertEqual(premier["bloc"], second["bloc"])
+            self.assertEqual(coordinateur.nombre_relances, 1)
+            travailleur = TravailleurBalayage("http://inutilise", simulateur)
+            contenu = travailleur.calculeBloc(second)
+            coordinateur.recoit(
+                second["bloc"], second["specification"], contenu
+            )
+            coordinateur.recoit(
+                premier["bloc"], premier["specification"], contenu
+            )
+            self.assertEqual(balayage.getBlocsRestants(), [1, 2])
+            # Un résultat de mauvaise taille est refusé
+            troisieme = coordinateur.distribue()
+            contenu = travailleur.calculeBloc(troisieme)
+            with np.load(io.BytesIO(contenu)) as bloc:
+                resultats = {nom: bloc[nom] for nom in bloc.files}
+            resultats["T"] = resultats["T"][:, 0]
+            tampon = io.BytesIO()
+            np.savez(tampon, **resultats)
+            with self.assertRaises(ValueError):
+                coordinateur.recoit(
+                    troisieme["bloc"],
+                    troisieme["specification"],
+                    tampon.getvalue(),
+                )
+            self.assertEqual(balayage.getBlocsRestants(), [1, 2])
+            # Des hypothèses différentes sont refusées
+            second["empreinte"] = "autre"
+            with self.assertRaises(ValueError):
+                travailleur.calculeBloc(second)
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
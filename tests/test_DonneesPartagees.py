@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Test for DonneesPartagees class.
+"""
+
+import unittest
+from retraites.DonneesPartagees import DonneesPartagees
+from retraites.SimulateurRetraites import SimulateurRetraites
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pickle
+
+
+def _pilote(arguments):
+    donnees, age = arguments
+    simulateur = SimulateurRetraites(donnees_partagees=donnees)
+    analyse = simulateur.pilotageParSoldePensionAge(Acible=age)
+    return analyse.P[3][2050], simulateur.getEmpreinteDonnees()
+
+
+class CheckDonneesPartagees(unittest.TestCase):
+    def test_Simulateur(self):
+        reference = SimulateurRetraites()
+        with DonneesPartagees(reference) as donnees:
+            simulateur = SimulateurRetraites(donnees_partagees=donnees)
+            self.assertIsNone(simulateur.data)
+            for nom in ["T", "NC", "EV", "PIB"]:
+                np.testing.assert_array_equal(
+                    simulateur.getTableau(nom), reference.getTableau(nom)
+                )
+            self.assertEqual(simulateur.A[3][2050], reference.A[3][2050])
+            self.assertEqual(simulateur.EV[3][1990], reference.EV[3][1990])
+            # Les tableaux sont des vues sur la mémoire partagée
+            self.assertTrue(
+                np.shares_memory(
+                    simulateur.getTableau("NC"), donnees.getTableau("NC")
+                )
+            )
+            with self.assertRaises(ValueError):
+                simulateur.getTableau("NC")[0, 0] = 0.0
+            analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+            analyse_reference = reference.pilotageParSoldePensionAge(
+                Acible=63.0
+            )
+            self.assertEqual(analyse.T[3][2050], analyse_reference.T[3][2050])
+            self.assertEqual(
+                simulateur.calculeCleCache("pilotageCOR", {}),
+                reference.calculeCleCache("pilotageCOR", {}),
+            )
+            # Seuls le nom et la disposition sont sérialisés
+            taille = len(pickle.dumps(reference.data))
+            self.assertLess(len(pickle.dumps(donnees)), taille / 10)
+            with self.assertRaises(ValueError):
+                DonneesPartagees(simulateur)
+        return None
+
+    def test_Processus(self):
+        reference = SimulateurRetraites()
+        with DonneesPartagees(reference) as donnees:
+            arguments = [(donnees, age) for age in [62.0, 63.0, 64.0]]
+            with ProcessPoolExecutor(max_workers=2) as executeur:
+                resultats = list(executeur.map(_pilote, arguments))
+        for (P, empreinte), age in zip(resultats, [62.0, 63.0, 64.0]):
+            analyse = reference.pilotageParSoldePensionAge(Acible=age)
+            self.assertEqual(P, analyse.P[3][2050])
+            self.assertEqual(empreinte, reference.getEmpreinteDonnees())
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
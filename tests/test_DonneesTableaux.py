@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Test for DonneesTableaux class.
+"""
+
+import unittest
+from retraites.DonneesTableaux import DonneesTableaux
+from retraites.SimulateurRetraites import SimulateurRetraites
+import numpy as np
+import pickle
+
+
+class CheckDonneesTableaux(unittest.TestCase):
+    def test_Tableaux(self):
+        reference = SimulateurRetraites()
+        donnees = DonneesTableaux(reference)
+        simulateur = SimulateurRetraites(donnees_partagees=donnees)
+        self.assertIsNone(simulateur.data)
+        for nom in ["T", "NC", "EV", "PIB"]:
+            np.testing.assert_array_equal(
+                simulateur.getTableau(nom), reference.getTableau(nom)
+            )
+        self.assertEqual(
+            simulateur.getEmpreinteDonnees(), reference.getEmpreinteDonnees()
+        )
+        self.assertFalse(donnees.getTableau("NC").flags.writeable)
+        with self.assertRaises(ValueError):
+            donnees.getTableau("X")
+        # Un seul tampon, transmis hors bande
+        tampons = []
+        contenu = pickle.dumps(
+            donnees, protocol=5, buffer_callback=tampons.append
+        )
+        self.assertEqual(len(tampons), 1)
+        self.assertLess(len(contenu), 10000)
+        copie = pickle.loads(contenu, buffers=tampons)
+        np.testing.assert_array_equal(
+            copie.getTableau("EV"), donnees.getTableau("EV")
+        )
+        # Des tableaux créés à partir d'autres tableaux
+        autre = DonneesTableaux(simulateur)
+        np.testing.assert_array_equal(
+            autre.getTableau("B"), donnees.getTableau("B")
+        )
+        return None
+
+    def test_SerialiseSimulateur(self):
+        reference = SimulateurRetraites()
+        reference.setDirectoryImage("/tmp")
+        reference.activeCache(taille=8)
+        tampons = []
+        contenu = pickle.dumps(
+            reference, protocol=5, buffer_callback=tampons.append
+        )
+        self.assertLess(len(contenu), len(pickle.dumps(reference.data)) / 10)
+        simulateur = pickle.loads(contenu, buffers=tampons)
+        self.assertEqual(simulateur.getDirectoryImage(), "/tmp")
+        self.assertEqual(simulateur.taille_cache, 8)
+        self.assertEqual(
+            simulateur.getEmpreinteDonnees(), reference.getEmpreinteDonnees()
+        )
+        attendu = reference.pilotageParSoldePensionAge(Acible=63.0)
+        analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        for nom in ["T", "P", "S", "RNV", "PensionBrut"]:
+            self.assertEqual(getattr(analyse, nom), getattr(attendu, nom))
+        # Un simulateur créé à partir de tableaux se sérialise aussi
+        copie = pickle.loads(pickle.dumps(simulateur))
+        self.assertIs(copie._donnees_partagees.__class__, DonneesTableaux)
+        return None
+
+    def test_SerialiseAnalyse(self):
+        simulateur = SimulateurRetraites()
+        attendu = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        analyse.setLabelLongs(False)
+        tampons = []
+        contenu = pickle.dumps(
+            analyse, protocol=5, buffer_callback=tampons.append
+        )
+        self.assertEqual(len(tampons), 1)
+        copie = pickle.loads(contenu, buffers=tampons)
+        self.assertFalse(copie.getLabelLongs())
+        for nom in ["T", "P", "A", "S", "RNV", "REV", "Depenses", "PIB"]:
+            self.assertEqual(getattr(copie, nom), getattr(attendu, nom))
+        # Les trajectoires sont copiées à l'écriture
+        copie.S[3][2050] = 0.0
+        self.assertEqual(copie.S[3][2050], 0.0)
+        self.assertEqual(copie.S[2][2050], attendu.S[2][2050])
+        # Une analyse restreinte
+        analyse = simulateur.pilotageCOR(scenarios=[3], annees=[2050])
+        copie = pickle.loads(pickle.dumps(analyse))
+        self.assertEqual(copie.P, {3: {2050: analyse.P[3][2050]}})
+        # Une trajectoire incomplète est sérialisée attribut par attribut
+        analyse.T = {3: {}}
+        copie = pickle.loads(pickle.dumps(analyse))
+        self.assertEqual(copie.T, {3: {}})
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Test for EnsembleTrajectoires class.
+"""
+
+import unittest
+from retraites.EnsembleTrajectoires import EnsembleTrajectoires
+from matplotlib.figure import Figure
+import numpy as np
+
+
+class CheckEnsembleTrajectoires(unittest.TestCase):
+    def test_Quantiles(self):
+        np.random.seed(3)
+        annees = range(2020, 2031)
+        n = 20000
+        Y = np.random.normal(0.0, 1.0, (n, len(annees)))
+        Y += np.linspace(0.0, 1.0, len(annees))
+        ensemble = EnsembleTrajectoires(annees, [-6.0, 7.0], 1300)
+        # Ajout par blocs
+        for debut in range(0, n, 3000):
+            fin = debut + 3000
+            ensemble.ajoute(Y[debut:fin])
+        self.assertEqual(ensemble.taille, n)
+        self.assertEqual(ensemble.nombre_hors_bornes, 0)
+        niveaux = [0.05, 0.25, 0.5, 0.75, 0.95]
+        quantiles = ensemble.getQuantiles(niveaux)
+        self.assertEqual(quantiles.shape, (5, len(annees)))
+        exacts = np.quantile(Y, niveaux, axis=0)
+        np.testing.assert_allclose(quantiles, exacts, atol=0.01)
+        np.testing.assert_allclose(ensemble.getMoyenne(), np.mean(Y, axis=0))
+        with self.assertRaises(ValueError):
+            ensemble.ajoute(Y[:, 0:3])
+        # Valeurs en dehors des bornes
+        with self.assertWarns(RuntimeWarning):
+            ensemble.ajoute(np.full((2, len(annees)), 10.0))
+        self.assertEqual(ensemble.nombre_hors_bornes, 2 * len(annees))
+        self.assertEqual(ensemble.taille, n + 2)
+        return None
+
+    def test_Dessine(self):
+        np.random.seed(4)
+        annees = range(2020, 2071)
+        ensemble = EnsembleTrajectoires(annees, [-3.0, 3.0], 100)
+        ensemble.ajoute(np.random.normal(0.0, 0.5, (1000, len(annees))))
+        figure = Figure()
+        ax = ensemble.dessineEventail(ax=figure.add_subplot(2, 1, 1))
+        self.assertEqual(len(ax.collections), 2)
+        self.assertEqual(len(ax.lines), 1)
+        ax = ensemble.dessineDensite(ax=figure.add_subplot(2, 1, 2))
+        self.assertEqual(len(ax.collections), 1)
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
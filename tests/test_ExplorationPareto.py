@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Test for ExplorationPareto class.
+"""
+
+import unittest
+from retraites.ExplorationPareto import ExplorationPareto, _nonDomines
+from retraites.SimulateurRetraites import SimulateurRetraites
+import numpy as np
+
+
+class CheckExplorationPareto(unittest.TestCase):
+    def test_NonDomines(self):
+        generateur = np.random.default_rng(0)
+        for k in [1, 2, 3, 4]:
+            # Valeurs entières : nombreuses égalités
+            F = generateur.integers(0, 6, (300, k)).astype(float)
+            inferieurs = np.all(F[:, np.newaxis] <= F, axis=-1)
+            stricts = np.any(F[:, np.newaxis] < F, axis=-1)
+            attendu = ~np.any(inferieurs & stricts, axis=0)
+            np.testing.assert_array_equal(
+                _nonDomines(F, taille_bloc=7), attendu
+            )
+        return None
+
+    def test_Explore(self):
+        simulateur = SimulateurRetraites()
+        bornes = {"A": [60.0, 67.0], "T": [0.28, 0.31], "P": [0.3, None]}
+        exploration = ExplorationPareto(
+            simulateur, bornes, scenarios=[3], annees=[2030, 2050]
+        )
+        front = exploration.explore(2000, graine=0)
+        self.assertEqual(exploration.nombre_evaluations, 4000)
+        raffine = exploration.explore(2000, nombre_raffinements=2, graine=0)
+        for a in [2030, 2050]:
+            points = front[3][a]
+            self.assertGreater(len(points["A"]), 0)
+            # Solde équilibré et bornes respectées
+            np.testing.assert_allclose(points["S"], 0.0, atol=1.0e-12)
+            self.assertTrue(np.all(points["P"] >= 0.3))
+            self.assertTrue(np.all(np.diff(points["A"]) >= 0.0))
+            self.assertTrue(np.all(np.diff(points["RNV"]) > 0.0))
+            # Les points sont ceux du pilotage par solde, âge, cotisations
+            analyse = simulateur.pilotageParSoldeAgeCotisations(
+                Scible=0.0, Acible=points["A"][0], Tcible=points["T"][0]
+            )
+            self.assertAlmostEqual(analyse.P[3][a], points["P"][0])
+            self.assertAlmostEqual(analyse.RNV[3][a], points["RNV"][0])
+            # Le raffinement approche la borne du taux de cotisations
+            self.assertGreater(
+                np.median(raffine[3][a]["T"]), np.median(points["T"])
+            )
+        # L'âge est une variable déduite : les points dont la génération
+        # est hors des données d'espérance de vie sont écartés
+        exploration = ExplorationPareto(
+            simulateur,
+            {"T": [0.25, 0.32], "P": [0.25, 0.4]},
+            leviers=["T", "P"],
+            scenarios=[3],
+            annees=[2070],
+        )
+        points = exploration.evalue(
+            3, 2070, np.full(200, 0.3), np.linspace(0.25, 0.4, 200)
+        )
+        valides = np.isfinite(points["A"])
+        self.assertTrue(np.any(valides))
+        self.assertFalse(np.all(valides))
+        for nom in ["T", "P", "S", "RNV", "REV", "Depenses"]:
+            self.assertTrue(np.all(np.isnan(points[nom][~valides])))
+        points = exploration.explore(2000, graine=0)[3][2070]
+        self.assertGreater(len(points["A"]), 0)
+        for nom in points:
+            self.assertTrue(np.all(np.isfinite(points[nom])))
+        np.testing.assert_allclose(points["S"], 0.0, atol=1.0e-12)
+        analyse = simulateur.pilotageParSoldePensionCotisations(
+            Scible=0.0, Pcible=points["P"][0], Tcible=points["T"][0]
+        )
+        self.assertAlmostEqual(analyse.A[3][2070], points["A"][0])
+        with self.assertRaises(ValueError):
+            ExplorationPareto(simulateur, {"A": [60.0, 67.0]})
+        with self.assertRaises(ValueError):
+            ExplorationPareto(simulateur, bornes, {"A": "moins"})
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -80,6 +80,46 @@ class CheckFonctionPension(unittest.TestCase):
                 np.testing.assert_allclose(Y, Y_exact)
         return None
 
+    def test_TablePartagee(self):
+        """
+        Vérifie que la table d'interpolation est partagée entre les années.
+        """
+        simulateur = SimulateurRetraites()
+        modele1 = FonctionPension(simulateur, 2030)
+        modele2 = FonctionPension(simulateur, 2050)
+        self.assertIs(modele1.table, modele2.table)
+        self.assertEqual(modele1.table.valeurs.shape, (6, 3, 66))
+        # L'interpolation reproduit les données aux points de la table
+        annee = 2050
+        valeurs = modele2.table.interpole(4.5, modele2.indice_annee)
+        indice = modele2.table.getIndice("NC")
+        s = simulateur.scenario_optimiste
+        np.testing.assert_allclose(valeurs[indice], simulateur.NC[s][annee])
+        return None
+
+    def test_Echantillon(self):
+        """
+        Vérifie l'évaluation vectorisée sur un échantillon.
+        """
+        simulateur = SimulateurRetraites()
+        modele = FonctionPension(simulateur, 2040)
+        fonction = ot.Function(modele)
+        distribution = ot.ComposedDistribution(
+            [
+                ot.Uniform(-0.01, 0.01),
+                ot.Uniform(0.13, 0.15),
+                ot.Uniform(62.0, 66.0),
+                ot.Uniform(0.25, 0.75),
+                ot.Uniform(4.5, 10.0),
+            ]
+        )
+        X = distribution.getSample(20)
+        Y = fonction(X)
+        self.assertEqual(Y.getSize(), 20)
+        for i in range(20):
+            np.testing.assert_allclose(Y[i], modele._exec(X[i]))
+        return None
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,6 +8,7 @@ import unittest
 from retraites.SimulateurRetraites import SimulateurRetraites
 from retraites.ModelePensionProbabiliste import ModelePensionProbabiliste
 import openturns as ot
+import numpy as np
 
 
 class CheckModelePensionProbabiliste(unittest.TestCase):
@@ -88,6 +89,73 @@ class CheckModelePensionProbabiliste(unittest.TestCase):
 
         return None
 
+    def test_PlanExperiences(self):
+        """
+        Teste la génération des plans d'expériences.
+        """
+        simulateur = SimulateurRetraites()
+        S = 0.0
+        D = 0.14
+        annee = 2050
+        modele = ModelePensionProbabiliste(simulateur, annee, S, D)
+        taille = 64
+        for methode in modele.methodesPlanExperiences:
+            echantillon = modele.genereEchantillonEntrees(taille, methode)
+            self.assertEqual(echantillon.getSize(), taille)
+            self.assertEqual(echantillon.getDimension(), 3)
+            # Vérifie que les points sont dans le support
+            self.assertTrue(echantillon.getMin()[0] >= modele.ageMin)
+            self.assertTrue(echantillon.getMax()[0] <= modele.ageMax)
+            sortie = modele.genereEchantillonSorties(taille, methode)
+            self.assertEqual(sortie.getSize(), taille)
+            self.assertEqual(sortie.getDimension(), 1)
+        # Méthode inconnue
+        with self.assertRaises(TypeError):
+            modele.genereEchantillonEntrees(taille, "Inconnue")
+        return None
+
+    def test_Convergence(self):
+        """
+        Teste le calcul de la convergence de la moyenne et des quantiles.
+        """
+        ot.RandomGenerator.SetSeed(0)
+        simulateur = SimulateurRetraites()
+        S = 0.0
+        D = 0.14
+        annee = 2050
+        modele = ModelePensionProbabiliste(simulateur, annee, S, D)
+        niveauxQuantiles = [0.1, 0.9]
+        resultats = dict()
+        for methode in ["MonteCarlo", "Sobol"]:
+            resultat = modele.calculeConvergence(
+                256,
+                methode,
+                nombreRepetitions=5,
+                niveauxQuantiles=niveauxQuantiles,
+                nombreTailles=4,
+            )
+            self.assertEqual(resultat["taille"], [32, 64, 128, 256])
+            self.assertEqual(resultat["moyenne"].shape, (4,))
+            self.assertEqual(resultat["ecartTypeMoyenne"].shape, (4,))
+            self.assertEqual(resultat["quantiles"].shape, (4, 2))
+            self.assertEqual(resultat["ecartTypeQuantiles"].shape, (4, 2))
+            resultats[methode] = resultat
+        # Les deux méthodes estiment la même moyenne
+        np.testing.assert_allclose(
+            resultats["Sobol"]["moyenne"][-1],
+            resultats["MonteCarlo"]["moyenne"][-1],
+            atol=0.01,
+        )
+        # La moyenne QMC randomisée est plus précise que Monte-Carlo
+        self.assertLess(
+            resultats["Sobol"]["ecartTypeMoyenne"][-1],
+            resultats["MonteCarlo"]["ecartTypeMoyenne"][-1],
+        )
+        # Au moins deux répétitions sont nécessaires
+        with self.assertRaises(ValueError):
+            modele.calculeConvergence(256, nombreRepetitions=1)
+        return None
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Test for NoyauxCompiles module.
+"""
+
+import unittest
+from retraites import NoyauxCompiles
+from retraites.SimulateurRetraites import SimulateurRetraites
+import numpy as np
+
+
+class CheckNoyauxCompiles(unittest.TestCase):
+    def test_noyauSorties(self):
+        # Les boucles, compilées ou non, donnent les résultats de NumPy
+        simulateur = SimulateurRetraites()
+        simulateur.setMoteur("numpy")
+        conjoncture = simulateur.genereConjoncture([1.0, 1.3, 1.8], 7.0)
+        c = simulateur._fenetreFuture(conjoncture)
+        As = np.array([[62.0], [63.5], [65.0]])
+        Ts = np.full((3, 1), 0.3)
+        Ps = np.full((3, 1), 0.5)
+        reference = simulateur._noyau_S_RNV_REV(c, Ts, Ps, As)
+        sorties = NoyauxCompiles.noyauSorties(
+            c, Ts, Ps, As, simulateur.annees_EV[0]
+        )
+        for v, v_reference in zip(sorties, reference):
+            np.testing.assert_array_equal(v, v_reference)
+        with self.assertRaises(ValueError):
+            NoyauxCompiles.noyauSorties(
+                c, Ts, Ps, As + 100.0, simulateur.annees_EV[0]
+            )
+        return None
+
+    def test_noyauFixantAsRNVS(self):
+        simulateur = SimulateurRetraites()
+        simulateur.setMoteur("numpy")
+        c = simulateur._fenetreFuture(simulateur._getConjonctureCOR())
+        reference = simulateur._noyau_fixant_As_RNV_S(c, 63.0, 0.9, 0.0)
+        leviers = NoyauxCompiles.noyauFixantAsRNVS(c, 63.0, 0.9, 0.0)
+        for v, v_reference in zip(leviers, reference):
+            np.testing.assert_array_equal(v, v_reference)
+        return None
+
+    def test_Moteur(self):
+        simulateur = SimulateurRetraites()
+        if NoyauxCompiles.estDisponible():
+            self.assertEqual(simulateur.getMoteur(), "numba")
+            analyse = simulateur.pilotageParAgeEtNiveauDeVie(63.0, 0.9, 0.0)
+            simulateur.setMoteur("numpy")
+            reference = simulateur.pilotageParAgeEtNiveauDeVie(63.0, 0.9, 0.0)
+            self.assertEqual(analyse.P[3][2050], reference.P[3][2050])
+        else:
+            self.assertEqual(simulateur.getMoteur(), "numpy")
+            with self.assertRaises(ValueError):
+                simulateur.setMoteur("numba")
+        with self.assertRaises(ValueError):
+            simulateur.setMoteur("fortran")
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
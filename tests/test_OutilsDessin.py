@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Test for OutilsDessin module.
+"""
+
+import unittest
+from matplotlib.figure import Figure
+from retraites import OutilsDessin
+import numpy as np
+
+
+class CheckOutilsDessin(unittest.TestCase):
+    def test_TableauDessin(self):
+        annees = [2020, 2021, 2022, 2023]
+        tableau = np.arange(8.0).reshape((2, 4))
+        # Années consécutives : une vue sur le tableau
+        Y = OutilsDessin.tableauDessin(tableau, None, annees, [2021, 2022])
+        np.testing.assert_equal(Y, [[1.0, 2.0], [5.0, 6.0]])
+        self.assertTrue(np.shares_memory(Y, tableau))
+        Y = OutilsDessin.tableauDessin(tableau, None, annees, [2020, 2023])
+        np.testing.assert_equal(Y, [[0.0, 3.0], [4.0, 7.0]])
+        trajectoire = {1: {2020: 1.0, 2021: 2.0}, 2: {2020: 3.0, 2021: 4.0}}
+        Y = OutilsDessin.tableauDessin(trajectoire, [2], annees, [2021])
+        np.testing.assert_equal(Y, [[4.0]])
+        # Années non consécutives, par exemple d'une analyse restreinte
+        Y = OutilsDessin.tableauDessin(
+            tableau, None, [2020, 2030, 2050, 2070], [2050, 2070]
+        )
+        np.testing.assert_equal(Y, [[2.0, 3.0], [6.0, 7.0]])
+        Y = OutilsDessin.tableauDessin(
+            tableau, None, [2020, 2030, 2050, 2070], [2020, 2050]
+        )
+        np.testing.assert_equal(Y, [[0.0, 2.0], [4.0, 6.0]])
+        with self.assertRaises(ValueError):
+            OutilsDessin.tableauDessin(
+                tableau, None, [2020, 2030, 2050, 2070], [2040]
+            )
+        with self.assertRaises(ValueError):
+            OutilsDessin.tableauDessin(tableau, None, annees, [2024])
+        with self.assertRaises(ValueError):
+            OutilsDessin.tableauDessin(tableau, None, annees[:3], [2020])
+        return None
+
+    def test_DessineEnsemble(self):
+        ax = Figure().add_subplot()
+        Y = np.random.default_rng(0).normal(size=(50, 4))
+        collection = OutilsDessin.dessineEnsemble(ax, [1, 2, 3, 4], Y, 20)
+        self.assertLessEqual(len(collection.get_segments()), 20)
+        self.assertEqual(list(ax.collections), [collection])
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Test for RegionAdmissible class.
+"""
+
+import unittest
+from retraites.RegionAdmissible import RegionAdmissible
+from retraites.SimulateurRetraites import SimulateurRetraites
+import numpy as np
+
+
+class CheckRegionAdmissible(unittest.TestCase):
+    def test_IntervallesAge(self):
+        simulateur = SimulateurRetraites()
+        bornes = {"T": [None, 0.3], "RNV": [0.9, None], "A": [None, 65.0]}
+        region = RegionAdmissible(simulateur, bornes)
+        annees = [2030, 2050, 2070]
+        intervalles = region.calculeIntervallesAge([1, 3], annees)
+        self.assertEqual(intervalles[3][2070], [])
+        for s in [1, 3]:
+            for a in annees:
+                # Les âges admissibles sont ceux où Tmin <= Tmax
+                A = np.linspace(60.0, 65.0, 501)
+                Tmin, Tmax = region.calculeIntervalleCotisations(s, a, A)
+                dedans = np.zeros(A.shape, dtype=bool)
+                for Amin, Amax in intervalles[s][a]:
+                    self.assertLessEqual(60.0, Amin)
+                    self.assertLessEqual(Amin, Amax)
+                    self.assertLessEqual(Amax, 65.0)
+                    dedans |= (A >= Amin - 1.0e-9) & (A <= Amax + 1.0e-9)
+                np.testing.assert_array_equal(Tmin <= Tmax, dedans)
+        return None
+
+    def test_Pilotage(self):
+        # Le milieu de chaque région respecte les bornes
+        simulateur = SimulateurRetraites()
+        bornes = {
+            "T": [0.28, 0.31],
+            "P": [0.3, 0.4],
+            "RNV": [0.8, None],
+            "Depenses": [None, 0.14],
+        }
+        region = RegionAdmissible(simulateur, bornes)
+        annees = [2030, 2050, 2070]
+        intervalles = region.calculeIntervallesAge([3], annees)
+        Acible = simulateur.genereTrajectoire("A", 62.0)
+        Tcible = simulateur.genereTrajectoire("T", 0.3)
+        for a in annees:
+            self.assertEqual(len(intervalles[3][a]), 1)
+            Amin, Amax = intervalles[3][a][0]
+            A = 0.5 * (Amin + Amax)
+            Tmin, Tmax = region.calculeIntervalleCotisations(3, a, A)
+            Acible[3][a] = A
+            Tcible[3][a] = 0.5 * (Tmin + Tmax)
+        analyse = simulateur.pilotageParSoldeAgeCotisations(
+            0.0, Acible, Tcible, scenarios=[3], annees=annees
+        )
+        for a in annees:
+            self.assertAlmostEqual(analyse.S[3][a], 0.0)
+            self.assertTrue(0.3 - 1.0e-12 <= analyse.P[3][a] <= 0.4 + 1.0e-12)
+            self.assertGreaterEqual(analyse.RNV[3][a], 0.8 - 1.0e-12)
+            self.assertLessEqual(analyse.Depenses[3][a], 0.14 + 1.0e-12)
+        return None
+
+    def test_Erreurs(self):
+        simulateur = SimulateurRetraites()
+        with self.assertRaises(ValueError):
+            RegionAdmissible(simulateur, {"S": [0.0, None]})
+        with self.assertRaises(ValueError):
+            RegionAdmissible(simulateur, {"RNV": [0.0, None]})
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Test for RenduSimulation class.
+"""
+
+import unittest
+from retraites.SimulateurRetraites import SimulateurRetraites
+from retraites.RenduSimulation import RenduSimulation
+import numpy as np
+import tempfile
+import os
+
+
+class CheckRenduSimulation(unittest.TestCase):
+    def test_Dessine(self):
+        simulateur = SimulateurRetraites()
+        analyses = [
+            simulateur.pilotageParSoldePensionAge(Acible=age)
+            for age in [62.0, 63.0, 64.0]
+        ]
+        rendu = RenduSimulation(analyses[0], titre="Balayage")
+        self.assertEqual(len(rendu.axes), 6)
+        # La figure est réutilisée et les courbes mises à jour
+        figure = rendu.dessine(analyses[2])
+        self.assertIs(figure, rendu.figure)
+        ligne = rendu.lignes["A"][simulateur.scenario_central]
+        y = ligne.get_ydata()
+        i = simulateur.annees.index(2050)
+        np.testing.assert_allclose(y[i], 64.0)
+        ligne = rendu.lignes["P"][simulateur.scenario_central]
+        P = analyses[2].P[simulateur.scenario_central][2050]
+        np.testing.assert_allclose(ligne.get_ydata()[i], 100.0 * P)
+        return None
+
+    def test_Exporte(self):
+        simulateur = SimulateurRetraites()
+        analyses = [
+            simulateur.pilotageParSoldePensionAge(Acible=age)
+            for age in [62.0, 63.0, 64.0]
+        ]
+        with tempfile.TemporaryDirectory() as repertoire:
+            analyses[0].setDirectoryImage(repertoire)
+            analyses[0].setImageFormats(["png"])
+            analyses[0].setAfficheMessageEcriture(False)
+            rendu = RenduSimulation(analyses[0])
+            noms = ["age-62", "age-63", "age-64"]
+            rendu.exporte(analyses, noms, nombre_processus=2)
+            for nom in noms:
+                chemin = os.path.join(repertoire, nom + ".png")
+                self.assertTrue(os.path.exists(chemin))
+            with self.assertRaises(ValueError):
+                rendu.exporte(analyses, noms[0:2])
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Test for ServeurPilotage class.
+"""
+
+import unittest
+from retraites.ServeurPilotage import ServeurPilotage
+from retraites.SimulateurRetraites import SimulateurRetraites
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+import http.client
+import numpy as np
+import json
+
+
+class CheckServeurPilotage(unittest.TestCase):
+    def test_Evalue(self):
+        serveur = ServeurPilotage(nombre_simulateurs=2, taille_cache=2)
+        requete = {"methode": "pilotageParSoldePensionAge", "Acible": 63}
+        reponse = json.loads(serveur.evalue(requete))
+        simulateur = SimulateurRetraites()
+        analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        for nom in ["S", "RNV", "REV", "A", "T", "P", "Depenses"]:
+            np.testing.assert_allclose(reponse[nom], analyse.getTableau(nom))
+        # Les cibles normalisées donnent la même clé
+        requete = {
+            "methode": "pilotageParSoldePensionAge",
+            "Acible": "63.0",
+            "Scible": None,
+        }
+        serveur.evalue(requete)
+        statistiques = serveur.getStatistiquesCache()
+        self.assertEqual(statistiques["succes"], 1)
+        self.assertEqual(statistiques["echecs"], 1)
+        # Le cache est borné
+        serveur.evalue({"methode": "pilotageCOR"})
+        serveur.evalue({"methode": "pilotageParSoldePensionAge"})
+        self.assertEqual(serveur.getStatistiquesCache()["taille"], 2)
+        with self.assertRaises(ValueError):
+            serveur.evalue({"methode": "__init__"})
+        with self.assertRaises(ValueError):
+            serveur.evalue({"methode": "pilotageCOR", "Acible": 63.0})
+        with self.assertRaises(ValueError):
+            serveur.evalue(
+                {"methode": "pilotageParSoldePensionAge", "Acible": "a"}
+            )
+        # Les valeurs non finies sont refusées et ne remplissent pas le
+        # cache
+        statistiques = serveur.getStatistiquesCache()
+        for valeur in ["nan", "inf", "-Infinity", float("nan")]:
+            with self.assertRaises(ValueError):
+                serveur.evalue(
+                    {"methode": "pilotageParSoldePensionAge", "Acible": valeur}
+                )
+        self.assertEqual(serveur.getStatistiquesCache(), statistiques)
+        return None
+
+    def test_HTTP(self):
+        serveur = ServeurPilotage(port=0, nombre_simulateurs=1)
+        serveur.demarre()
+        try:
+            url = "http://%s:%d" % (serveur.adresse, serveur.port)
+            with urlopen(url + "/sante") as reponse:
+                self.assertEqual(json.loads(reponse.read())["statut"], "ok")
+            with urlopen(
+                url + "/pilotage?methode=pilotageParSoldePensionAge&Acible=63"
+            ) as reponse:
+                resultat_get = json.loads(reponse.read())
+            contenu = json.dumps(
+                {"methode": "pilotageParSoldePensionAge", "Acible": 63.0}
+            ).encode("utf-8")
+            requete = Request(url + "/pilotage", data=contenu)
+            with urlopen(requete) as reponse:
+                resultat_post = json.loads(reponse.read())
+            self.assertEqual(resultat_get, resultat_post)
+            self.assertEqual(serveur.getStatistiquesCache()["succes"], 1)
+            with self.assertRaises(HTTPError) as contexte:
+                urlopen(url + "/pilotage?methode=inconnue")
+            self.assertEqual(contexte.exception.code, 400)
+            with self.assertRaises(HTTPError) as contexte:
+                urlopen(
+                    url + "/pilotage?methode=pilotageParSoldePensionAge"
+                    "&Acible=nan"
+                )
+            self.assertEqual(contexte.exception.code, 400)
+            with self.assertRaises(HTTPError) as contexte:
+                urlopen(url + "/inconnu")
+            self.assertEqual(contexte.exception.code, 404)
+            # En-tête Content-Length invalide
+            for longueur in ["abc", "-1"]:
+                connexion = http.client.HTTPConnection(
+                    serveur.adresse, serveur.port, timeout=10
+                )
+                connexion.putrequest("POST", "/pilotage")
+                connexion.putheader("Content-Length", longueur)
+                connexion.endheaders()
+                reponse = connexion.getresponse()
+                self.assertEqual(reponse.status, 400)
+                self.assertIn(
+                    "Content-Length", json.loads(reponse.read())["erreur"]
+                )
+                connexion.close()
+        finally:
+            serveur.arrete()
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Test for SimulateurAsynchrone class.
+"""
+
+import unittest
+from retraites.SimulateurAsynchrone import SimulateurAsynchrone
+from retraites.SimulateurRetraites import SimulateurRetraites
+from retraites.ModelePensionProbabiliste import ModelePensionProbabiliste
+from concurrent.futures import ThreadPoolExecutor
+import openturns as ot
+import numpy as np
+import asyncio
+import time
+
+
+class CheckSimulateurAsynchrone(unittest.TestCase):
+    def test_Pilote(self):
+        simulateur = SimulateurRetraites()
+        asynchrone = SimulateurAsynchrone(simulateur)
+
+        async def calcule():
+            analyses = await asyncio.gather(
+                asynchrone.pilote("pilotageCOR"),
+                asynchrone.pilote(
+                    "pilotageParSoldePensionAge", {"Acible": 63.0}, 60.0
+                ),
+                asynchrone.calculeAge(0.30),
+            )
+            return analyses
+
+        analyseCOR, analyse, As = asyncio.run(calcule())
+        reference = SimulateurRetraites().pilotageParSoldePensionAge(
+            Acible=63.0
+        )
+        for s in simulateur.scenarios:
+            for a in simulateur.annees:
+                self.assertEqual(analyse.P[s][a], reference.P[s][a])
+        self.assertEqual(analyseCOR.A[1][2050], simulateur.A[1][2050])
+        self.assertEqual(set(As.keys()), set(simulateur.scenarios))
+        # Mauvaise méthode
+        with self.assertRaises(TypeError):
+            asyncio.run(asynchrone.pilote("calculeAge"))
+        return None
+
+    def test_EtudeImpactEtFonctionPension(self):
+        simulateur = SimulateurRetraites()
+        asynchrone = SimulateurAsynchrone(simulateur)
+        analyse = asyncio.run(asynchrone.calculeEtudeImpact())
+        self.assertEqual(len(analyse.P), len(simulateur.scenarios))
+        X = ot.Sample([[0.0, 0.14, 63.0, 0.5, 7.0]] * 3)
+        Y = asyncio.run(asynchrone.evalueFonctionPension(2050, X))
+        self.assertEqual(Y.getSize(), 3)
+        self.assertAlmostEqual(Y[0, 0], Y[2, 0])
+        return None
+
+    def test_Delai(self):
+        simulateur = SimulateurRetraites()
+        with ThreadPoolExecutor(max_workers=1) as executeur:
+            asynchrone = SimulateurAsynchrone(simulateur, executeur)
+
+            async def calcule():
+                await asynchrone._execute(lambda: time.sleep(1.0), 0.01)
+
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(calcule())
+        return None
+
+    def test_genereEchantillonSortiesParBlocs(self):
+        simulateur = SimulateurRetraites()
+        modele = ModelePensionProbabiliste(simulateur, 2050, 0.0, 0.14)
+        asynchrone = SimulateurAsynchrone(simulateur)
+        # Enregistre la taille de chaque bloc évalué
+        evaluations = []
+        getFonction = modele.getFonction
+
+        def getFonctionEnregistree():
+            fonction = getFonction()
+
+            def evalue(bloc):
+                evaluations.append(bloc.getSize())
+                return fonction(bloc)
+
+            return evalue
+
+        modele.getFonction = getFonctionEnregistree
+
+        async def calcule(nombre_blocs_max):
+            blocs = []
+            generateur = asynchrone.genereEchantillonSortiesParBlocs(
+                modele, 250, 100, "LHS"
+            )
+            async for bloc in generateur:
+                blocs.append(bloc)
+                if len(blocs) == nombre_blocs_max:
+                    break
+            await generateur.aclose()
+            return blocs
+
+        blocs = asyncio.run(calcule(None))
+        self.assertEqual([bloc.getSize() for bloc in blocs], [100, 100, 50])
+        self.assertEqual(evaluations, [100, 100, 50])
+        self.assertEqual(blocs[0].getDimension(), 1)
+        self.assertTrue(np.all(np.isfinite(np.array(blocs[2]))))
+        # Arrêt anticipé : les blocs suivants ne sont pas calculés
+        del evaluations[:]
+        blocs = asyncio.run(calcule(1))
+        self.assertEqual(len(blocs), 1)
+        self.assertEqual(evaluations, [100])
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright Michaël Baudin
+"""
+Test for TableInterpolation class.
+"""
+
+import unittest
+from retraites.TableInterpolation import TableInterpolation
+from scipy import interpolate
+import numpy as np
+
+
+class CheckTableInterpolation(unittest.TestCase):
+    def test_Interpole(self):
+        abscisses = [4.5, 7.0, 10.0]
+        # Deux variables, trois abscisses, quatre années
+        valeurs = np.array(
+            [
+                [
+                    [1.0, 2.0, 3.0, 4.0],
+                    [2.0, 3.0, 5.0, 7.0],
+                    [0.0, 1.0, 2.0, 3.0],
+                ],
+                [
+                    [5.0, 5.0, 5.0, 5.0],
+                    [6.0, 7.0, 8.0, 9.0],
+                    [1.0, 2.0, 4.0, 8.0],
+                ],
+            ]
+        )
+        table = TableInterpolation(abscisses, valeurs, ["X", "Y"])
+        self.assertEqual(table.getIndice("Y"), 1)
+        self.assertEqual(table.pentes.shape, (2, 2, 4))
+        # Toutes les années à la fois
+        x = 8.2
+        y = table.interpole(x)
+        self.assertEqual(y.shape, (2, 4))
+        for k in range(2):
+            for j in range(4):
+                interpolateur = interpolate.interp1d(
+                    abscisses, valeurs[k, :, j]
+                )
+                np.testing.assert_allclose(y[k, j], interpolateur(x))
+        # Un tableau d'abscisses pour une année donnée
+        x = np.array([4.5, 5.0, 7.0, 9.9, 10.0])
+        j = 2
+        y = table.interpole(x, j)
+        self.assertEqual(y.shape, (2, 5))
+        for k in range(2):
+            interpolateur = interpolate.interp1d(abscisses, valeurs[k, :, j])
+            np.testing.assert_allclose(y[k], interpolateur(x))
+        # Une abscisse par année
+        x = np.array([5.0, 6.0, 8.0, 9.0])
+        y = table.interpole(x[np.newaxis, :])
+        self.assertEqual(y.shape, (2, 1, 4))
+        for j in range(4):
+            np.testing.assert_allclose(y[:, 0, j], table.interpole(x[j], j))
+        # En dehors des bornes
+        with self.assertRaises(ValueError):
+            table.interpole(3.0)
+        with self.assertRaises(ValueError):
+            table.interpole([5.0, 11.0], 0)
+        return None
+
+    def test_Erreurs(self):
+        valeurs = np.zeros((1, 2, 3))
+        with self.assertRaises(ValueError):
+            TableInterpolation([1.0, 0.0], valeurs, ["X"])
+        with self.assertRaises(ValueError):
+            TableInterpolation([0.0, 1.0], valeurs, ["X", "Y"])
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
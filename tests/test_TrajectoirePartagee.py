@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Test for TrajectoirePartagee class.
+"""
+
+import unittest
+from retraites.TrajectoirePartagee import TrajectoirePartagee
+from retraites.SimulateurRetraites import SimulateurRetraites
+import numpy as np
+import copy
+import pickle
+
+
+class CheckTrajectoirePartagee(unittest.TestCase):
+    def test_CopieAEcriture(self):
+        tableau = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        trajectoire = TrajectoirePartagee([1, 2], [2020, 2021, 2022], tableau)
+        self.assertEqual(trajectoire[2][2021], 5.0)
+        self.assertEqual(list(trajectoire[1].keys()), [2020, 2021, 2022])
+        self.assertEqual(
+            trajectoire,
+            {
+                1: {2020: 1.0, 2021: 2.0, 2022: 3.0},
+                2: {2020: 4.0, 2021: 5.0, 2022: 6.0},
+            },
+        )
+        copie = copy.deepcopy(trajectoire)
+        # Les valeurs sont partagées
+        self.assertIs(copie[1]._valeurs, trajectoire[1]._valeurs)
+        copie[1][2021] = 10.0
+        self.assertEqual(copie[1][2021], 10.0)
+        self.assertEqual(trajectoire[1][2021], 2.0)
+        # Seule la ligne modifiée est copiée
+        self.assertIsNot(copie[1]._valeurs, trajectoire[1]._valeurs)
+        self.assertIs(copie[2]._valeurs, trajectoire[2]._valeurs)
+        trajectoire[2][2020] = 7.0
+        self.assertEqual(copie[2][2020], 4.0)
+        np.testing.assert_equal(
+            copie.getTableau(), [[1.0, 10.0, 3.0], [4.0, 5.0, 6.0]]
+        )
+        self.assertEqual(pickle.loads(pickle.dumps(copie)), copie)
+        with self.assertRaises(KeyError):
+            copie[1][2030] = 1.0
+        with self.assertRaises(TypeError):
+            del copie[1][2020]
+        with self.assertRaises(ValueError):
+            TrajectoirePartagee([1], [2020], tableau)
+        return None
+
+    def test_LectureSeule(self):
+        tableau = np.array([[1.0, 2.0], [3.0, 4.0]])
+        trajectoire = TrajectoirePartagee(
+            [1, 2], [2020, 2021], tableau, lecture_seule=True
+        )
+        with self.assertRaises(TypeError):
+            trajectoire[1][2020] = 0.0
+        self.assertEqual(trajectoire[1][2020], 1.0)
+        # Les copies sont modifiables
+        for copie in [trajectoire.copie(), copy.deepcopy(trajectoire)]:
+            copie[1][2020] = 0.0
+            self.assertEqual(copie[1][2020], 0.0)
+        self.assertEqual(trajectoire[1][2020], 1.0)
+        copie = pickle.loads(pickle.dumps(trajectoire))
+        self.assertTrue(copie.lecture_seule)
+        with self.assertRaises(TypeError):
+            copie[1][2020] = 0.0
+        return None
+
+    def test_Simulateur(self):
+        simulateur = SimulateurRetraites()
+        Ss = simulateur.genereTrajectoire("S")
+        # La trajectoire partage le tableau du COR
+        sorties = simulateur._getSortiesCOR()
+        self.assertTrue(np.shares_memory(Ss[3]._valeurs, sorties["S"]))
+        Ss[3][2030] = 0.0
+        j = simulateur.annees.index(2030)
+        self.assertNotEqual(sorties["S"][2, j], 0.0)
+        self.assertEqual(simulateur.genereTrajectoire("S", Ss)[3][2030], 0.0)
+        # Les trajectoires du COR sont en lecture seule
+        for nom in ["T", "P", "A", "NC", "EV"]:
+            trajectoire = getattr(simulateur, nom)
+            a = trajectoire.annees[-1]
+            with self.assertRaises(TypeError):
+                trajectoire[3][a] += 1.0
+        analyse = simulateur.pilotageCOR()
+        analyse.A[3][2040] += 1.0
+        self.assertEqual(analyse.A[3][2040], simulateur.A[3][2040] + 1.0)
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,10 @@ from retraites.SimulateurRetraites import SimulateurRetraites
 import pylab as pl
 import numpy as np
 import tempfile
+import pickle
+import threading
 import os
+from matplotlib.figure import Figure
 
 
 class CheckSimulateur(unittest.TestCase):
@@ -901,6 +904,586 @@ class CheckSimulateur(unittest.TestCase):
                 )
         return None
 
+    def test_getTableau(self):
+        simulateur = SimulateurRetraites()
+        NC = simulateur.getTableau("NC")
+        self.assertEqual(
+            NC.shape, (len(simulateur.scenarios), len(simulateur.annees))
+        )
+        EV = simulateur.getTableau("EV")
+        self.assertEqual(
+            EV.shape, (len(simulateur.scenarios), len(simulateur.annees_EV))
+        )
+        for i, s in enumerate(simulateur.scenarios):
+            for j, a in enumerate(simulateur.annees):
+                self.assertEqual(NC[i, j], simulateur.NC[s][a])
+            for j, a in enumerate(simulateur.annees_EV):
+                self.assertEqual(EV[i, j], simulateur.EV[s][a])
+        # Le tableau est calculé une seule fois et protégé en écriture
+        self.assertIs(simulateur.getTableau("NC"), NC)
+        with self.assertRaises(ValueError):
+            NC[0, 0] = 0.0
+        return None
+
+    def test_genereConjoncture(self):
+        simulateur = SimulateurRetraites()
+        # Les scénarios du COR sont reproduits
+        croissance = [
+            simulateur.scenarios_croissance[s] for s in simulateur.scenarios
+        ]
+        chomage = [
+            simulateur.scenarios_chomage[s] for s in simulateur.scenarios
+        ]
+        conjoncture = simulateur.genereConjoncture(croissance, chomage)
+        for nom in ["T", "P", "NC", "NR", "dP", "B", "CNV", "PIB"]:
+            np.testing.assert_allclose(
+                conjoncture[nom], simulateur.getTableau(nom), rtol=1.0e-12
+            )
+        # Conjonctures intermédiaires
+        conjoncture = simulateur.genereConjoncture([1.1, 1.4, 1.7], 8.0)
+        self.assertEqual(conjoncture["NC"].shape, (3, len(simulateur.annees)))
+        with self.assertRaises(ValueError):
+            simulateur.genereConjoncture(3.0, 7.0)
+        with self.assertRaises(ValueError):
+            simulateur.genereConjoncture(1.3, 12.0)
+        return None
+
+    def test_pilotageConjonctures(self):
+        simulateur = SimulateurRetraites()
+        croissance = [
+            simulateur.scenarios_croissance[s] for s in simulateur.scenarios
+        ]
+        chomage = [
+            simulateur.scenarios_chomage[s] for s in simulateur.scenarios
+        ]
+        # Aux scénarios du COR, on retrouve les méthodes de pilotage
+        analyse = simulateur.pilotageParSoldePensionAge(
+            Scible=0.0, Pcible=0.5, Acible=63.0
+        )
+        resultat = simulateur.pilotageConjonctures(
+            croissance,
+            chomage,
+            "pilotageParSoldePensionAge",
+            Scible=0.0,
+            Pcible=0.5,
+            Acible=63.0,
+        )
+        for nom in [
+            "T",
+            "P",
+            "A",
+            "S",
+            "RNV",
+            "REV",
+            "Depenses",
+            "PensionBrut",
+        ]:
+            tableau = simulateur._versTableau(getattr(analyse, nom))
+            np.testing.assert_allclose(
+                resultat[nom], tableau, rtol=1.0e-12, atol=1.0e-14
+            )
+        # Statu quo pour une grille de conjonctures
+        resultat = simulateur.pilotageConjonctures(
+            np.linspace(1.0, 1.8, 5), np.linspace(4.5, 10.0, 5)
+        )
+        self.assertEqual(resultat["S"].shape, (5, len(simulateur.annees)))
+        # Cible par conjoncture
+        Acible = np.array([[62.0], [63.0], [64.0]])
+        resultat = simulateur.pilotageConjonctures(
+            1.3, 7.0, "pilotageParSoldeAgeCotisations", Acible=Acible
+        )
+        i = simulateur.annees.index(2050)
+        np.testing.assert_allclose(resultat["A"][:, i], [62.0, 63.0, 64.0])
+        # Erreurs
+        with self.assertRaises(TypeError):
+            simulateur.pilotageConjonctures(1.3, 7.0, "pilotageInconnu")
+        with self.assertRaises(ValueError):
+            simulateur.pilotageConjonctures(1.3, 7.0, Acible=63.0)
+        return None
+
+    def test_pilotageStochastique(self):
+        simulateur = SimulateurRetraites()
+        np.random.seed(1)
+        n = 50
+        nombre_annees = len(simulateur.annees_futures)
+        bruit = np.random.normal(0.0, 0.1, (n, nombre_annees))
+        croissance = np.clip(1.3 + np.cumsum(bruit, axis=1), 1.0, 1.8)
+        chomage = np.full((n, nombre_annees), 7.0)
+        resultat, quantiles = simulateur.pilotageStochastique(
+            croissance,
+            chomage,
+            "pilotageParSoldePensionAge",
+            Scible=0.0,
+            Acible=63.0,
+            tailleBloc=7,
+        )
+        self.assertEqual(resultat["P"].shape, (n, len(simulateur.annees)))
+        self.assertEqual(quantiles["P"].shape, (5, len(simulateur.annees)))
+        # Calcul par blocs identique au calcul direct
+        direct = simulateur.pilotageConjonctures(
+            croissance,
+            chomage,
+            "pilotageParSoldePensionAge",
+            Scible=0.0,
+            Acible=63.0,
+        )
+        for nom in resultat:
+            np.testing.assert_array_equal(resultat[nom], direct[nom])
+        # Le PIB est composé avec la croissance de chaque année
+        i = simulateur.annees.index(2030)
+        np.testing.assert_allclose(
+            resultat["PIB"][:, i],
+            resultat["PIB"][:, i - 1]
+            * (1.0 + croissance[:, i - simulateur.annees.index(2020)] / 100.0),
+        )
+        # Une trajectoire constante reproduit le scénario central
+        central = simulateur.pilotageConjonctures(1.3, 7.0)
+        resultat, quantiles = simulateur.pilotageStochastique(
+            np.full((2, nombre_annees), 1.3), 7.0
+        )
+        np.testing.assert_allclose(
+            resultat["S"], np.repeat(central["S"], 2, 0)
+        )
+        return None
+
+    def test_graphiquesObjets(self):
+        # Graphiques sans l'état global de pylab, dans des threads
+        simulateur = SimulateurRetraites()
+        simulateur.setAfficheMessageEcriture(False)
+        analyse = simulateur.pilotageCOR()
+        analyse.setAfficheMessageEcriture(False)
+        pl.close("all")
+        # Les exceptions des threads sont levées dans le thread principal
+        erreurs = []
+
+        def dessine(repertoire, i):
+            try:
+                figure = analyse.dessineSimulation(figure=Figure((6, 8)))
+                self.assertEqual(len(figure.axes), 6)
+                analyse.sauveFigure(
+                    os.path.join(repertoire, "sim%d" % i), figure
+                )
+                figure = Figure()
+                ax = analyse.dessineVariable("RNV", ax=figure.add_subplot())
+                self.assertEqual(len(ax.lines), len(simulateur.scenarios))
+                figure = simulateur.dessineConjoncture(figure=Figure((10, 8)))
+                self.assertEqual(len(figure.axes), 9)
+                figure = simulateur.dessineLegende(figure=Figure((6, 2)))
+                simulateur.sauveFigure(
+                    os.path.join(repertoire, "leg%d" % i), figure
+                )
+            except Exception as erreur:
+                erreurs.append(erreur)
+            return None
+
+        with tempfile.TemporaryDirectory() as repertoire:
+            analyse.setDirectoryImage(repertoire)
+            simulateur.setDirectoryImage(repertoire)
+            analyse.setImageFormats(["png"])
+            simulateur.setImageFormats(["png"])
+            threads = [
+                threading.Thread(target=dessine, args=(repertoire, i))
+                for i in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for erreur in erreurs:
+                raise erreur
+            self.assertEqual(len(os.listdir(repertoire)), 8)
+        # Aucune figure pylab n'a été créée
+        self.assertEqual(pl.get_fignums(), [])
+        # Les axes de la figure courante sont réutilisés
+        for i in range(2):
+            figure = analyse.dessineSimulation()
+            self.assertEqual(len(figure.axes), 6)
+        pl.close("all")
+        return None
+
+    def test_dessineEnsemble(self):
+        # Superpose un grand nombre de trajectoires
+        simulateur = SimulateurRetraites()
+        analyse = simulateur.pilotageCOR()
+        np.random.seed(2)
+        n = 2000
+        nombre_annees = len(simulateur.annees_futures)
+        croissance = np.random.uniform(1.0, 1.8, (n, nombre_annees))
+        resultat, _ = simulateur.pilotageStochastique(croissance, 7.0)
+        figure = Figure()
+        ax = analyse.dessineVariable(
+            "S", resultat["S"], ax=figure.add_subplot()
+        )
+        self.assertEqual(len(ax.collections), 1)
+        self.assertEqual(len(ax.collections[0].get_segments()), n)
+        self.assertEqual(len(ax.lines), 0)
+        ax = analyse.dessineVariable(
+            "S",
+            resultat["S"],
+            ax=figure.add_subplot(),
+            nombre_max_courbes=100,
+            dessine_annees=simulateur.annees_futures,
+        )
+        segments = ax.collections[0].get_segments()
+        self.assertEqual(len(segments), 100)
+        self.assertEqual(len(segments[0]), nombre_annees)
+        np.testing.assert_allclose(
+            segments[-1][:, 1], 100.0 * resultat["S"][-1, -nombre_annees:]
+        )
+        ax = simulateur.dessineVariable(
+            "NC", simulateur.getTableau("NC"), ax=figure.add_subplot()
+        )
+        self.assertEqual(len(ax.collections), 1)
+        with self.assertRaises(ValueError):
+            analyse.dessineVariable(
+                "S", resultat["S"][:, 0:10], ax=figure.add_subplot()
+            )
+        return None
+
+    def test_activeCache(self):
+        # Mémorisation des résultats des pilotages
+        simulateur = SimulateurRetraites()
+        self.assertIsNone(simulateur.getStatistiquesCache())
+        reference = simulateur.pilotageParSoldePensionAge(Pcible=0.5)
+        simulateur.activeCache(taille=2)
+        analyse1 = simulateur.pilotageParSoldePensionAge(Pcible=0.5)
+        analyse2 = simulateur.pilotageParSoldePensionAge(0.0 + 0, 0.5)
+        analyse3 = simulateur.pilotageParSoldePensionAge(
+            Scible=None, Pcible=np.float64(0.5)
+        )
+        # Le résultat mémorisé est copié, sans copie des valeurs
+        self.assertIsNot(analyse1, analyse3)
+        self.assertIs(analyse1.A[3]._valeurs, analyse3.A[3]._valeurs)
+        self.assertIsNot(analyse1.A[3]._valeurs, analyse2.A[3]._valeurs)
+        for s in simulateur.scenarios:
+            for a in simulateur.annees:
+                self.assertEqual(analyse1.A[s][a], reference.A[s][a])
+                self.assertEqual(analyse3.S[s][a], reference.S[s][a])
+        statistiques = simulateur.getStatistiquesCache()
+        self.assertEqual(statistiques["succes"], 1)
+        self.assertEqual(statistiques["echecs"], 2)
+        # La modification d'un résultat ne modifie pas le cache
+        analyse1.A[3][2050] = 70.0
+        analyse1.S[3][2050] = 1.0
+        analyse1.scenarios = [3]
+        analyse5 = simulateur.pilotageParSoldePensionAge(Pcible=0.5)
+        self.assertEqual(analyse5.A[3][2050], reference.A[3][2050])
+        self.assertEqual(analyse5.S[3][2050], reference.S[3][2050])
+        self.assertEqual(analyse5.scenarios, reference.scenarios)
+        # Trajectoires et éviction LRU
+        As = simulateur.calculeAge(0.30)
+        As[3][2050] = 70.0
+        self.assertEqual(
+            simulateur.calculeAge(REVcible=0.30),
+            simulateur.calculeAge(REVcible=0.30),
+        )
+        self.assertNotEqual(simulateur.calculeAge(REVcible=0.30), As)
+        simulateur.pilotageParSoldePensionAge(Acible=As)
+        statistiques = simulateur.getStatistiquesCache()
+        self.assertEqual(statistiques["taille"], 2)
+        simulateur.pilotageParSoldePensionAge(Pcible=0.5)
+        self.assertEqual(
+            simulateur.getStatistiquesCache()["echecs"],
+            statistiques["echecs"] + 1,
+        )
+        # Les clés dépendent des hypothèses et de la méthode
+        cle = simulateur.calculeCleCache("pilotageCOR", {})
+        self.assertNotEqual(
+            cle, simulateur.calculeCleCache("pilotageCOR", {"Acible": 62.0})
+        )
+        self.assertEqual(len(simulateur.getEmpreinteDonnees()), 64)
+        simulateur.desactiveCache()
+        self.assertIsNot(simulateur.pilotageCOR(), simulateur.pilotageCOR())
+        return None
+
+    def test_calculeAgeExact(self):
+        # Inversion exacte de la durée de vie en retraite
+        simulateur = SimulateurRetraites()
+        i0 = simulateur.annees.index(simulateur.annee_courante)
+        futur = simulateur._fenetreFuture(simulateur._getConjonctureCOR())
+        for REVcible in [0.27, 0.30]:
+            As = simulateur._versTableau(simulateur.calculeAge(REVcible))
+            np.testing.assert_equal(
+                As[:, 0:i0], simulateur._versTableau(simulateur.A)[:, 0:i0]
+            )
+            REV = simulateur._noyau_REV(futur, As[:, i0:])
+            # Exact, sauf aux âges entiers des changements de génération
+            sauts = np.abs(As[:, i0:] - np.round(As[:, i0:])) < 1.0e-12
+            np.testing.assert_allclose(REV[~sauts], REVcible, atol=1.0e-12)
+            self.assertTrue(np.all(REV[sauts] >= REVcible - 2.0e-3))
+        # Vectorisé pour des conjonctures quelconques
+        conjoncture = simulateur.genereConjoncture([1.0, 1.5], 7.0)
+        futur = simulateur._fenetreFuture(conjoncture)
+        REVcible = np.array([[0.28], [0.31]])
+        As = simulateur._noyau_A_depuis_REV(futur, REVcible)
+        self.assertEqual(As.shape, (2, len(simulateur.annees_futures)))
+        self.assertTrue(np.all(As[0] > As[1]))
+        # Hors des bornes de recherche
+        with self.assertRaises(ValueError):
+            simulateur.calculeAge(0.20)
+        return None
+
+    def test_pilotagesParDuree(self):
+        # Pilotages 11 à 15 : durée de vie en retraite imposée
+        simulateur = SimulateurRetraites()
+        REVcible = 0.30
+        Acible = simulateur.calculeAge(REVcible)
+        cas = [
+            (
+                simulateur.pilotageParSoldePensionDuree,
+                simulateur.pilotageParSoldePensionAge,
+                {"Scible": 0.0, "Pcible": 0.5},
+            ),
+            (
+                simulateur.pilotageParSoldeCotisationsDuree,
+                simulateur.pilotageParSoldeAgeCotisations,
+                {"Scible": 0.0, "Tcible": 0.3},
+            ),
+            (
+                simulateur.pilotageParSoldeDepensesDuree,
+                simulateur.pilotageParSoldeAgeDepenses,
+                {"Scible": 0.0, "Dcible": 0.14},
+            ),
+            (
+                simulateur.pilotageParPensionCotisationsDuree,
+                simulateur.pilotageParPensionAgeCotisations,
+                {"Pcible": 0.5, "Tcible": 0.3},
+            ),
+            (
+                simulateur.pilotageParCotisationsDepensesDuree,
+                simulateur.pilotageParAgeCotisationsDepenses,
+                {"Tcible": 0.3, "Dcible": 0.14},
+            ),
+        ]
+        for pilotageDuree, pilotageAge, cibles in cas:
+            analyse = pilotageDuree(REVcible=REVcible, **cibles)
+            reference = pilotageAge(Acible=Acible, **cibles)
+            for nom in ["T", "P", "A", "S", "RNV", "REV", "Depenses"]:
+                np.testing.assert_allclose(
+                    simulateur._versTableau(getattr(analyse, nom)),
+                    simulateur._versTableau(getattr(reference, nom)),
+                    rtol=1.0e-12,
+                    atol=1.0e-12,
+                )
+        # Conjonctures quelconques, aux taux des scénarios du COR
+        croissance = simulateur.scenarios_croissance[1:]
+        chomage = simulateur.scenarios_chomage[1:]
+        resultat = simulateur.pilotageConjonctures(
+            croissance,
+            chomage,
+            "pilotageParSoldePensionDuree",
+            Scible=0.0,
+            Pcible=0.5,
+            REVcible=REVcible,
+        )
+        analyse = simulateur.pilotageParSoldePensionDuree(
+            Scible=0.0, Pcible=0.5, REVcible=REVcible
+        )
+        np.testing.assert_allclose(
+            resultat["A"], simulateur._versTableau(analyse.A), atol=1.0e-9
+        )
+        with self.assertRaises(ValueError):
+            simulateur.pilotageConjonctures(
+                1.3, 7.0, "pilotageParSoldePensionAge", REVcible=0.3
+            )
+        return None
+
+    def test_pilotageParCibles(self):
+        # Pilotage quelconque par trois variables imposées
+        simulateur = SimulateurRetraites()
+        methodes = [
+            "pilotageParSoldePensionAge",
+            "pilotageParSoldePensionCotisations",
+            "pilotageParSoldeAgeCotisations",
+            "pilotageParSoldeAgeDepenses",
+            "pilotageParSoldePensionDepenses",
+            "pilotageParPensionCotisationsDepenses",
+            "pilotageParAgeCotisationsDepenses",
+            "pilotageParAgeEtNiveauDeVie",
+            "pilotageParNiveauDeVieEtCotisations",
+            "pilotageParSoldePensionDuree",
+            "pilotageParCotisationsDepensesDuree",
+        ]
+        valeurs = {
+            "S": 0.0,
+            "P": 0.45,
+            "A": 63.0,
+            "T": 0.3,
+            "Depenses": 0.14,
+            "RNV": 0.9,
+            "REV": 0.3,
+        }
+        arguments = {
+            "S": "Scible",
+            "P": "Pcible",
+            "A": "Acible",
+            "T": "Tcible",
+            "Depenses": "Dcible",
+            "RNV": "RNVcible",
+            "REV": "REVcible",
+        }
+        for methode in methodes:
+            _, noms = simulateur._decritPilotage(methode)
+            cibles = {arguments[nom]: valeurs[nom] for nom in noms}
+            analyse = simulateur.pilotageParCibles(noms, **cibles)
+            reference = getattr(simulateur, methode)(**cibles)
+            for nom in ["T", "P", "A", "S", "RNV", "Depenses"]:
+                np.testing.assert_allclose(
+                    simulateur._versTableau(getattr(analyse, nom)),
+                    simulateur._versTableau(getattr(reference, nom)),
+                    rtol=1.0e-10,
+                    atol=1.0e-12,
+                )
+        # Une combinaison sans méthode dédiée : les cibles sont atteintes
+        i0 = simulateur.annees.index(simulateur.annee_courante)
+        analyse = simulateur.pilotageParCibles(
+            ["RNV", "Depenses", "A"], RNVcible=0.9, Dcible=0.13, Acible=64.0
+        )
+        for nom, valeur in [("RNV", 0.9), ("Depenses", 0.13), ("A", 64.0)]:
+            tableau = simulateur._versTableau(getattr(analyse, nom))
+            np.testing.assert_allclose(tableau[:, i0:], valeur, rtol=1.0e-12)
+        # Conjonctures quelconques
+        resultat = simulateur.pilotageConjonctures(
+            [1.0, 1.8],
+            7.0,
+            ["RNV", "Depenses", "REV"],
+            RNVcible=0.9,
+            Dcible=0.13,
+            REVcible=0.3,
+        )
+        np.testing.assert_allclose(resultat["Depenses"][:, i0:], 0.13)
+        self.assertIs(
+            simulateur._construitNoyau(["RNV", "Depenses", "REV"]),
+            simulateur._construitNoyau(("RNV", "Depenses", "REV")),
+        )
+        # Variables liées ou invalides
+        for noms in [
+            ["A", "REV", "S"],
+            ["P", "A", "Depenses"],
+            ["T", "S", "Depenses"],
+            ["T", "P", "RNV"],
+            ["S", "P"],
+            ["S", "P", "X"],
+        ]:
+            with self.assertRaises(ValueError):
+                simulateur.pilotageParCibles(noms)
+        with self.assertRaises(ValueError):
+            simulateur.pilotageParCibles(["S", "P", "A"], Tcible=0.3)
+        return None
+
+    def test_anneesPassees(self):
+        # Les années passées sont celles du COR, calculées une seule fois
+        simulateur = SimulateurRetraites()
+        i0 = simulateur.annees.index(simulateur.annee_courante)
+        sorties = simulateur._getSortiesCOR()
+        self.assertIs(simulateur._getSortiesCOR(), sorties)
+        # Les sorties conservées ne peuvent pas devenir obsolètes
+        with self.assertRaises(TypeError):
+            simulateur.A[3][2040] += 1.0
+        Ss = simulateur.genereTrajectoire("S")
+        self.assertEqual(
+            Ss[3][2040], SimulateurRetraites().pilotageCOR().S[3][2040]
+        )
+        analyseCOR = simulateur.pilotageCOR()
+        analyse = simulateur.pilotageParSoldePensionAge(Scible=0.0, Pcible=0.5)
+        for nom in ["S", "RNV", "REV", "Depenses", "PensionBrut"]:
+            tableau = simulateur._versTableau(getattr(analyse, nom))
+            self.assertEqual(tableau.shape[1], len(simulateur.annees))
+            np.testing.assert_equal(tableau[:, 0:i0], sorties[nom][:, 0:i0])
+            np.testing.assert_equal(
+                simulateur._versTableau(getattr(analyseCOR, nom)),
+                sorties[nom],
+            )
+        # Seules les années futures sont calculées
+        colonnes = []
+        noyau = simulateur._noyau_S_RNV_REV
+
+        def enregistre(c, *leviers):
+            colonnes.append(len(c["annees"]))
+            return noyau(c, *leviers)
+
+        simulateur._noyau_S_RNV_REV = enregistre
+        analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        analyse.S[3]
+        self.assertEqual(colonnes, [len(simulateur.annees_futures)])
+        # Une trajectoire passée modifiée est calculée entièrement
+        Acible = simulateur.genereTrajectoire("A", 63.0)
+        Acible[3][2010] += 1.0
+        analyse = simulateur.pilotageParSoldePensionAge(Acible=Acible)
+        analyse.S[3]
+        analyse.S[4]
+        self.assertEqual(
+            colonnes[1:],
+            [len(simulateur.annees), len(simulateur.annees_futures)],
+        )
+        self.assertNotEqual(analyse.REV[3][2010], analyseCOR.REV[3][2010])
+        self.assertEqual(analyse.REV[4][2010], analyseCOR.REV[4][2010])
+        self.assertNotEqual(
+            analyse.PensionBrut[3][2010], analyseCOR.PensionBrut[3][2010]
+        )
+        return None
+
+    def test_sortiesDifferees(self):
+        # Les sorties sont calculées au premier accès, par scénario
+        simulateur = SimulateurRetraites()
+        reference = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        analyse = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        self.assertIsInstance(analyse.S, retraites.TrajectoireDifferee)
+        self.assertEqual(analyse.S.getScenariosCalcules(), [])
+        self.assertEqual(analyse.S[3][2050], reference.S[3][2050])
+        self.assertEqual(analyse.S.getScenariosCalcules(), [3])
+        self.assertEqual(analyse.RNV.getScenariosCalcules(), [])
+        self.assertEqual(list(analyse.S.keys()), list(simulateur.scenarios))
+        # Une copie est un dictionnaire complet
+        copie = pickle.loads(pickle.dumps(analyse.RNV))
+        self.assertIs(type(copie), dict)
+        self.assertEqual(copie, reference.RNV)
+        # Une sortie peut servir de cible
+        autre = simulateur.pilotageParSoldePensionCotisations(
+            Scible=analyse.S, Pcible=analyse.P, Tcible=analyse.T
+        )
+        self.assertAlmostEqual(autre.A[3][2050], 63.0)
+        # Restriction aux scénarios et aux années
+        analyse = simulateur.pilotageParSoldePensionAge(
+            Acible=63.0, scenarios=[3], annees=[2020, 2050]
+        )
+        self.assertEqual(analyse.scenarios, [3])
+        self.assertEqual(analyse.annees, [2020, 2050])
+        self.assertEqual(analyse.annees_standard, [2020, 2050])
+        for nom in ["T", "P", "A", "S", "REV", "PensionBrut"]:
+            trajectoire = getattr(analyse, nom)
+            self.assertEqual(list(trajectoire.keys()), [3])
+            self.assertEqual(list(trajectoire[3].keys()), [2020, 2050])
+            for a in [2020, 2050]:
+                self.assertEqual(
+                    trajectoire[3][a], getattr(reference, nom)[3][a]
+                )
+        with self.assertRaises(KeyError):
+            analyse.S[1]
+        with self.assertRaises(ValueError):
+            simulateur.pilotageCOR(scenarios=[7])
+        with self.assertRaises(ValueError):
+            simulateur.pilotageCOR(annees=[2100])
+        # Restriction avec le cache actif, y compris par des range
+        simulateur.activeCache()
+        analyse = simulateur.pilotageCOR(
+            scenarios=simulateur.scenarios, annees=simulateur.annees
+        )
+        reference = simulateur.pilotageCOR()
+        self.assertEqual(analyse.S[3][2050], reference.S[3][2050])
+        reference = simulateur.pilotageParSoldePensionAge(Acible=63.0)
+        analyse = simulateur.pilotageParSoldePensionAge(
+            Acible=63.0, scenarios=range(3, 4), annees=[2020, 2050]
+        )
+        self.assertEqual(analyse.S[3][2050], reference.S[3][2050])
+        analyse = simulateur.pilotageParSoldePensionAge(
+            Acible=63.0, scenarios=[3], annees=(2020, 2050)
+        )
+        self.assertEqual(simulateur.getStatistiquesCache()["succes"], 1)
+        self.assertEqual(analyse.annees, [2020, 2050])
+        simulateur.desactiveCache()
+        return None
+
 
 if __name__ == "__main__":
     unittest.main()